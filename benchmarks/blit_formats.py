@@ -0,0 +1,99 @@
+"""
+Blit benchmark comparing automatic pixel-format selection against per-pixel alpha everywhere.
+
+Builds the main menu and the pause overlay on top of the game scene headlessly, collects the blits each frame would
+make, and times drawing them as they are (with formats picked by engine.rendering.surface_format) against the same
+blits with every surface converted to per-pixel alpha, which is how they were drawn before.
+
+Usage:
+    python -m benchmarks.blit_formats [--frames 2000]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Run without opening a window
+import pygame
+
+from engine.game_engine import GameEngine
+from engine.rendering.draw_list import DrawList
+from engine.rendering.surface_format import has_alpha_channel
+import engine.scenes.game_scene # Register the scenes used by the workloads
+import engine.scenes.main_menu
+import engine.scenes.pause_menu
+
+
+def _collect_commands(engine: GameEngine) -> list[tuple]:
+    """
+    Collect the blit commands of every scene on the stack, in draw order.
+    :param engine: Engine whose scenes to collect.
+    :return: List of (surface, dest, area, flags) commands.
+    """
+    commands = []
+    for scene in engine.scene_manager._stack:
+        draw_list = DrawList(engine.screen)
+        for element in sorted(scene.ui_elements, key=lambda elem: elem.layer):
+            element.emit_draw_commands(draw_list)
+        commands.extend(draw_list.commands)
+    return commands
+
+
+def _as_per_pixel(commands: list[tuple]) -> list[tuple]:
+    """Convert the surface of every command to per-pixel alpha, keeping its surface-level alpha."""
+    converted = []
+    for surface, dest, area, flags in commands:
+        per_pixel = surface.convert_alpha()
+        per_pixel.set_alpha(surface.get_alpha())
+        converted.append((per_pixel, dest, area, flags))
+    return converted
+
+
+def _time_blits(screen: pygame.Surface, commands: list[tuple], frames: int) -> float:
+    """
+    Time drawing a list of commands repeatedly.
+    :return: Milliseconds per frame.
+    """
+    screen.blits(commands, doreturn=False) # Warm up, e.g. RLE encoding happens on first blit
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.blits(commands, doreturn=False)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def _format_of(surface: pygame.Surface) -> str:
+    """Describe the pixel format of a surface."""
+    if has_alpha_channel(surface):
+        return "per-pixel"
+    if surface.get_colorkey() is not None:
+        return "colourkey+rle" if surface.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK) else "colourkey"
+    return "opaque" if surface.get_alpha() is None else "opaque+surface alpha"
+
+
+def main():
+    """Run the benchmark for each workload and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = GameEngine(width=800, height=600, title="Tachyon Benchmark")
+    workloads = {
+        "main_menu": lambda: engine.scene_manager.change_scene("main_menu"),
+        "pause_overlay": lambda: (engine.scene_manager.change_scene("game"),
+                                  engine.scene_manager.push_scene("pause_menu")),
+    }
+
+    for name, setup in workloads.items():
+        setup()
+        commands = _collect_commands(engine)
+        formats = ", ".join(sorted({_format_of(command[0]) for command in commands}))
+        optimised = _time_blits(engine.screen, commands, args.frames)
+        per_pixel = _time_blits(engine.screen, _as_per_pixel(commands), args.frames)
+        print(f"{name}: {len(commands)} blits ({formats})")
+        print(f"  per-pixel alpha: {per_pixel:.3f} ms/frame")
+        print(f"  auto format:     {optimised:.3f} ms/frame ({per_pixel / optimised:.2f}x)")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
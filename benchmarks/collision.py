@@ -0,0 +1,79 @@
+"""
+Collision benchmark measuring broadphase and narrowphase pair-finding for many moving bodies.
+
+Fills a SpatialHash with randomly sized bodies moving around a bounded world and times a full frame of collision
+work for it (moving every body in one batch, then finding every overlapping pair). The first frame's pairs are
+checked against a brute-force test, and a mismatch makes the benchmark exit with a non-zero status. The per-frame
+time is reported against a frame budget, and only fails the benchmark with --check-budget, since frame times depend on
+the machine.
+
+Usage:
+    python -m benchmarks.collision [--bodies 10000] [--frames 200] [--budget 4.0] [--check-budget]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from engine.gameplay.collision import SpatialHash
+
+
+def _brute_force_pairs(rects: np.ndarray) -> set[tuple[int, int]]:
+    """Find every overlapping pair by testing each rectangle against all others with Rect.collidelistall."""
+    rect_list = [pygame.Rect(rect) for rect in rects.tolist()]
+    pairs = set()
+    for index, rect in enumerate(rect_list):
+        for other in rect.collidelistall(rect_list[index + 1:]):
+            pairs.add((index, index + 1 + other))
+    return pairs
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bodies", type=int, default=10_000)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=4.0, help="Frame budget in milliseconds")
+    parser.add_argument("--check-budget", action="store_true",
+                        help="Exit with a non-zero status when over budget, for machines the budget was set for")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    world_size = int(np.sqrt(args.bodies) * 40) # Keeps the density constant as the body count changes
+    rects = np.empty((args.bodies, 4), dtype=np.int32)
+    rects[:, :2] = rng.integers(0, world_size, (args.bodies, 2))
+    rects[:, 2:] = rng.integers(8, 25, (args.bodies, 2))
+    positions = rects[:, :2].astype(np.float64)
+    velocities = rng.uniform(-60, 60, (args.bodies, 2))
+
+    spatial_hash = SpatialHash(cell_size=32)
+    bodies = np.array([spatial_hash.add(rect) for rect in rects.tolist()])
+
+    pairs = {tuple(pair) for pair in spatial_hash.find_pairs().tolist()}
+    expected = _brute_force_pairs(rects)
+    if pairs != expected:
+        print(f"pair mismatch: {len(pairs)} found, {len(expected)} expected")
+        sys.exit(1)
+
+    elapsed = 0.0
+    pair_count = 0
+    for _ in range(args.frames):
+        positions += velocities / 60
+        np.clip(positions, 0, world_size, out=positions)
+        rects[:, :2] = positions
+        start = time.perf_counter()
+        spatial_hash.move_many(bodies, rects)
+        pair_count += len(spatial_hash.find_pairs())
+        elapsed += time.perf_counter() - start
+
+    ms = elapsed / args.frames * 1000
+    status = "ok" if ms <= args.budget else "OVER BUDGET"
+    print(f"{args.bodies} bodies: {pair_count / args.frames:.0f} pairs/frame, {ms:.3f} ms/frame ({status})")
+    if args.check_budget and ms > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
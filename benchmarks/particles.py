@@ -0,0 +1,78 @@
+"""
+Particle benchmark measuring the per-frame cost of simulating and drawing live particles.
+
+Keeps a ParticleEmitter filled with long-lived particles headlessly and times a full frame of work for it (bulk
+integration, ageing and removal, then drawing into the screen), for pixel particles with and without fading and for
+sprite particles. The plain pixel particle result is reported against the frame budget. Frame times depend on the
+machine, so exceeding the budget only makes the benchmark exit with a non-zero status with --check-budget.
+
+Usage:
+    python -m benchmarks.particles [--particles 50000] [--frames 300] [--budget 4.0] [--check-budget]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Run without opening a window
+import pygame
+
+from engine.effects.particles import ParticleEmitter
+
+
+def _time_frames(emitter: ParticleEmitter, screen: pygame.Surface, particles: int, frames: int) -> float:
+    """
+    Time updating and rendering an emitter, topping it back up to a particle count every frame.
+    :return: Milliseconds per frame.
+    """
+    emitter.clear()
+    emitter.burst(particles)
+    elapsed = 0.0
+    for _ in range(frames):
+        emitter.burst(particles - len(emitter)) # Replace expired particles outside the timed section
+        screen.fill((0, 0, 0))
+        start = time.perf_counter()
+        emitter.update(1 / 60)
+        emitter.render(screen)
+        elapsed += time.perf_counter() - start
+    return elapsed / frames * 1000
+
+
+def main():
+    """Run the benchmark for each particle style and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--particles", type=int, default=50_000)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--budget", type=float, default=4.0,
+                        help="Frame budget in milliseconds for plain pixel particles")
+    parser.add_argument("--check-budget", action="store_true",
+                        help="Exit with a non-zero status when over budget, for machines the budget was set for")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    sprite = pygame.Surface((3, 3))
+    sprite.fill((255, 200, 80))
+
+    workloads = {
+        "pixels": dict(end_colour=(200, 40, 0)),
+        "pixels+fade": dict(end_colour=(200, 40, 0), fade=True),
+        "sprites": dict(sprite=sprite),
+    }
+    over_budget = False
+    for name, options in workloads.items():
+        emitter = ParticleEmitter(400, 300, life=(2.0, 4.0), speed=(20.0, 250.0), gravity=(0.0, 60.0), drag=0.2,
+                                  max_particles=args.particles, seed=1, **options)
+        ms = _time_frames(emitter, screen, args.particles, args.frames)
+        checked = name == "pixels"
+        status = ("ok" if ms <= args.budget else "OVER BUDGET") if checked else "reference"
+        over_budget |= checked and ms > args.budget
+        print(f"{name}: {args.particles} particles, {ms:.3f} ms/frame ({status})")
+
+    pygame.quit()
+    if args.check_budget and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
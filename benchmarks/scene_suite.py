@@ -0,0 +1,334 @@
+"""
+Scene-level performance regression suite.
+
+Runs canonical scene workloads headlessly through the scene manager, as the engine's main loop would, and measures
+for each one:
+    frame_ms            mean time of a frame (events, update, render, flip)
+    frame_ms_p95        95th percentile frame time
+    alloc_kib_per_frame mean Python heap allocated within a frame, above what was held when it started
+    retained_kib        Python heap still held after the frames, compared with after setup (growth or leaks)
+    peak_kib            highest Python heap use during setup and the frames
+Timings and memory are measured in separate passes, since tracing allocations slows the frames down. Pixel buffers
+are allocated by SDL outside the Python heap, so they are not part of the memory figures.
+
+Results are written as JSON and compared against a stored baseline. A metric regresses when it exceeds its baseline
+value by more than the relative tolerance and the absolute slack set for it in the baseline file, and any regression
+makes the suite exit with a non-zero status.
+
+Only the memory metrics are gated by default, since they depend on the code rather than the machine. Timing baselines
+are per-machine: the stored frame times come from whichever machine last updated the baseline, and are only
+meaningful when compared on that same machine. To gate timings, record a baseline locally with --update-baseline and
+compare against it with --check-timings.
+
+Usage:
+    python -m benchmarks.scene_suite [--frames 300] [--workloads main_menu_idle ...] [--output results.json]
+                                     [--baseline benchmarks/baselines/scene_suite.json] [--update-baseline]
+                                     [--check-timings]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Run without opening a window
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # Keep printed JSON results parseable
+import pygame
+
+from engine.game_engine import GameEngine
+from engine.scene import Scene
+from engine.scene_registry import register_scene
+from engine.user_interface.button import Button
+from engine.user_interface.text import Text
+import engine.scenes.game_scene # Register the scenes used by the workloads
+import engine.scenes.main_menu
+import engine.scenes.pause_menu
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "scene_suite.json")
+DEFAULT_TOLERANCES = { # Relative tolerance and absolute slack allowed above the baseline, by metric
+    "frame_ms": {"relative": 0.30, "absolute": 0.05},
+    "frame_ms_p95": {"relative": 0.50, "absolute": 0.10},
+    "alloc_kib_per_frame": {"relative": 0.25, "absolute": 4.0},
+    "retained_kib": {"relative": 0.25, "absolute": 64.0},
+    "peak_kib": {"relative": 0.15, "absolute": 256.0},
+}
+TIMING_METRICS = ("frame_ms", "frame_ms_p95") # Metrics that depend on the machine, only gated when asked for
+DT = 1 / 60 # Fixed frame time, so every run advances animations identically
+
+
+@register_scene("benchmark_text_churn")
+class TextChurnScene(Scene):
+    """Scene full of text labels, a tenth of which change their text every frame."""
+    label_count = 1000 # Number of labels created, set by the workload before the scene is entered
+
+    def __init__(self, engine: "GameEngine"):
+        super().__init__(engine)
+        self.batch_rendering = True
+        self.frame = 0
+        self.labels = [self.add_ui_element(Text(x=(i * 40) % 800, y=(i * 40) // 800 * 12 % 600, text=str(i),
+                                                font_size=12)) for i in range(self.label_count)]
+
+    def handle_events(self, events: list[pygame.event.Event]) -> None:
+        super().handle_events(events)
+
+    def update(self, dt: float) -> None:
+        super().update(dt)
+        self.frame += 1
+        for label in self.labels[self.frame % 10::10]:
+            label.set_text(str(self.frame))
+
+    def render(self, screen: pygame.Surface) -> None:
+        screen.fill((0, 0, 0))
+        super().render(screen)
+
+
+@register_scene("benchmark_button_grid")
+class ButtonGridScene(Scene):
+    """Scene with a grid of expanding buttons covering the screen."""
+    def __init__(self, engine: "GameEngine"):
+        super().__init__(engine)
+        columns, rows = 40, 25
+        self.batch_rendering = True
+        width, height = engine.screen.get_width() // columns, engine.screen.get_height() // rows
+        for row in range(rows):
+            for column in range(columns):
+                self.add_ui_element(Button(x=column * width, y=row * height, width=width - 2, height=height - 2,
+                                           text=str(row * columns + column), font_size=10, expand_on_hover=True,
+                                           expanded_width=width + 8, animation_manager=self.animations))
+
+    def handle_events(self, events: list[pygame.event.Event]) -> None:
+        super().handle_events(events)
+
+    def update(self, dt: float) -> None:
+        super().update(dt)
+
+    def render(self, screen: pygame.Surface) -> None:
+        screen.fill((20, 20, 20))
+        super().render(screen)
+
+
+def _mouse_motion(x: int, y: int) -> pygame.event.Event:
+    """Create a mouse motion event."""
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+
+
+def _escape() -> pygame.event.Event:
+    """Create an ESC key press event."""
+    return pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode="\x1b", scancode=41)
+
+
+def _sweep(frame: int, left: int, top: int, right: int, bottom: int, period: int = 90) -> list[pygame.event.Event]:
+    """Move the mouse back and forth across an area, stepping down a row every pass."""
+    phase = frame % (2 * period)
+    t = phase / period if phase < period else 2 - phase / period
+    row = (frame // (2 * period)) % 8
+    return [_mouse_motion(int(left + (right - left) * t), top + (bottom - top) * row // 7)]
+
+
+def _no_events(frame: int) -> list[pygame.event.Event]:
+    return []
+
+
+def _setup_main_menu(engine: GameEngine) -> Callable[[int], list]:
+    engine.scene_manager.change_scene("main_menu")
+    return _no_events
+
+
+def _setup_hover_sweep(engine: GameEngine) -> Callable[[int], list]:
+    engine.scene_manager.change_scene("main_menu")
+    return lambda frame: _sweep(frame, 0, 220, 400, 420)
+
+
+def _setup_pause_over_game(engine: GameEngine) -> Callable[[int], list]:
+    engine.scene_manager.change_scene("game")
+    engine.scene_manager.push_scene("pause_menu")
+    return _no_events
+
+
+def _setup_escape_cycles(engine: GameEngine) -> Callable[[int], list]:
+    engine.scene_manager.change_scene("game")
+    return lambda frame: [_escape()] # The game scene pushes the pause menu and the pause menu pops itself
+
+
+def _setup_text_churn(count: int) -> Callable[[GameEngine], Callable[[int], list]]:
+    def setup(engine: GameEngine) -> Callable[[int], list]:
+        TextChurnScene.label_count = count
+        engine.scene_manager.change_scene("benchmark_text_churn")
+        return _no_events
+    return setup
+
+
+def _setup_button_grid(engine: GameEngine) -> Callable[[int], list]:
+    engine.scene_manager.change_scene("benchmark_button_grid")
+    return lambda frame: _sweep(frame, 0, 0, engine.screen.get_width(), engine.screen.get_height())
+
+
+WORKLOADS: dict[str, Callable[[GameEngine], Callable[[int], list]]] = {
+    "main_menu_idle": _setup_main_menu,
+    "main_menu_hover_sweep": _setup_hover_sweep,
+    "pause_over_game": _setup_pause_over_game,
+    "escape_push_pop": _setup_escape_cycles,
+    "text_churn_1k": _setup_text_churn(1000),
+    "text_churn_10k": _setup_text_churn(10000),
+    "button_grid_1k": _setup_button_grid,
+}
+
+
+def _run_frames(engine: GameEngine, events_for: Callable[[int], list], frames: int,
+                on_frame: Optional[Callable[[], None]] = None) -> list[float]:
+    """
+    Run frames through the scene manager.
+    :param engine: Engine to run.
+    :param events_for: Function giving the events of each frame.
+    :param frames: Number of frames to run.
+    :param on_frame: Optional function called before each frame starts.
+    :return: Duration of each frame in milliseconds.
+    """
+    manager = engine.scene_manager
+    durations = []
+    for frame in range(frames):
+        if on_frame is not None:
+            on_frame()
+        events = events_for(frame)
+        start = time.perf_counter()
+        manager.handle_events(events)
+        manager.update(DT)
+        manager.render()
+        pygame.display.flip()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run_workload(engine: GameEngine, name: str, frames: int, warmup: int = 30) -> dict[str, float]:
+    """
+    Measure one workload.
+    :param engine: Engine to run the workload with.
+    :param name: Name of the workload.
+    :param frames: Number of measured frames in each pass.
+    :param warmup: Number of unmeasured frames run first in each pass.
+    :return: Metric values, by metric name.
+    """
+    setup = WORKLOADS[name]
+
+    # Timing pass
+    events_for = setup(engine)
+    _run_frames(engine, events_for, warmup)
+    durations = sorted(_run_frames(engine, events_for, frames))
+
+    # Memory pass, from a fresh setup so that setup allocations are part of the peak
+    tracemalloc.start()
+    events_for = setup(engine)
+    _run_frames(engine, events_for, warmup)
+    after_setup = tracemalloc.get_traced_memory()[0]
+    frame_allocations = [] # Bytes allocated above the starting heap use, by frame
+    frame_start = [None] # Heap use when the current frame started
+
+    def start_frame():
+        current, peak = tracemalloc.get_traced_memory()
+        if frame_start[0] is not None: # Close off the previous frame
+            frame_allocations.append(peak - frame_start[0])
+        frame_start[0] = current
+        tracemalloc.reset_peak()
+
+    peak_before = tracemalloc.get_traced_memory()[1] # Highest use during setup and warm up
+    _run_frames(engine, events_for, frames, start_frame)
+    current, peak = tracemalloc.get_traced_memory()
+    frame_allocations.append(peak - frame_start[0])
+    tracemalloc.stop()
+
+    return {
+        "frame_ms": round(sum(durations) / len(durations), 4),
+        "frame_ms_p95": round(durations[int(len(durations) * 0.95) - 1], 4),
+        "alloc_kib_per_frame": round(sum(frame_allocations) / len(frame_allocations) / 1024, 2),
+        "retained_kib": round(max(0, current - after_setup) / 1024, 2),
+        "peak_kib": round(max(peak_before, peak) / 1024, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, check_timings: bool = False) -> list[str]:
+    """
+    Compare results against a baseline.
+    :param results: Metrics by workload, as produced by the suite.
+    :param baseline: Baseline file contents, holding "workloads" and optionally "tolerances".
+    :param check_timings: Whether to compare the timing metrics too, which is only meaningful against a baseline
+        recorded on the same machine.
+    :return: Description of every regression found.
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **baseline.get("tolerances", {})}
+    regressions = []
+    for workload, metrics in results.items():
+        expected = baseline.get("workloads", {}).get(workload)
+        if expected is None: # New workloads have nothing to compare against yet
+            continue
+        for metric, value in metrics.items():
+            if metric not in expected or metric not in tolerances:
+                continue
+            if metric in TIMING_METRICS and not check_timings:
+                continue
+            tolerance = tolerances[metric]
+            limit = expected[metric] * (1 + tolerance["relative"]) + tolerance["absolute"]
+            if value > limit:
+                regressions.append(f"{workload}.{metric}: {value} exceeds {limit:.4f} (baseline {expected[metric]})")
+    return regressions
+
+
+def main():
+    """Run the suite, write the results, and compare them against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--output", help="File to write the JSON results to. Printed if not given.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline instead of comparing against it")
+    parser.add_argument("--check-timings", action="store_true",
+                        help="Also gate frame times, against a baseline recorded on this machine")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()): # Scenes print when entered, keep the output machine-readable
+        engine = GameEngine(width=800, height=600, title="Tachyon Benchmark")
+        results = {}
+        for name in args.workloads:
+            results[name] = run_workload(engine, name, args.frames)
+            print(f"{name}: {results[name]}", file=sys.stderr)
+    pygame.quit()
+
+    report = {"frames": args.frames, "workloads": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        baseline = {"tolerances": DEFAULT_TOLERANCES, "workloads": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as file:
+                baseline = json.load(file)
+        baseline.setdefault("workloads", {}).update(results) # Keep baselines of workloads that were not run
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+            file.write("\n")
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return None
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline to create one", file=sys.stderr)
+        return None
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        regressions = compare(results, json.load(file), args.check_timings)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print("No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
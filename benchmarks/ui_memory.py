@@ -0,0 +1,128 @@
+"""
+Memory and construction-time benchmark for the UI element hierarchy.
+
+Builds large numbers of each UI element type headlessly and reports the Python heap bytes held per element and the
+time taken to construct them. Pixel buffers are allocated by SDL outside the Python heap, so surface memory is
+reported separately from the object overhead.
+
+Usage:
+    python -m benchmarks.ui_memory [--counts 10000 100000] [--types Panel Text Image Button]
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Run without opening a window
+import pygame
+
+from engine.user_interface.button import Button
+from engine.user_interface.image import Image
+from engine.user_interface.panel import Panel
+from engine.user_interface.text import Text
+
+
+def _build_panel(i: int) -> Panel:
+    return Panel(x=i % 800, y=i % 600, width=4, height=4, bg_colour=(40, 40, 40))
+
+
+def _build_text(i: int) -> Text:
+    return Text(x=i % 800, y=i % 600, text="Label", font_size=12)
+
+
+def _build_image(i: int) -> Image:
+    return Image(x=i % 800, y=i % 600, surface=_SHARED_SURFACE)
+
+
+def _build_button(i: int) -> Button:
+    return Button(x=i % 800, y=i % 600, width=4, height=4, text="B", font_size=12, expand_on_hover=True,
+                  expanded_width=8)
+
+
+_BUILDERS = {
+    "Panel": _build_panel,
+    "Text": _build_text,
+    "Image": _build_image,
+    "Button": _build_button,
+}
+_SHARED_SURFACE: pygame.Surface = None # Small source surface shared by every benchmarked image
+
+
+def _surface_bytes(elements: list) -> int:
+    """
+    Sum the pixel memory of the surfaces directly referenced by the given elements.
+    :param elements: Elements to inspect.
+    :return: Total bytes of pixel data.
+    """
+    seen: set[int] = set()
+    total = 0
+    for element in elements:
+        stack = [element]
+        while stack:
+            obj = stack.pop()
+            for name in getattr(type(obj), "__slots__", ()):
+                value = getattr(obj, name, None)
+                if isinstance(value, pygame.Surface) and id(value) not in seen:
+                    seen.add(id(value))
+                    total += value.get_pitch() * value.get_height()
+                elif name in ("panel", "text_element"):
+                    stack.append(value)
+    return total
+
+
+def measure(type_name: str, count: int) -> dict:
+    """
+    Construct a number of elements of one type and measure their cost.
+    :param type_name: Name of the element type to build.
+    :param count: Number of elements to build.
+    :return: Measurements for the run.
+    """
+    builder = _BUILDERS[type_name]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    elements = [builder(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "type": type_name,
+        "count": count,
+        "bytes_per_element": current / count,
+        "peak_bytes_per_element": peak / count,
+        "surface_bytes_per_element": _surface_bytes(elements) / count,
+        "construction_us_per_element": elapsed / count * 1_000_000,
+        "construction_total_s": elapsed,
+    }
+    del elements
+    gc.collect()
+    return result
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    global _SHARED_SURFACE
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--types", nargs="+", default=list(_BUILDERS), choices=list(_BUILDERS))
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((800, 600)) # Images need a display mode to convert their surfaces
+    _SHARED_SURFACE = pygame.Surface((4, 4), pygame.SRCALPHA)
+
+    print(f"{'type':<8} {'count':>8} {'B/elem':>10} {'peak B/elem':>12} {'px B/elem':>10} {'us/elem':>9}")
+    for type_name in args.types:
+        for count in args.counts:
+            r = measure(type_name, count)
+            print(f"{r['type']:<8} {r['count']:>8} {r['bytes_per_element']:>10.0f} "
+                  f"{r['peak_bytes_per_element']:>12.0f} {r['surface_bytes_per_element']:>10.0f} "
+                  f"{r['construction_us_per_element']:>9.1f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Runtime loading of texture atlases built by engine.assets.atlas_packer.
+
+An atlas is a JSON manifest plus one or more page images. Each named region maps to a rectangle on a page, so many
+small images are decoded from a few files and drawn as source-rect blits from shared surfaces.
+"""
+import json
+import os
+from typing import Optional
+
+import pygame
+
+
+class TextureAtlas:
+    """A set of atlas pages and the named regions packed into them."""
+    def __init__(self, manifest_path: str):
+        """
+        Load an atlas manifest and its page images.
+        :param manifest_path: Path to the JSON manifest written by the atlas packer.
+        :raises ValueError: If the manifest version is not supported.
+        """
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest.get("version") != 1:
+            raise ValueError(f"Unsupported atlas manifest version in {manifest_path}.")
+
+        self.path = manifest_path
+        directory = os.path.dirname(manifest_path)
+        self.pages: list[pygame.Surface] = []
+        for page_file in manifest["pages"]:
+            page = pygame.image.load(os.path.join(directory, page_file))
+            if pygame.display.get_surface() is not None: # Conversion needs a display mode
+                page = page.convert_alpha()
+            self.pages.append(page)
+
+        # Page index and source rectangle of each region, by name
+        self._regions: dict[str, tuple[int, pygame.Rect]] = {
+            name: (region["page"], pygame.Rect(region["rect"])) for name, region in manifest["regions"].items()
+        }
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a region exists."""
+        return name in self._regions
+
+    def names(self) -> list[str]:
+        """Get the names of all regions."""
+        return list(self._regions)
+
+    def get_region(self, name: str) -> tuple[pygame.Surface, pygame.Rect]:
+        """
+        Get the page surface and source rectangle of a region, for drawing with a source-rect blit.
+        :param name: Name of the region.
+        :return: The shared page surface and a copy of the region's rectangle on it.
+        :raises KeyError: If the region does not exist.
+        """
+        if name not in self._regions:
+            raise KeyError(f"Atlas region {name} does not exist in {self.path}.")
+        page_index, rect = self._regions[name]
+        return self.pages[page_index], rect.copy()
+
+    def get_surface(self, name: str) -> pygame.Surface:
+        """
+        Get a region as a surface. The surface shares its pixels with the page instead of copying them.
+        :param name: Name of the region.
+        :return: Subsurface of the page.
+        """
+        page, rect = self.get_region(name)
+        return page.subsurface(rect)
+
+
+_loaded_atlases: dict[str, TextureAtlas] = {} # Atlases already loaded, by absolute manifest path
+
+
+def load_atlas(manifest_path: str) -> TextureAtlas:
+    """
+    Load an atlas, reusing the pages of one already loaded from the same manifest.
+    :param manifest_path: Path to the JSON manifest.
+    :return: The shared atlas.
+    """
+    key = os.path.abspath(manifest_path)
+    atlas: Optional[TextureAtlas] = _loaded_atlases.get(key)
+    if atlas is None:
+        atlas = TextureAtlas(manifest_path)
+        _loaded_atlases[key] = atlas
+    return atlas
+
+
+def loaded_atlases() -> list[TextureAtlas]:
+    """Get every atlas loaded through load_atlas."""
+    return list(_loaded_atlases.values())
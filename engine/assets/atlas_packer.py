@@ -0,0 +1,182 @@
+"""
+Build-time tool that packs a directory of images into texture atlas pages.
+
+Images are placed with the MaxRects algorithm (best short side fit) onto as few pages as needed, and a JSON
+manifest records the page and rectangle of each image by name. Names are the image paths relative to the source
+directory, without extension and with forward slashes.
+
+Usage:
+    python -m engine.assets.atlas_packer assets/ui -o build/atlas/ui [--max-size 2048] [--padding 1]
+"""
+import argparse
+import json
+import os
+from typing import Optional
+
+import pygame
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif", ".webp")
+
+
+class MaxRectsBin:
+    """A single page being filled by the MaxRects packing algorithm."""
+    def __init__(self, width: int, height: int):
+        """
+        Initialise an empty page.
+        :param width: Page width in pixels.
+        :param height: Page height in pixels.
+        """
+        self.width = width
+        self.height = height
+        self._free: list[pygame.Rect] = [pygame.Rect(0, 0, width, height)] # Maximal free rectangles
+        self.used: list[pygame.Rect] = []
+
+    def insert(self, width: int, height: int) -> Optional[pygame.Rect]:
+        """
+        Place a rectangle on the page.
+        :param width: Width of the rectangle.
+        :param height: Height of the rectangle.
+        :return: The placed rectangle, or None if it does not fit.
+        """
+        best: Optional[pygame.Rect] = None
+        best_short = best_long = None
+        for free in self._free:
+            if free.width < width or free.height < height:
+                continue
+            leftover_x = free.width - width
+            leftover_y = free.height - height
+            short, long = min(leftover_x, leftover_y), max(leftover_x, leftover_y)
+            if best is None or (short, long) < (best_short, best_long): # Best short side fit
+                best = pygame.Rect(free.x, free.y, width, height)
+                best_short, best_long = short, long
+        if best is None:
+            return None
+        self._split_free(best)
+        self.used.append(best)
+        return best
+
+    def _split_free(self, placed: pygame.Rect) -> None:
+        """Split every free rectangle overlapping a placed rectangle, then remove redundant free rectangles."""
+        new_free: list[pygame.Rect] = []
+        for free in self._free:
+            if not free.colliderect(placed):
+                new_free.append(free)
+                continue
+            if placed.left > free.left: # Space left of the placed rectangle
+                new_free.append(pygame.Rect(free.left, free.top, placed.left - free.left, free.height))
+            if placed.right < free.right: # Space right of it
+                new_free.append(pygame.Rect(placed.right, free.top, free.right - placed.right, free.height))
+            if placed.top > free.top: # Space above it
+                new_free.append(pygame.Rect(free.left, free.top, free.width, placed.top - free.top))
+            if placed.bottom < free.bottom: # Space below it
+                new_free.append(pygame.Rect(free.left, placed.bottom, free.width, free.bottom - placed.bottom))
+
+        # Prune free rectangles fully contained in another
+        pruned: list[pygame.Rect] = []
+        for i, rect in enumerate(new_free):
+            contained = False
+            for j, other in enumerate(new_free):
+                if i != j and other.contains(rect) and (other != rect or j < i):
+                    contained = True
+                    break
+            if not contained:
+                pruned.append(rect)
+        self._free = pruned
+
+
+def find_images(source_dir: str) -> dict[str, str]:
+    """
+    Find all images in a directory tree.
+    :param source_dir: Directory to search.
+    :return: File path of each image, by region name.
+    """
+    images: dict[str, str] = {}
+    for root, _, files in os.walk(source_dir):
+        for file_name in sorted(files):
+            if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, file_name)
+                name = os.path.splitext(os.path.relpath(path, source_dir))[0].replace(os.sep, "/")
+                images[name] = path
+    return images
+
+
+def pack_directory(source_dir: str, output_prefix: str, max_size: int = 2048, padding: int = 1) -> dict:
+    """
+    Pack every image in a directory into atlas pages and write the pages and manifest.
+
+    :param source_dir: Directory of source images.
+    :param output_prefix: Output path without extension. Pages are written as <prefix>_<n>.png and the manifest as
+        <prefix>.json.
+    :param max_size: Maximum width and height of a page in pixels.
+    :param padding: Transparent pixels kept between images, so filtering does not bleed neighbours together.
+    :return: The manifest that was written.
+    :raises ValueError: If an image is larger than a page.
+    """
+    surfaces = {name: pygame.image.load(path) for name, path in find_images(source_dir).items()}
+    # Place large images first, which packs noticeably tighter
+    order = sorted(surfaces, key=lambda name: max(surfaces[name].get_size()), reverse=True)
+
+    bins: list[MaxRectsBin] = []
+    placements: dict[str, tuple[int, pygame.Rect]] = {}
+    for name in order:
+        width, height = surfaces[name].get_size()
+        padded_width, padded_height = width + padding, height + padding
+        if padded_width > max_size or padded_height > max_size:
+            raise ValueError(f"Image {name} ({width}x{height}) does not fit on a {max_size}x{max_size} page.")
+        for page_index, page in enumerate(bins):
+            placed = page.insert(padded_width, padded_height)
+            if placed is not None:
+                break
+        else: # No existing page has room, so start a new one
+            bins.append(MaxRectsBin(max_size, max_size))
+            page_index = len(bins) - 1
+            placed = bins[-1].insert(padded_width, padded_height)
+        placements[name] = (page_index, pygame.Rect(placed.x, placed.y, width, height))
+
+    output_dir = os.path.dirname(output_prefix)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    base_name = os.path.basename(output_prefix)
+
+    page_files = []
+    for page_index, page in enumerate(bins):
+        # Trim each page to the area actually used
+        used_width = max(rect.right for rect in page.used)
+        used_height = max(rect.bottom for rect in page.used)
+        page_surface = pygame.Surface((used_width, used_height), pygame.SRCALPHA)
+        page_surface.fill((0, 0, 0, 0))
+        for name, (index, rect) in placements.items():
+            if index == page_index:
+                page_surface.blit(surfaces[name], rect)
+        page_file = f"{base_name}_{page_index}.png"
+        pygame.image.save(page_surface, os.path.join(output_dir, page_file))
+        page_files.append(page_file)
+
+    manifest = {
+        "version": 1,
+        "pages": page_files,
+        "regions": {
+            name: {"page": index, "rect": [rect.x, rect.y, rect.width, rect.height]}
+            for name, (index, rect) in sorted(placements.items())
+        },
+    }
+    with open(f"{output_prefix}.json", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of images to pack.")
+    parser.add_argument("-o", "--output", required=True, help="Output path prefix, without extension.")
+    parser.add_argument("--max-size", type=int, default=2048, help="Maximum page width and height in pixels.")
+    parser.add_argument("--padding", type=int, default=1, help="Pixels of padding between images.")
+    args = parser.parse_args()
+
+    manifest = pack_directory(args.source, args.output, args.max_size, args.padding)
+    print(f"Packed {len(manifest['regions'])} images into {len(manifest['pages'])} page(s) at {args.output}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Memory-mapped asset bundles of pre-decoded pixel data.
+
+A bundle holds every image of an asset tree already decoded into the display's native 32-bit pixel layout, with each
+image aligned to a page boundary. At runtime the file is memory-mapped and surfaces are created directly on top of
+the mapping with pygame.image.frombuffer, so loading an image costs page faults instead of PNG decoding, and several
+game processes share the same physical pages.
+
+File layout:
+    header   magic b"TCHB", format version (uint16), reserved (uint16), index length (uint32), little endian
+    index    UTF-8 JSON describing the pixel format and the offset and size of every image
+    pixels   raw rows of each image, every image starting on a PAGE_SIZE boundary
+
+Usage:
+    python -m engine.assets.bundle assets -o assets.bundle
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Optional
+
+import pygame
+
+MAGIC = b"TCHB"
+VERSION = 1
+PAGE_SIZE = 4096 # Alignment of pixel data, so each image maps onto whole pages
+_HEADER = struct.Struct("<4sHHI")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif", ".webp")
+
+
+def asset_key(path: str) -> str:
+    """
+    Normalise an asset path into the key used inside bundles.
+    :param path: Path to an asset, relative to the working directory the game runs from.
+    :return: Path with forward slashes and no redundant separators.
+    """
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def native_pixel_format() -> str:
+    """
+    Get the frombuffer format string matching the display's 32-bit pixel layout.
+    :return: "BGRA" for the common little-endian ARGB layout, otherwise "RGBA".
+    """
+    display = pygame.display.get_surface()
+    if display is not None and display.get_masks()[0] == 0x000000FF: # Red stored in the lowest byte
+        return "RGBA"
+    return "BGRA"
+
+
+class AssetBundle:
+    """A memory-mapped bundle of pre-decoded images."""
+    def __init__(self, path: str):
+        """
+        Open and map a bundle file.
+        :param path: Path of the bundle file.
+        :raises ValueError: If the file is not a supported bundle.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        # Copy-on-write mapping: pages stay shared with the file and other processes until a surface is drawn into
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, _, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle.")
+        index = json.loads(self._map[_HEADER.size:_HEADER.size + index_length].decode("utf-8"))
+        self.pixel_format: str = index["format"]
+        self._entries: dict[str, dict] = index["entries"]
+        self._surfaces: dict[str, pygame.Surface] = {} # Surfaces already created on the mapping, by key
+
+    def __contains__(self, key: str) -> bool:
+        """Check if the bundle holds an asset."""
+        return asset_key(key) in self._entries
+
+    def names(self) -> list[str]:
+        """Get the keys of all assets in the bundle."""
+        return list(self._entries)
+
+    def get_surface(self, key: str) -> pygame.Surface:
+        """
+        Get a surface backed directly by the mapped pixel data, without copying it.
+
+        The same surface is returned for repeated requests, so callers must not draw into it.
+        :param key: Asset path, as stored by the bundler.
+        :return: The surface.
+        :raises KeyError: If the bundle does not hold the asset.
+        """
+        key = asset_key(key)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if key not in self._entries:
+                raise KeyError(f"Asset {key} is not in bundle {self.path}.")
+            entry = self._entries[key]
+            offset = entry["offset"]
+            size = entry["pitch"] * entry["height"]
+            pixels = memoryview(self._map)[offset:offset + size]
+            surface = pygame.image.frombuffer(pixels, (entry["width"], entry["height"]), self.pixel_format)
+            self._surfaces[key] = surface
+        return surface
+
+    def loaded_surfaces(self) -> list[pygame.Surface]:
+        """Get the surfaces already created on the mapping."""
+        return list(self._surfaces.values())
+
+    def close(self) -> None:
+        """
+        Unmap the bundle.
+
+        Surfaces obtained from the bundle point into the mapping. If any are still alive, the mapping stays valid
+        and is unmapped once the last of them is freed.
+        """
+        self._surfaces.clear()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError: # Live surfaces keep the mapping object alive until they are freed
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "AssetBundle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_mounted: list[AssetBundle] = [] # Bundles searched by find_image, most recently mounted first
+
+
+def mount_bundle(path: str) -> AssetBundle:
+    """
+    Open a bundle and make its images available to find_image.
+    :param path: Path of the bundle file.
+    :return: The mounted bundle.
+    """
+    bundle = AssetBundle(path)
+    _mounted.insert(0, bundle)
+    return bundle
+
+
+def unmount_bundle(bundle: AssetBundle) -> None:
+    """Stop serving images from a bundle. The bundle is not closed."""
+    if bundle in _mounted:
+        _mounted.remove(bundle)
+
+
+def mounted_bundles() -> list[AssetBundle]:
+    """Get the mounted bundles, most recently mounted first."""
+    return list(_mounted)
+
+
+def find_image(path: str) -> Optional[pygame.Surface]:
+    """
+    Look up an image in the mounted bundles.
+    :param path: Image path, as it would be passed to pygame.image.load.
+    :return: A shared surface backed by the bundle, or None if no mounted bundle holds the image.
+    """
+    key = asset_key(path)
+    for bundle in _mounted:
+        if key in bundle._entries:
+            return bundle.get_surface(key)
+    return None
+
+
+def build_bundle(source_dir: str, output_path: str, pixel_format: Optional[str] = None) -> dict:
+    """
+    Decode every image in a directory tree and write them into a bundle.
+
+    :param source_dir: Asset directory to bundle. Keys are the image paths including this directory, e.g.
+        "assets/ui/menu_button_1.png", so they match the paths the game loads.
+    :param output_path: Path of the bundle file to write.
+    :param pixel_format: frombuffer format string to store pixels in. Defaults to the native display layout.
+    :return: The index that was written.
+    """
+    pixel_format = pixel_format or native_pixel_format()
+    images: list[tuple[str, bytes, int, int]] = []
+    for root, _, files in os.walk(source_dir):
+        for file_name in sorted(files):
+            if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, file_name)
+                surface = pygame.image.load(path)
+                images.append((asset_key(path), pygame.image.tobytes(surface, pixel_format),
+                               surface.get_width(), surface.get_height()))
+
+    # Lay out the pixel data after the index, which needs the offsets, so size the index with placeholders first
+    entries: dict[str, dict] = {
+        key: {"offset": 0, "width": width, "height": height, "pitch": width * 4} for key, _, width, height in images
+    }
+
+    def encode_index() -> bytes:
+        return json.dumps({"format": pixel_format, "entries": entries}, separators=(",", ":")).encode("utf-8")
+
+    def align(offset: int) -> int:
+        return (offset + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+    data_start = align(_HEADER.size + len(encode_index()) + 64 * len(images)) # Room for the offset digits
+    offset = data_start
+    for key, pixels, _, _ in images:
+        entries[key]["offset"] = offset
+        offset = align(offset + len(pixels))
+    index = encode_index()
+
+    with open(output_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, len(index)))
+        file.write(index)
+        for key, pixels, _, _ in images:
+            file.seek(entries[key]["offset"])
+            file.write(pixels)
+        file.truncate(max(offset, data_start))
+    return {"format": pixel_format, "entries": entries}
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Asset directory to bundle.")
+    parser.add_argument("-o", "--output", required=True, help="Path of the bundle file to write.")
+    parser.add_argument("--format", choices=("BGRA", "RGBA"), default=None,
+                        help="Pixel layout to store. Defaults to the layout of the current display.")
+    args = parser.parse_args()
+
+    if args.format is None: # Open a hidden display to find the native layout
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    index = build_bundle(args.source, args.output, args.format)
+    print(f"Bundled {len(index['entries'])} images into {args.output} ({index['format']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Recording and replay of the per-frame input stream.
+
+A recording holds, for every frame, the delta time passed to the scenes and the events passed to
+SceneManager.handle_events. Replaying it feeds the same events with the same delta times back into the scenes, so a
+session, such as one that stutters when the pause menu opens, can be reproduced exactly and profiled offline.
+
+Replays are only exact for scenes that take all their input from events and delta times. Reading live state, such
+as pygame.mouse.get_pos or an unseeded random number generator, is not recorded.
+
+File layout: an 8-byte magic, a little-endian uint16 format version, then one zlib stream holding every frame:
+    frame:  float64 dt, uint16 event count, events
+    event:  uint32 type, uint8 attribute count, attributes
+    attribute: uint8 name length, UTF-8 name, tagged value
+A tagged value is one tag byte followed by its data. Values that are not numbers, strings, bytes, None or tuples of
+those (such as window objects) are left out of the recording.
+"""
+import struct
+import zlib
+from typing import Any, BinaryIO, Iterator, Optional
+
+import pygame
+
+MAGIC = b"TACHREC\0"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sH") # Magic and format version
+_FRAME = struct.Struct("<dH") # Delta time and event count
+_EVENT = struct.Struct("<IB") # Event type and attribute count
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<I")
+
+# Value tags
+_NONE = b"n"
+_FALSE = b"f"
+_TRUE = b"t"
+_INTEGER = b"i"
+_REAL = b"d"
+_STRING = b"s"
+_BYTES = b"b"
+_TUPLE = b"("
+
+
+def _encode_value(value: Any) -> Optional[bytes]:
+    """
+    Encode an event attribute value.
+    :param value: Value to encode.
+    :return: Tagged bytes of the value, or None if the value cannot be recorded.
+    """
+    if value is None:
+        return _NONE
+    if isinstance(value, bool): # Checked before int, as bool is a subclass of int
+        return _TRUE if value else _FALSE
+    if isinstance(value, int):
+        return _INTEGER + _INT.pack(value)
+    if isinstance(value, float):
+        return _REAL + _FLOAT.pack(value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _STRING + _LENGTH.pack(len(data)) + data
+    if isinstance(value, (bytes, bytearray)):
+        return _BYTES + _LENGTH.pack(len(value)) + bytes(value)
+    if isinstance(value, (tuple, list)):
+        items = [_encode_value(item) for item in value]
+        if any(item is None for item in items):
+            return None
+        return _TUPLE + _LENGTH.pack(len(items)) + b"".join(items)
+    return None
+
+
+def _decode_value(data: bytes, offset: int) -> tuple[Any, int]:
+    """
+    Decode an event attribute value.
+    :param data: Decompressed recording.
+    :param offset: Position of the value's tag.
+    :return: The value and the position after it.
+    :raises ValueError: If the tag is not known.
+    """
+    tag, offset = data[offset:offset + 1], offset + 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE or tag == _FALSE:
+        return tag == _TRUE, offset
+    if tag == _INTEGER:
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == _REAL:
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+    if tag == _STRING or tag == _BYTES:
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        raw = data[offset:offset + length]
+        return (raw.decode("utf-8") if tag == _STRING else raw), offset + length
+    if tag == _TUPLE:
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        items = []
+        for _ in range(length):
+            item, offset = _decode_value(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise ValueError(f"Unknown value tag {tag!r} in input recording.")
+
+
+def encode_event(event: pygame.event.Event) -> bytes:
+    """
+    Encode one event, leaving out attributes that cannot be recorded.
+    :param event: Event to encode.
+    :return: Encoded event.
+    """
+    attributes = []
+    for name, value in event.dict.items():
+        encoded = _encode_value(value)
+        if encoded is None:
+            continue
+        name_data = name.encode("utf-8")
+        attributes.append(bytes((len(name_data),)) + name_data + encoded)
+    return _EVENT.pack(event.type, len(attributes)) + b"".join(attributes)
+
+
+class InputRecorder:
+    """
+    Writes the delta time and events of each frame to a recording file.
+
+    Example:
+        with InputRecorder("session.rec") as recorder:
+            recorder.record_frame(dt, events)  # call once every frame
+    """
+    def __init__(self, path: str, compression_level: int = 6):
+        """
+        Create a recording file, replacing any existing file.
+        :param path: Path of the recording.
+        :param compression_level: zlib compression level, from 1 (fastest) to 9 (smallest).
+        """
+        self.path = path
+        self.frames = 0 # Number of frames recorded so far
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._compressor = zlib.compressobj(compression_level)
+
+    def record_frame(self, dt: float, events: list[pygame.event.Event]) -> None:
+        """
+        Record one frame.
+        :param dt: Delta time in seconds passed to the scenes this frame.
+        :param events: Events passed to the scenes this frame.
+        """
+        frame = _FRAME.pack(dt, len(events)) + b"".join(encode_event(event) for event in events)
+        self._file.write(self._compressor.compress(frame)) # Buffered by zlib, so most frames write nothing
+        self.frames += 1
+
+    def close(self) -> None:
+        """Finish the compressed stream and close the file."""
+        if self._file is None:
+            return None
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "InputRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InputReplay:
+    """
+    Reads a recording and hands back its frames in order.
+
+    Example:
+        replay = InputReplay("session.rec")
+        for dt, events in replay:
+            scene_manager.handle_events(events)
+            scene_manager.update(dt)
+    """
+    def __init__(self, path: str):
+        """
+        Load a recording.
+        :param path: Path of the recording.
+        :raises ValueError: If the file is not a recording or its version is not supported.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            raw = file.read()
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"{path} is not an input recording.")
+        magic, version = _HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an input recording.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported input recording version {version} in {path}.")
+        self._data = zlib.decompress(raw[_HEADER.size:])
+        self._offset = 0 # Position of the next frame in the decompressed data
+        self.frame = 0 # Number of frames read so far
+
+    @property
+    def finished(self) -> bool:
+        """Check if every frame has been read."""
+        return self._offset >= len(self._data)
+
+    def next_frame(self) -> Optional[tuple[float, list[pygame.event.Event]]]:
+        """
+        Read the next frame.
+        :return: Delta time and events of the frame, or None once every frame has been read.
+        """
+        if self.finished:
+            return None
+        data = self._data
+        dt, count = _FRAME.unpack_from(data, self._offset)
+        offset = self._offset + _FRAME.size
+        events = []
+        for _ in range(count):
+            event_type, attribute_count = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            attributes = {}
+            for _ in range(attribute_count):
+                length = data[offset]
+                name = data[offset + 1:offset + 1 + length].decode("utf-8")
+                attributes[name], offset = _decode_value(data, offset + 1 + length)
+            events.append(pygame.event.Event(event_type, attributes))
+        self._offset = offset
+        self.frame += 1
+        return dt, events
+
+    def rewind(self) -> None:
+        """Start reading from the first frame again."""
+        self._offset = 0
+        self.frame = 0
+
+    def __iter__(self) -> Iterator[tuple[float, list[pygame.event.Event]]]:
+        """Iterate over the remaining frames."""
+        while (frame := self.next_frame()) is not None:
+            yield frame
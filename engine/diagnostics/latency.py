@@ -0,0 +1,210 @@
+"""
+Input-to-photon latency measurement.
+
+Each input event is timestamped as soon as pygame.event.get returns it. Events are then handed to the scenes in one
+batch, exactly as without measuring, and an event counts as handled when handling it changed what will be drawn,
+which is detected through the UI element revision counter (a button redrawing on hover or press, a scene being pushed
+by a click, and so on). The revision is checked through the scene manager's event observer after the elements of the
+scene handled each event. Changes made afterwards by the scene itself, such as ESC pushing the pause menu, are
+credited to every event of the batch not credited yet. The latency of a handled event is the time from its timestamp
+until the end of the first display.flip after it was handled, together with the number of frames presented in
+between.
+
+The flip timestamp is taken when display.flip returns, which is when the frame was handed to the display, not when
+the monitor lit it, so the measurement leaves out the display's own scanout delay.
+
+With pipelined frames, events are handled on the simulation thread while the previous frame is presented. Calling
+frame_captured when a frame is captured attributes the events handled so far to that frame, so each event is timed to
+the flip of the frame that actually shows it.
+
+Example:
+    tracker = LatencyTracker()
+    events = pygame.event.get()
+    tracker.events_received(events)
+    tracker.handle_events(scene_manager, events)
+    ...
+    pygame.display.flip()
+    tracker.frame_presented()
+    print(tracker.format_report())
+"""
+import time
+from collections import deque
+from typing import Any, Optional
+
+import numpy as np
+import pygame
+
+from engine.scene_manager import SceneManager
+from engine.user_interface import ui_element
+
+INPUT_EVENTS = frozenset((
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+    pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+    pygame.CONTROLLERBUTTONDOWN, pygame.CONTROLLERBUTTONUP, pygame.CONTROLLERAXISMOTION,
+)) # Event types that are timed
+
+HISTOGRAM_EDGES_MS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 25, 33, 50, 100, float("inf")) # Latency bucket edges
+
+
+class LatencyTracker:
+    """Measures the time from input events arriving to the first frame that shows their effect."""
+    def __init__(self, max_samples: int = 10_000):
+        """
+        Initialise an empty tracker.
+        :param max_samples: Number of most recent latencies kept for each event type.
+        """
+        self.max_samples = max_samples
+        self.frame = 0 # Number of frames presented so far
+        self._received: dict[int, tuple[float, int]] = {} # Arrival time and frame of each event received this
+        # frame, by object id
+        self._handled: list[tuple[int, float, int]] = [] # Type, arrival time and arrival frame of handled events
+        # waiting for the next flip
+        self._captured: list[tuple[int, float, int]] = [] # Handled events in the captured frame, when pipelined
+        self._pipelined = False # Whether frame_captured is in use
+        self._samples: dict[int, deque] = {} # Latencies in milliseconds, by event type
+        self._frames: dict[int, deque] = {} # Frames presented before each latency sample, by event type
+        self.unhandled = 0 # Number of timed events that changed nothing on screen
+        self._revision = 0 # Element revision when the last event of the batch being handled was observed
+        self._credited: set[int] = set() # Object ids of the events of the batch being handled that changed something
+
+    def events_received(self, events: list[pygame.event.Event]) -> None:
+        """
+        Timestamp the input events of a frame. Call as soon as the events have been read.
+        :param events: Events returned by pygame.event.get.
+        """
+        now = time.perf_counter()
+        self._received = {id(event): (now, self.frame) for event in events if event.type in INPUT_EVENTS}
+
+    def handle_events(self, scene_manager: SceneManager, events: list[pygame.event.Event]) -> None:
+        """
+        Pass events to the scene manager in one batch, noting which ones changed what will be drawn.
+        :param scene_manager: Scene manager to handle the events.
+        :param events: Events passed to events_received this frame.
+        """
+        self._revision = ui_element.revision()
+        self._credited = set()
+        scene_manager.event_observer = self._event_handled
+        try:
+            scene_manager.handle_events(events)
+        finally:
+            scene_manager.event_observer = None
+
+        changed_after = ui_element.revision() != self._revision # Changed by the scene after its elements
+        for event in events:
+            arrival = self._received.get(id(event))
+            if arrival is None:
+                continue
+            if id(event) in self._credited or changed_after:
+                self._handled.append((event.type, *arrival))
+            else:
+                self.unhandled += 1
+        self._received = {}
+        self._credited = set()
+
+    def _event_handled(self, event: pygame.event.Event) -> None:
+        """Credit an event if the elements changed what will be drawn while handling it."""
+        current = ui_element.revision()
+        if current != self._revision:
+            self._revision = current
+            self._credited.add(id(event))
+
+    def frame_captured(self) -> None:
+        """
+        Attribute the events handled so far to the frame being captured, for pipelined frames. Call on the frame
+        thread while the simulation thread is idle.
+        """
+        self._pipelined = True
+        self._captured.extend(self._handled)
+        self._handled.clear()
+
+    def frame_presented(self) -> None:
+        """
+        Record the latency of every event handled since the last flip, or shown in the last captured frame when
+        pipelined. Call as soon as display.flip returns.
+        """
+        self.frame += 1
+        handled = self._captured if self._pipelined else self._handled
+        if not handled:
+            return None
+        now = time.perf_counter()
+        for event_type, arrived, arrival_frame in handled:
+            samples = self._samples.get(event_type)
+            if samples is None:
+                samples = self._samples[event_type] = deque(maxlen=self.max_samples)
+                self._frames[event_type] = deque(maxlen=self.max_samples)
+            samples.append((now - arrived) * 1000.0)
+            self._frames[event_type].append(self.frame - arrival_frame) # Flips until the event showed
+        handled.clear()
+
+    def reset(self) -> None:
+        """Forget every sample."""
+        self._samples.clear()
+        self._frames.clear()
+        self._handled.clear()
+        self._captured.clear()
+        self.unhandled = 0
+
+    @staticmethod
+    def _summarise(samples: np.ndarray, frames: np.ndarray) -> dict[str, Any]:
+        """Summarise latency samples as statistics and a histogram."""
+        counts, _ = np.histogram(samples, bins=HISTOGRAM_EDGES_MS)
+        return {
+            "count": int(samples.size),
+            "mean_ms": float(samples.mean()),
+            "p50_ms": float(np.percentile(samples, 50)),
+            "p95_ms": float(np.percentile(samples, 95)),
+            "p99_ms": float(np.percentile(samples, 99)),
+            "max_ms": float(samples.max()),
+            "mean_frames": float(frames.mean()),
+            "histogram": [
+                {"from_ms": low, "to_ms": high if high != float("inf") else None, "count": int(count)}
+                for low, high, count in zip(HISTOGRAM_EDGES_MS, HISTOGRAM_EDGES_MS[1:], counts)
+            ],
+        }
+
+    def report(self) -> dict[str, Any]:
+        """
+        Summarise the latencies measured so far.
+        :return: Dictionary with a summary for all events together under "all", one per event type name under
+            "events", and the number of timed events that changed nothing on screen. Summaries hold the sample count,
+            mean, median, 95th and 99th percentile and maximum latency in milliseconds, the mean number of frames
+            presented until the event showed, and a histogram of latencies.
+        """
+        result: dict[str, Any] = {"all": None, "events": {}, "unhandled": self.unhandled}
+        if not self._samples:
+            return result
+        for event_type, samples in self._samples.items():
+            result["events"][pygame.event.event_name(event_type)] = self._summarise(
+                np.fromiter(samples, dtype=np.float64), np.fromiter(self._frames[event_type], dtype=np.float64)
+            )
+        result["all"] = self._summarise(
+            np.concatenate([np.fromiter(samples, dtype=np.float64) for samples in self._samples.values()]),
+            np.concatenate([np.fromiter(frames, dtype=np.float64) for frames in self._frames.values()])
+        )
+        return result
+
+    def format_report(self, summary: Optional[dict[str, Any]] = None) -> str:
+        """
+        Format a report as a text table with a histogram of all latencies.
+        :param summary: Report from report(). Taken now if not given.
+        :return: The formatted report.
+        """
+        summary = self.report() if summary is None else summary
+        if summary["all"] is None:
+            return "No input events were handled."
+        lines = [f"{'event':<20}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'frames':>8}"]
+        for name, stats in [("all", summary["all"])] + sorted(summary["events"].items()):
+            lines.append(f"{name:<20}{stats['count']:>8}{stats['mean_ms']:>9.2f}{stats['p50_ms']:>9.2f}"
+                         f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}"
+                         f"{stats['mean_frames']:>8.2f}")
+        lines.append(f"Timed events that changed nothing on screen: {summary['unhandled']}")
+
+        buckets = summary["all"]["histogram"]
+        peak = max(bucket["count"] for bucket in buckets) or 1
+        for bucket in buckets:
+            high = f"{bucket['to_ms']:g}" if bucket["to_ms"] is not None else "inf"
+            bar = "#" * round(40 * bucket["count"] / peak)
+            lines.append(f"{bucket['from_ms']:>5g}-{high:<4} ms {bucket['count']:>8} {bar}".rstrip())
+        return "\n".join(lines)
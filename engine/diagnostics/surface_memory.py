@@ -0,0 +1,219 @@
+"""
+Pixel memory accounting for scenes and their UI elements.
+
+Walks the scene manager's stack and reports the bytes of surface memory held by each scene and each UI element,
+using the surfaces elements expose through iter_surfaces. Subsurfaces are counted against the surface that owns
+their pixels, and each surface is only counted once per scene, so images drawn from the same atlas page or from a
+shared surface are not counted several times. Atlas pages and bundle surfaces are shared between scenes and reported
+separately as shared bytes.
+
+SurfaceLeakTracker finds surfaces that are still alive after the scene holding them was removed from the stack,
+such as surfaces kept in module-level caches or by closures registered elsewhere.
+
+Example:
+    tracker = SurfaceLeakTracker(engine.scene_manager)
+    engine.scene_manager.change_scene("game")
+    for leak in tracker.check():
+        print(leak["scene"], leak["bytes"])
+    dump_report(engine.scene_manager, "memory.json", tracker)
+"""
+import gc
+import json
+import weakref
+from typing import Any, Iterable, Optional
+
+import pygame
+
+from engine.assets.atlas import loaded_atlases
+from engine.assets.bundle import mounted_bundles
+from engine.scene import Scene
+from engine.scene_manager import SceneManager
+from engine.user_interface.ui_element import UIElement
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """
+    Get the bytes of pixel memory behind a surface.
+    :param surface: Surface or subsurface.
+    :return: Size of the pixel buffer of the surface that owns the pixels.
+    """
+    owner = surface.get_abs_parent()
+    return owner.get_pitch() * owner.get_height()
+
+
+def shared_surfaces() -> set[int]:
+    """Get the ids of the surfaces shared between scenes: loaded atlas pages and surfaces of mounted bundles."""
+    shared = {id(page) for atlas in loaded_atlases() for page in atlas.pages}
+    shared.update(id(surface.get_abs_parent()) for bundle in mounted_bundles() for surface in bundle.loaded_surfaces())
+    return shared
+
+
+def _count_surfaces(surfaces: Iterable[pygame.Surface], shared: set[int], seen: set[int]) -> tuple[int, int, int]:
+    """
+    Add up the memory behind a group of surfaces, skipping pixel buffers that were already counted.
+    :param surfaces: Surfaces to count.
+    :param shared: Ids of the shared surfaces.
+    :param seen: Ids of the pixel-owning surfaces already counted, updated in place.
+    :return: Owned bytes, shared bytes and number of surfaces.
+    """
+    owned_bytes = shared_bytes = count = 0
+    for surface in surfaces:
+        count += 1
+        owner = surface.get_abs_parent()
+        if id(owner) in seen:
+            continue
+        seen.add(id(owner))
+        if id(owner) in shared:
+            shared_bytes += surface_bytes(owner)
+        else:
+            owned_bytes += surface_bytes(owner)
+    return owned_bytes, shared_bytes, count
+
+
+def element_report(element: UIElement, shared: Optional[set[int]] = None,
+                   seen: Optional[set[int]] = None) -> dict[str, Any]:
+    """
+    Report the surface memory held by an element and its children.
+    :param element: Element to report on.
+    :param shared: Ids of the shared surfaces. Looked up if not given.
+    :param seen: Ids of the pixel buffers already counted elsewhere, updated in place.
+    :return: Dictionary with the element's type, id, owned bytes, shared bytes, surface count, total bytes including
+        its children, and the reports of its children.
+    """
+    shared = shared_surfaces() if shared is None else shared
+    seen = set() if seen is None else seen
+    owned_bytes, shared_bytes, count = _count_surfaces(element.iter_surfaces(), shared, seen)
+    children = [element_report(child, shared, seen) for child in element.children]
+    return {
+        "type": type(element).__name__,
+        "id": element.id,
+        "bytes": owned_bytes,
+        "shared_bytes": shared_bytes,
+        "surfaces": count,
+        "total_bytes": owned_bytes + sum(child["total_bytes"] for child in children),
+        "children": children,
+    }
+
+
+def scene_report(scene: Scene, shared: Optional[set[int]] = None) -> dict[str, Any]:
+    """
+    Report the surface memory held by a scene and its elements.
+    :param scene: Scene to report on.
+    :param shared: Ids of the shared surfaces. Looked up if not given.
+    :return: Dictionary with the scene's type, the bytes held by the scene itself, the total owned and shared bytes,
+        and a report for each element.
+    """
+    shared = shared_surfaces() if shared is None else shared
+    seen: set[int] = set()
+    own_bytes, shared_bytes, _ = _count_surfaces(scene.iter_surfaces(), shared, seen)
+    elements = [element_report(element, shared, seen) for element in scene.ui_elements]
+
+    def add_shared(report: dict[str, Any]) -> int:
+        return report["shared_bytes"] + sum(add_shared(child) for child in report["children"])
+
+    return {
+        "type": type(scene).__name__,
+        "scene_bytes": own_bytes,
+        "total_bytes": own_bytes + sum(element["total_bytes"] for element in elements),
+        "shared_bytes": shared_bytes + sum(add_shared(element) for element in elements),
+        "elements": elements,
+    }
+
+
+def memory_report(scene_manager: SceneManager) -> dict[str, Any]:
+    """
+    Report the surface memory held by every scene on the stack.
+    :param scene_manager: Scene manager to walk.
+    :return: Dictionary with a report for each scene, bottom of the stack first, the total owned bytes, and the
+        bytes held by shared atlas pages and bundle surfaces.
+    """
+    shared = shared_surfaces()
+    scenes = [scene_report(scene, shared) for scene in scene_manager._stack]
+    shared_total = sum(surface_bytes(page) for atlas in loaded_atlases() for page in atlas.pages)
+    shared_total += sum(surface_bytes(surface) for bundle in mounted_bundles() for surface in bundle.loaded_surfaces())
+    return {
+        "scenes": scenes,
+        "total_bytes": sum(scene["total_bytes"] for scene in scenes),
+        "shared_bytes": shared_total,
+    }
+
+
+class SurfaceLeakTracker:
+    """
+    Watches scenes removed from a scene manager and reports those whose surfaces stay alive.
+
+    When a scene is dropped, weak references to it and to every surface it held are kept. A surface that is still
+    alive after garbage collection is a leak: something outside the scene still refers to it.
+    """
+    def __init__(self, scene_manager: SceneManager):
+        """
+        Start watching a scene manager.
+        :param scene_manager: Scene manager whose dropped scenes are tracked.
+        """
+        self.scene_manager = scene_manager
+        self._dropped: list[tuple[str, weakref.ref, list[weakref.ref]]] = [] # Scene type, scene and surfaces
+        scene_manager.add_drop_listener(self._on_drop)
+
+    def _on_drop(self, scene: Scene) -> None:
+        """Take weak references to a dropped scene and every surface it held."""
+        shared = shared_surfaces()
+        owners = {}
+        surfaces = list(scene.iter_surfaces())
+        stack = list(scene.ui_elements)
+        while stack:
+            element = stack.pop()
+            surfaces.extend(element.iter_surfaces())
+            stack.extend(element.children)
+        for surface in surfaces:
+            owner = surface.get_abs_parent()
+            if id(owner) not in shared:
+                owners[id(owner)] = owner # Subsurfaces keep their parent alive, so tracking the owner is enough
+        surface_refs = [weakref.ref(owner) for owner in owners.values()]
+        self._dropped.append((type(scene).__name__, weakref.ref(scene), surface_refs))
+
+    def check(self, collect: bool = True) -> list[dict[str, Any]]:
+        """
+        Find surfaces of dropped scenes that are still alive.
+
+        Entries for scenes whose surfaces have all been freed are forgotten.
+        :param collect: Whether to run the garbage collector first, so reference cycles do not show up as leaks.
+        :return: One dictionary per dropped scene with leftover surfaces, holding the scene type, whether the scene
+            object itself is still alive, the number of leaked surfaces and their bytes.
+        """
+        if collect:
+            gc.collect()
+        leaks = []
+        remaining = []
+        for scene_type, scene_ref, surface_refs in self._dropped:
+            alive = [surface for surface in (ref() for ref in surface_refs) if surface is not None]
+            if not alive:
+                continue
+            remaining.append((scene_type, scene_ref, surface_refs))
+            leaks.append({
+                "scene": scene_type,
+                "scene_alive": scene_ref() is not None,
+                "surfaces": len(alive),
+                "bytes": sum(surface_bytes(surface) for surface in alive),
+            })
+        self._dropped = remaining
+        return leaks
+
+    def stop(self) -> None:
+        """Stop watching the scene manager."""
+        self.scene_manager.remove_drop_listener(self._on_drop)
+
+
+def dump_report(scene_manager: SceneManager, path: str, tracker: Optional[SurfaceLeakTracker] = None) -> dict:
+    """
+    Write a memory report, and optionally the current leaks, to a JSON file.
+    :param scene_manager: Scene manager to walk.
+    :param path: Path of the JSON file.
+    :param tracker: Leak tracker whose leaks are included under "leaks".
+    :return: The report written.
+    """
+    report = memory_report(scene_manager)
+    if tracker is not None:
+        report["leaks"] = tracker.check()
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    return report
@@ -0,0 +1,332 @@
+"""
+Vectorised particle emitter for effects such as sparks, smoke and trails.
+
+Particle state is kept in NumPy arrays in structure-of-arrays form (one array per property), so integration, ageing
+and removal of dead particles are done for every particle at once each frame instead of per particle in Python.
+Particles are drawn either as single pixels written straight into the target through pygame.surfarray, or as a
+sprite blitted for every particle with one batched blits call.
+"""
+from itertools import repeat
+from typing import Iterator, Optional
+
+import numpy as np
+import pygame
+
+from engine.rendering.draw_list import DrawList
+from engine.user_interface.ui_element import UIElement
+
+_STATE_ARRAYS = ("_px", "_py", "_vx", "_vy", "_age", "_life", "_colour") # Arrays holding one entry per particle
+
+
+class ParticleEmitter(UIElement):
+    """
+    Emits particles from its position and simulates them in bulk.
+
+    Particles are simulated in screen coordinates and do not follow the emitter once emitted, so moving the
+    emitter leaves a trail.
+
+    Example:
+        sparks = ParticleEmitter(400, 300, life=(0.3, 0.8), speed=(100, 300), gravity=(0, 400))
+        sparks.burst(200)
+        scene.add_ui_element(sparks)
+    """
+    __slots__ = ("rate", "life", "speed", "angle", "gravity", "drag", "start_colour", "end_colour",
+                 "colour_variance", "fade", "size", "sprite", "emitting", "max_particles", "_count", "_capacity",
+                 "_spawn_accumulator", "_rng", "_px", "_py", "_vx", "_vy", "_age", "_life", "_colour")
+
+    def __init__(self, x: int, y: int,
+                 rate: float = 0.0,
+                 life: tuple[float, float] = (0.5, 1.0),
+                 speed: tuple[float, float] = (50.0, 150.0),
+                 angle: tuple[float, float] = (0.0, 360.0),
+                 gravity: tuple[float, float] = (0.0, 0.0),
+                 drag: float = 0.0,
+                 start_colour: tuple = (255, 255, 255),
+                 end_colour: Optional[tuple] = None,
+                 colour_variance: int = 0,
+                 fade: bool = False,
+                 size: int = 1,
+                 sprite: Optional[pygame.Surface] = None,
+                 max_particles: int = 100_000,
+                 capacity: int = 1024,
+                 layer: int = 0,
+                 element_id: Optional[str] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialise a particle emitter.
+
+        :param x: X-axis position particles are emitted from.
+        :param y: Y-axis position particles are emitted from.
+        :param rate: Particles emitted per second while emitting. 0 only emits on bursts.
+        :param life: Range of particle lifetimes in seconds.
+        :param speed: Range of initial particle speeds in pixels per second.
+        :param angle: Range of emission angles in degrees, where 0 points right and 90 points down.
+        :param gravity: Acceleration applied to every particle, in pixels per second squared.
+        :param drag: Fraction of velocity lost per second.
+        :param start_colour: RGB colour of new particles.
+        :param end_colour: RGB colour particles blend towards over their life. None keeps the start colour.
+        :param colour_variance: Maximum random offset added to each channel of the start colour.
+        :param fade: Whether particles become more transparent over their life. Only applies to pixel particles.
+        :param size: Width and height of pixel particles.
+        :param sprite: Surface to draw for every particle instead of pixels.
+        :param max_particles: Maximum number of live particles. Extra emissions are dropped.
+        :param capacity: Initial size of the particle arrays. Grows automatically up to max_particles.
+        :param layer: Z-order for rendering.
+        :param element_id: Optional identifier.
+        :param seed: Seed for the random number generator, for repeatable effects.
+        """
+        super().__init__(x, y, layer, element_id)
+        self.rate = rate
+        self.life = life
+        self.speed = speed
+        self.angle = angle
+        self.gravity = gravity
+        self.drag = drag
+        self.start_colour = start_colour
+        self.end_colour = end_colour
+        self.colour_variance = colour_variance
+        self.fade = fade
+        self.size = max(1, int(size))
+        self.sprite = sprite
+        self.emitting = True # Whether particles are emitted continuously at the emission rate
+        self.max_particles = max_particles
+        self._count = 0 # Number of live particles, stored at the front of every array
+        self._capacity = max(1, int(capacity))
+        self._spawn_accumulator = 0.0 # Fractional particles carried over between frames of continuous emission
+        self._rng = np.random.default_rng(seed)
+
+        self._px = np.zeros(self._capacity, dtype=np.float32) # X positions
+        self._py = np.zeros(self._capacity, dtype=np.float32) # Y positions
+        self._vx = np.zeros(self._capacity, dtype=np.float32) # X velocities
+        self._vy = np.zeros(self._capacity, dtype=np.float32) # Y velocities
+        self._age = np.zeros(self._capacity, dtype=np.float32) # Seconds since emission
+        self._life = np.ones(self._capacity, dtype=np.float32) # Seconds before removal
+        self._colour = np.zeros((self._capacity, 3), dtype=np.float32) # Starting RGB colours
+
+    def __len__(self) -> int:
+        """Get the number of live particles."""
+        return self._count
+
+    def _grow(self, required: int) -> None:
+        """
+        Enlarge every particle array to hold at least a number of particles.
+        :param required: Number of particles that must fit.
+        """
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        for name in _STATE_ARRAYS:
+            array = getattr(self, name)
+            grown = np.ones((capacity,) + array.shape[1:], dtype=array.dtype) if name == "_life" else \
+                np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._count] = array[:self._count]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def burst(self, count: int, x: Optional[float] = None, y: Optional[float] = None) -> int:
+        """
+        Emit a number of particles at once.
+        :param count: Number of particles to emit.
+        :param x: X-axis position to emit from. Defaults to the emitter's position.
+        :param y: Y-axis position to emit from. Defaults to the emitter's position.
+        :return: Number of particles actually emitted, which is lower if max_particles is reached.
+        """
+        count = min(int(count), self.max_particles - self._count)
+        if count <= 0:
+            return 0
+        if x is None or y is None:
+            x, y = self.get_world_position()
+
+        start, end = self._count, self._count + count
+        if end > self._capacity:
+            self._grow(end)
+
+        rng = self._rng
+        angles = np.radians(rng.uniform(self.angle[0], self.angle[1], count))
+        speeds = rng.uniform(self.speed[0], self.speed[1], count)
+        self._px[start:end] = x
+        self._py[start:end] = y
+        self._vx[start:end] = np.cos(angles) * speeds
+        self._vy[start:end] = np.sin(angles) * speeds
+        self._age[start:end] = 0.0
+        self._life[start:end] = rng.uniform(self.life[0], self.life[1], count)
+        colours = self._colour[start:end]
+        colours[:] = self.start_colour[:3]
+        if self.colour_variance:
+            colours += rng.uniform(-self.colour_variance, self.colour_variance, (count, 3))
+            np.clip(colours, 0, 255, out=colours)
+
+        self._count = end
+        self.invalidate()
+        return count
+
+    def clear(self) -> None:
+        """Remove every live particle."""
+        if self._count:
+            self._count = 0
+            self.invalidate()
+
+    def update(self, dt: float) -> None:
+        """
+        Emit new particles, then move, age and remove particles in bulk.
+        :param dt: Delta time in seconds.
+        """
+        if self.emitting and self.rate > 0:
+            self._spawn_accumulator += self.rate * dt
+            spawn = int(self._spawn_accumulator)
+            if spawn:
+                self._spawn_accumulator -= spawn
+                self.burst(spawn)
+
+        n = self._count
+        if n == 0:
+            return None
+
+        vx, vy = self._vx[:n], self._vy[:n]
+        if self.drag:
+            damping = max(0.0, 1.0 - self.drag * dt)
+            vx *= damping
+            vy *= damping
+        if self.gravity[0]:
+            vx += self.gravity[0] * dt
+        if self.gravity[1]:
+            vy += self.gravity[1] * dt
+        self._px[:n] += vx * dt
+        self._py[:n] += vy * dt
+        age = self._age[:n]
+        age += dt
+
+        alive = age < self._life[:n]
+        remaining = int(np.count_nonzero(alive))
+        if remaining != n: # Compact the survivors to the front of every array
+            for name in _STATE_ARRAYS:
+                array = getattr(self, name)
+                array[:remaining] = array[:n][alive]
+            self._count = remaining
+        self.invalidate()
+
+    def _screen_positions(self, origin: tuple[int, int], bounds: tuple[int, int, int, int], scale: float = 1.0):
+        """
+        Get the integer positions of the live particles on a target surface, culling those outside it.
+        :param origin: Screen position that maps to the top-left corner of the target surface.
+        :param bounds: Left, top, right and bottom limits a position must fall within (right and bottom exclusive).
+        :param scale: Size of the target relative to screen coordinates.
+        :return: X positions, Y positions and the indices of the particles kept, or None if every particle is kept.
+        """
+        n = self._count
+        if scale == 1.0:
+            xs = (self._px[:n] - origin[0]).astype(np.intp)
+            ys = (self._py[:n] - origin[1]).astype(np.intp)
+        else:
+            xs = ((self._px[:n] - origin[0]) * scale).astype(np.intp)
+            ys = ((self._py[:n] - origin[1]) * scale).astype(np.intp)
+        left, top, right, bottom = bounds
+        on_target = (xs >= left) & (xs < right) & (ys >= top) & (ys < bottom)
+        if on_target.all():
+            return xs, ys, None
+        index = np.flatnonzero(on_target)
+        return xs[index], ys[index], index
+
+    def _colours(self, index: Optional[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the current colour and opacity of the live particles.
+        :param index: Indices of the particles to get, or None for all of them.
+        :return: RGB colours as floats from 0 to 255, and life progress from 0 to 1.
+        """
+        n = self._count
+        colours = self._colour[:n]
+        progress = self._age[:n] / self._life[:n]
+        if index is not None:
+            colours, progress = colours[index], progress[index]
+        if self.end_colour is not None:
+            colours = colours + (np.asarray(self.end_colour[:3], dtype=np.float32) - colours) * progress[:, None]
+        return colours, progress
+
+    def _write_pixels(self, screen: pygame.Surface, origin: tuple[int, int], scale: float = 1.0) -> None:
+        """Write every particle on the target directly as pixels, scaling positions and size by a target scale."""
+        size = max(1, round(self.size * scale))
+        bounds = (0, 0, screen.get_width() - size + 1, screen.get_height() - size + 1)
+        xs, ys, index = self._screen_positions(origin, bounds, scale)
+        if xs.size == 0:
+            return None
+        colours, progress = self._colours(index)
+        offsets = [(dx, dy) for dx in range(size) for dy in range(size)]
+
+        if self.fade or screen.get_bytesize() == 3: # Blend with the RGB channels of the target
+            opacity = (1.0 - progress)[:, None] if self.fade else None
+            pixels = pygame.surfarray.pixels3d(screen)
+            try:
+                for dx, dy in offsets:
+                    px, py = xs + dx, ys + dy
+                    if opacity is None:
+                        pixels[px, py] = colours
+                    else:
+                        behind = pixels[px, py]
+                        pixels[px, py] = behind + (colours - behind) * opacity
+            finally:
+                del pixels # Unlock the surface
+            return None
+
+        # Pack the colours into the target's pixel format, avoiding a map_rgb call per particle
+        shifts, losses, masks = screen.get_shifts(), screen.get_losses(), screen.get_masks()
+        rgb = colours.astype(np.uint32)
+        packed = ((rgb[:, 0] >> losses[0]) << shifts[0]) | ((rgb[:, 1] >> losses[1]) << shifts[1]) | \
+            ((rgb[:, 2] >> losses[2]) << shifts[2]) | np.uint32(masks[3]) # Fully opaque if the target has alpha
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            for dx, dy in offsets:
+                pixels[xs + dx, ys + dy] = packed
+        finally:
+            del pixels # Unlock the surface
+
+    def _sprite_commands(self, origin: tuple[int, int], width: int, height: int) -> list:
+        """
+        Build a blit command for every particle sprite on a target surface.
+        :return: List of (sprite, position) pairs.
+        """
+        sprite_width, sprite_height = self.sprite.get_size()
+        origin = (origin[0] + sprite_width // 2, origin[1] + sprite_height // 2) # Centre sprites on particles
+        bounds = (1 - sprite_width, 1 - sprite_height, width, height) # Keep sprites that are partly on the target
+        xs, ys, _ = self._screen_positions(origin, bounds)
+        return list(zip(repeat(self.sprite), zip(xs.tolist(), ys.tolist())))
+
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
+        """Draw the live particles if visible."""
+        if not self.visible or self._count == 0:
+            return None
+
+        if self.sprite is None:
+            self._write_pixels(screen, origin)
+        else:
+            screen.blits(self._sprite_commands(origin, screen.get_width(), screen.get_height()), doreturn=False)
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the particle sprites onto a draw list, or draw pixel particles after flushing it."""
+        if not self.visible or self._count == 0:
+            return None
+        if self.sprite is None:
+            draw_list.flush()
+            self._write_pixels(draw_list.target, origin, draw_list.scale) # Pixels are written at the target's
+            # resolution, so reduced-resolution targets need no full-size layer
+            return None
+
+        for sprite, position in self._sprite_commands(origin, *draw_list.view_size):
+            draw_list.add(sprite, position)
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the particle sprite."""
+        if self.sprite is not None:
+            yield self.sprite
+
+    def get_rect(self) -> pygame.Rect:
+        """Get the bounding rectangle of the live particles, or of the emitter's position if there are none."""
+        n = self._count
+        if n == 0:
+            return super().get_rect()
+        left, top = int(self._px[:n].min()), int(self._py[:n].min())
+        right, bottom = int(self._px[:n].max()), int(self._py[:n].max())
+        if self.sprite is not None:
+            sprite_width, sprite_height = self.sprite.get_size()
+            return pygame.Rect(left - sprite_width // 2, top - sprite_height // 2,
+                               right - left + sprite_width, bottom - top + sprite_height)
+        return pygame.Rect(left, top, right - left + self.size, bottom - top + self.size)
@@ -1,57 +1,250 @@
 """
 Core game engine responsible for the main loop and window management.
 
-Initialises Pygame, manages the display, and coordinates scene updates.
+Initialises Pygame, manages the display, and coordinates scene updates. Frames are either blitted onto the display
+surface in software, or drawn as retained textures with an SDL renderer through the texture backend. Optionally,
+frames are pipelined so the next frame is simulated on a worker thread while the current one is drawn.
 """
+import os
+import time
+from typing import Optional
+
 import pygame # Import the Pygame library
 
+from engine.assets.bundle import mount_bundle, unmount_bundle
+from engine.diagnostics.input_recorder import InputRecorder, InputReplay
+from engine.diagnostics.latency import LatencyTracker
+from engine.rendering import quality
+from engine.rendering.frame_budget import DynamicResolution
+from engine.rendering.frame_pipeline import FramePipeline
+from engine.rendering.texture_renderer import BACKEND_SOFTWARE, BACKEND_TEXTURE, TextureRenderer
 from engine.scene_manager import SceneManager
 
 
 class GameEngine:
     """Main game engine class."""
-    def __init__(self, width: int = 800, height: int = 600, title: str = "Tachyon Engine", fps: int = 60):
+    def __init__(self, width: int = 800, height: int = 600, title: str = "Tachyon Engine", fps: int = 60,
+                 asset_bundle: Optional[str] = None, record_path: Optional[str] = None,
+                 replay_path: Optional[str] = None, headless: bool = False, measure_latency: bool = False,
+                 dynamic_resolution: bool = False, frame_budget_ms: Optional[float] = None,
+                 adaptive_quality: bool = False, render_backend: str = BACKEND_SOFTWARE, vsync: bool = False,
+                 pipelined: bool = False):
         """
         Initialise the game engine and Pygame subsystems.
         :param width: The width of the game window in pixels.
         :param height: The height of the game window in pixels.
         :param title: The title displayed on the game window.
         :param fps: The target frames per second for the main loop.
+        :param asset_bundle: Optional path of a pre-decoded asset bundle to load images from.
+        :param record_path: Optional path to record the events and delta time of every frame to.
+        :param replay_path: Optional path of a recording to play back instead of reading live input. The engine stops
+            when the recording ends.
+        :param headless: Whether to run without a window. Replays then run as fast as possible.
+        :param measure_latency: Whether to measure the time from input events to the frame that shows their effect.
+            The results are available from the latency attribute.
+        :param dynamic_resolution: Whether to lower the render resolution while frames run over budget, and raise it
+            again once there is headroom.
+        :param frame_budget_ms: Time each frame's work should fit within, in milliseconds. Defaults to the frame time
+            of the target frame rate.
+        :param adaptive_quality: Whether to lower the quality of expensive UI effects while frames run over budget,
+            and raise it again once there is headroom.
+        :param render_backend: BACKEND_SOFTWARE to blit onto the display surface, or BACKEND_TEXTURE to draw retained
+            textures with an SDL renderer, hardware accelerated where available.
+        :param vsync: Whether the texture backend waits for the display's refresh when presenting.
+        :param pipelined: Whether to simulate each frame on a worker thread while the previous frame is drawn and
+            presented. Frames then show the input of the frame before them.
+        :raises ValueError: If the render backend is not known, or dynamic resolution is used with the texture
+            backend, which scales while drawing instead, or with pipelined frames.
         """
+        if render_backend not in (BACKEND_SOFTWARE, BACKEND_TEXTURE):
+            raise ValueError(f"Unknown render backend {render_backend!r}.")
+        if dynamic_resolution and render_backend == BACKEND_TEXTURE:
+            raise ValueError("Dynamic resolution is only supported by the software render backend.")
+        if dynamic_resolution and pipelined:
+            raise ValueError("Dynamic resolution is not supported with pipelined frames.")
+
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy" # Must be set before the display is initialised
+
         pygame.init() # Initialise all imported Pygame modules
 
-        self.screen = pygame.display.set_mode((width, height)) # Create the main display surface with given resolution
-        pygame.display.set_caption(title) # Set the title of the window
+        if render_backend == BACKEND_TEXTURE:
+            self.screen = pygame.display.set_mode((width, height), pygame.HIDDEN) # Hidden software canvas, which
+            # also sets the pixel format surfaces are converted to
+            self.renderer: Optional[TextureRenderer] = TextureRenderer(self.screen, title, vsync) # Visible window
+        else:
+            self.screen = pygame.display.set_mode((width, height)) # Create the main display surface with given
+            # resolution
+            pygame.display.set_caption(title) # Set the title of the window
+            self.renderer = None
+
+        # Map the bundle once the display exists, so images are served in its native pixel layout
+        self.asset_bundle = mount_bundle(asset_bundle) if asset_bundle else None
 
         self._clock = pygame.time.Clock() # Create a Clock object to manage the frame rate
         self._running = True # Control variable for the main game loop
         self._fps = fps # Control variable for the frame rate limit
 
+        self._recorder = InputRecorder(record_path) if record_path else None # Writes every frame's input
+        self._replay = InputReplay(replay_path) if replay_path else None # Supplies every frame's input instead
+        self.latency = LatencyTracker() if measure_latency else None # Input-to-photon latency measurement
+        budget_ms = frame_budget_ms if frame_budget_ms is not None else 1000.0 / fps
+        self.resolution = DynamicResolution(budget_ms) if dynamic_resolution else None # Render scale under load
+        self.quality = quality.QualityGovernor(budget_ms) if adaptive_quality else None # UI effect quality under load
+        quality.set_governor(self.quality)
+
+        self.pipeline = FramePipeline(self.screen) if pipelined else None # Snapshots and simulation thread
         self.scene_manager = SceneManager(self) # Create an instance of a scene manager
 
+    def _next_frame(self) -> Optional[tuple[float, list[pygame.event.Event]]]:
+        """
+        Wait for the next frame and collect its delta time and events, from the replay if there is one.
+        :return: Delta time in seconds and events, or None if the replay has ended.
+        """
+        if self._replay is None:
+            dt = self._clock.tick(self._fps) / 1000.0 # Pause briefly to cap the frame rate and convert delta time
+            # to seconds
+            return dt, pygame.event.get()
+
+        self._clock.tick(0 if self.headless else self._fps) # Headless replays run uncapped
+        if not self.headless:
+            pygame.event.pump() # Keep the window responsive, ignoring live input
+        return self._replay.next_frame()
+
+    def _begin_frame(self, dt: float, events: list[pygame.event.Event]) -> None:
+        """
+        Timestamp, record and check the events of a frame before they are handled.
+        :param dt: Delta time in seconds of the frame.
+        :param events: Events of the frame.
+        """
+        if self.latency is not None:
+            self.latency.events_received(events) # Timestamp input before anything else happens this frame
+        if self._recorder is not None:
+            self._recorder.record_frame(dt, events)
+
+        for event in events:  # Loop through a list of all pending events
+            if event.type == pygame.QUIT:  # Check if the user closed the window
+                self._running = False  # End the main loop
+            elif event.type == pygame.WINDOWCLOSE and self.renderer is not None: # The hidden canvas window
+                # stays open, so closing the renderer's window does not quit on its own
+                self._running = False
+
+    def _simulate(self, dt: float, events: list[pygame.event.Event]) -> None:
+        """
+        Handle the events of a frame and update the scenes.
+        :param dt: Delta time in seconds of the frame.
+        :param events: Events of the frame.
+        """
+        if self.latency is not None:
+            self.latency.handle_events(self.scene_manager, events) # Notes which events changed the frame
+        else:
+            self.scene_manager.handle_events(events) # Call the handle events method of the current scene
+        self.scene_manager.update(dt) # Call the update method of the current scene
+
+    def _record_frame_time(self, frame_ms: float) -> None:
+        """
+        Pass how long a frame's work took to the frame budget controllers.
+        :param frame_ms: Frame work time in milliseconds.
+        """
+        if self.resolution is not None:
+            self.resolution.record_frame(frame_ms)
+        if self.quality is not None:
+            self.quality.record_frame(frame_ms)
+
+    def _present(self) -> None:
+        """Show the drawn frame."""
+        if self.renderer is not None:
+            self.renderer.present() # Show the textures drawn this frame
+        else:
+            pygame.display.flip()  # Update the entire screen with everything drawn this frame
+        if self.latency is not None:
+            self.latency.frame_presented()
+
     def run(self):
         """
         Start the main game loop.
 
         Handles events, updates, and rendering until the window is closed.
         """
+        if self.pipeline is not None:
+            self._run_pipelined()
+        else:
+            self._run_serial()
+
+        if self._recorder is not None:
+            self._recorder.close()
+        self.scene_manager.clear() # Drop the scenes and their surfaces before the bundle they may point into
+        if self.asset_bundle is not None:
+            unmount_bundle(self.asset_bundle)
+            self.asset_bundle.close()
+            self.asset_bundle = None
+        pygame.quit() # Clean up Pygame resources
+
+    def _run_serial(self) -> None:
+        """Run the main game loop, handling, updating and drawing each frame in turn."""
         while self._running:
-            dt = self._clock.tick(self._fps) / 1000.0 # Pause briefly to cap the frame rate at 60 FPS and converts
-            # delta time to seconds
+            frame = self._next_frame()
+            if frame is None: # The replay has ended
+                break
+            dt, events = frame
+            work_start = time.perf_counter() # Frame work starts once the frame rate cap has released the frame
+            self._begin_frame(dt, events)
+            self._simulate(dt, events)
+            if self.renderer is not None:
+                self.renderer.begin_frame()
+                self.scene_manager.render(self.screen) # Scenes draw through the renderer when given its canvas
+                self.renderer.end_frame()
+            elif self.resolution is not None:
+                target = self.resolution.target(self.screen) # Reduced-resolution surface while over budget
+                self.scene_manager.render(target)
+                self.resolution.present(target, self.screen) # Single scale blit onto the window
+            else:
+                self.scene_manager.render(self.screen) # Call render method of the current scene
+            self._record_frame_time((time.perf_counter() - work_start) * 1000.0)
+            self._present()
 
-            events = pygame.event.get()
+    def _run_pipelined(self) -> None:
+        """
+        Run the main game loop with the simulation of each frame overlapping the drawing of the previous one.
 
-            for event in events:  # Loop through a list of all pending events
-                if event.type == pygame.QUIT:  # Check if the user closed the window
-                    self._running = False  # End the main loop
+        Each frame waits for the previous simulation, captures the resulting state, starts simulating the new events
+        on the worker thread, then draws and presents the captured frame. Frames therefore show the input of the
+        frame before them.
+        """
+        pending = None # Simulation of the frame that will be captured next
+        frame_ms = None # Work time of the previous frame, recorded once the simulation is idle
+        while self._running:
+            frame = self._next_frame()
+            if frame is None: # The replay has ended
+                break
+            dt, events = frame
+            work_start = time.perf_counter()
+            if pending is not None:
+                pending.result() # Raises any exception from the simulation on this thread
+            if frame_ms is not None:
+                self._record_frame_time(frame_ms) # Quality changes may redraw elements, so only while idle
 
-            self.scene_manager.handle_events(events) # Call the handle events method of the current scene
-            self.scene_manager.update(dt) # Call the update method of the current scene
-            self.scene_manager.render() # Call render method of the current scene
+            if self.latency is not None:
+                self.latency.frame_captured()
+            if self.renderer is not None: # Uploaded textures already are an immutable copy of the frame
+                self.renderer.begin_frame()
+                self.scene_manager.render(self.screen)
+                self.renderer.end_frame()
+                snapshot = None
+            else:
+                snapshot = self.pipeline.capture(self.scene_manager, self.screen)
 
-            pygame.display.flip()  # Update the entire screen with everything drawn this frame
+            self._begin_frame(dt, events)
+            pending = self.pipeline.simulate(self._simulate, dt, events)
+            if snapshot is not None:
+                self.pipeline.draw(snapshot, self.screen) # Blits release the GIL for the simulation thread
+            frame_ms = (time.perf_counter() - work_start) * 1000.0
+            self._present()
 
-        pygame.quit() # Clean up Pygame resources
+        if pending is not None:
+            pending.result()
+        self.pipeline.shutdown()
 
     def set_is_running(self, is_running: bool):
         """
@@ -0,0 +1,281 @@
+"""
+Spatial-hash collision detection for gameplay bodies.
+
+Bodies are axis-aligned rectangles stored in NumPy arrays. The world is divided into square cells, and each body is
+registered in every cell its rectangle touches, so only bodies sharing a cell are ever tested against each other
+(the broadphase). The grid is kept as an array of (cell, body) entries sorted by cell, built with vectorised
+operations. Moving a body only writes its row of the body arrays; the grid and the candidate pairs are only rebuilt
+after a body has crossed into different cells, so frames where bodies move within their cells only pay for the
+vectorised overlap tests (the narrowphase).
+
+Layers and masks filter which bodies interact: two bodies collide only if each one's mask includes the other's layer.
+"""
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+import pygame
+
+ALL_LAYERS = 0xFFFFFFFF # Mask that accepts every layer
+
+RectLike = Union[pygame.Rect, tuple[int, int, int, int]]
+
+
+class SpatialHash:
+    """
+    A uniform grid of cells holding the bodies that overlap each cell.
+
+    Example:
+        world = SpatialHash(cell_size=64)
+        player = world.add((100, 100, 32, 32), layer=PLAYER, mask=ENEMY)
+        world.move(player, (104, 100, 32, 32))
+        for a, b in world.find_pairs():
+            ...
+    """
+    def __init__(self, cell_size: int = 64, capacity: int = 256):
+        """
+        Initialise an empty spatial hash.
+        :param cell_size: Width and height of a cell. Works best at around twice the size of a typical body.
+        :param capacity: Initial number of body slots. Grows automatically when exceeded.
+        """
+        self.cell_size = cell_size
+        capacity = max(1, int(capacity))
+        self._rects = np.zeros((capacity, 4), dtype=np.int32) # X, Y, width and height of each body
+        self._cells = np.zeros((capacity, 4), dtype=np.int32) # First and last (inclusive) cell columns and rows
+        self._layers = np.zeros(capacity, dtype=np.uint32) # Layer bits of each body
+        self._masks = np.zeros(capacity, dtype=np.uint32) # Layers each body collides with
+        self._alive = np.zeros(capacity, dtype=bool) # Whether each slot holds a body
+        self._data: list[Any] = [None] * capacity # User data attached to each body
+        self._free: list[int] = list(range(capacity - 1, -1, -1)) # Unused slots, lowest index popped first
+        self._grid: Optional[tuple[np.ndarray, ...]] = None # Cell keys, bodies, cell columns and cell rows of the
+        # (cell, body) entries sorted by cell, kept until a body changes cells
+        self._candidates: Optional[tuple[np.ndarray, ...]] = None # Broadphase pairs and the cell they share
+
+    def __len__(self) -> int:
+        """Get the number of bodies."""
+        return len(self._data) - len(self._free)
+
+    def __contains__(self, body: int) -> bool:
+        """Check if a body id refers to a body in the hash."""
+        return 0 <= body < len(self._alive) and bool(self._alive[body])
+
+    def _grow(self) -> None:
+        """Double the capacity of every body array."""
+        old = len(self._data)
+        new = old * 2
+        for name in ("_rects", "_cells", "_layers", "_masks", "_alive"):
+            array = getattr(self, name)
+            grown = np.zeros((new,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._data.extend([None] * old)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _cell_range(self, x: int, y: int, width: int, height: int) -> tuple[int, int, int, int]:
+        """Get the first and last (inclusive) cell columns and rows a rectangle touches."""
+        size = self.cell_size
+        return x // size, y // size, (x + max(1, width) - 1) // size, (y + max(1, height) - 1) // size
+
+    @staticmethod
+    def _cell_key(cell_x: Union[int, np.ndarray], cell_y: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        Combine cell coordinates into one integer that sorts by column, then by row.
+
+        Rows are offset to be non-negative so that the rows of a column stay contiguous in key order.
+        """
+        if isinstance(cell_x, np.ndarray):
+            return (cell_x.astype(np.int64) << 32) + (cell_y.astype(np.int64) + 2 ** 31)
+        return (cell_x << 32) + (cell_y + 2 ** 31)
+
+    def _mark_cells_changed(self) -> None:
+        """Drop the grid and candidate pairs so they are rebuilt when next needed."""
+        self._grid = None
+        self._candidates = None
+
+    def add(self, rect: RectLike, layer: int = 1, mask: int = ALL_LAYERS, data: Any = None) -> int:
+        """
+        Add a body.
+        :param rect: Rectangle of the body.
+        :param layer: Layer bits of the body.
+        :param mask: Layer bits the body collides with.
+        :param data: Optional object attached to the body, such as the entity or element it belongs to.
+        :return: Id of the body.
+        """
+        if not self._free:
+            self._grow()
+        body = self._free.pop()
+        x, y, width, height = pygame.Rect(rect)
+        cells = self._cell_range(x, y, width, height)
+        self._rects[body] = (x, y, width, height)
+        self._cells[body] = cells
+        self._layers[body] = layer
+        self._masks[body] = mask
+        self._alive[body] = True
+        self._data[body] = data
+        self._mark_cells_changed()
+        return body
+
+    def remove(self, body: int) -> None:
+        """Remove a body, freeing its id for reuse. Removing a body that is not in the hash does nothing."""
+        if body not in self: # Freeing a slot twice would hand its id out to two bodies
+            return None
+        self._alive[body] = False
+        self._data[body] = None
+        self._free.append(body)
+        self._mark_cells_changed()
+
+    def move(self, body: int, rect: RectLike) -> None:
+        """
+        Change the rectangle of a body, invalidating the grid only if it touches different cells.
+        :param body: Id of the body.
+        :param rect: New rectangle of the body.
+        """
+        x, y, width, height = pygame.Rect(rect)
+        self._rects[body] = (x, y, width, height)
+        cells = self._cell_range(x, y, width, height)
+        if cells != tuple(self._cells[body].tolist()):
+            self._cells[body] = cells
+            self._mark_cells_changed()
+
+    def move_many(self, bodies: Iterable[int], rects: np.ndarray) -> None:
+        """
+        Change the rectangles of many bodies at once.
+
+        Cell ranges are computed for every body together, and the grid is only invalidated if a body touches
+        different cells.
+        :param bodies: Ids of the bodies.
+        :param rects: Array of shape (len(bodies), 4) holding the new X, Y, width and height of each body.
+        """
+        bodies = np.asarray(bodies, dtype=np.intp)
+        rects = np.asarray(rects, dtype=np.int32)
+        self._rects[bodies] = rects
+        size = self.cell_size
+        cells = np.empty_like(rects)
+        cells[:, 0] = rects[:, 0] // size
+        cells[:, 1] = rects[:, 1] // size
+        cells[:, 2] = (rects[:, 0] + np.maximum(rects[:, 2], 1) - 1) // size
+        cells[:, 3] = (rects[:, 1] + np.maximum(rects[:, 3], 1) - 1) // size
+        if not np.array_equal(cells, self._cells[bodies]):
+            self._cells[bodies] = cells
+            self._mark_cells_changed()
+
+    def get_rect(self, body: int) -> pygame.Rect:
+        """Get the rectangle of a body."""
+        return pygame.Rect(self._rects[body].tolist())
+
+    def get_data(self, body: int) -> Any:
+        """Get the object attached to a body."""
+        return self._data[body]
+
+    def query(self, rect: RectLike, mask: int = ALL_LAYERS) -> list[int]:
+        """
+        Find the bodies overlapping a rectangle.
+        :param rect: Rectangle to test.
+        :param mask: Layer bits of the bodies to include.
+        :return: Ids of the overlapping bodies.
+        """
+        rect = pygame.Rect(rect)
+        keys, entry_bodies, _, _ = self._get_grid()
+        left, top, right, bottom = self._cell_range(*rect)
+        found = []
+        for cell_x in range(left, right + 1):
+            first_key, last_key = self._cell_key(cell_x, top), self._cell_key(cell_x, bottom)
+            start = int(np.searchsorted(keys, first_key, side="left")) # Rows of a column are contiguous in key
+            end = int(np.searchsorted(keys, last_key, side="right")) # order, so each column is one slice
+            if end > start:
+                found.append(entry_bodies[start:end])
+        if not found:
+            return []
+
+        candidates = np.unique(np.concatenate(found)) # Bodies spanning several cells appear once per cell
+        candidates = candidates[(self._layers[candidates] & mask) != 0]
+        rects = self._rects[candidates].tolist()
+        return [int(candidates[index]) for index in rect.collidelistall(rects)] # Narrowphase in one batch call
+
+    def query_point(self, x: int, y: int, mask: int = ALL_LAYERS) -> list[int]:
+        """Find the bodies containing a point."""
+        return self.query((x, y, 1, 1), mask)
+
+    def _get_grid(self) -> tuple[np.ndarray, ...]:
+        """
+        Get the (cell, body) entries sorted by cell, rebuilding them if a body changed cells.
+
+        Each body is expanded into one entry per cell it touches, with every step done on whole arrays.
+        :return: Cell keys, bodies, cell columns and cell rows of the entries.
+        """
+        if self._grid is not None:
+            return self._grid
+
+        bodies = np.flatnonzero(self._alive)
+        cells = self._cells[bodies]
+        columns = cells[:, 2] - cells[:, 0] + 1
+        counts = columns * (cells[:, 3] - cells[:, 1] + 1)
+
+        entry_bodies = np.repeat(bodies, counts)
+        offsets = np.arange(entry_bodies.size) - np.repeat(np.cumsum(counts) - counts, counts) # Index within body
+        entry_columns = np.repeat(columns, counts)
+        cell_x = np.repeat(cells[:, 0], counts) + offsets % entry_columns
+        cell_y = np.repeat(cells[:, 1], counts) + offsets // entry_columns
+
+        keys = self._cell_key(cell_x, cell_y)
+        order = np.argsort(keys)
+        self._grid = (keys[order], entry_bodies[order], cell_x[order], cell_y[order])
+        return self._grid
+
+    def _build_candidates(self) -> tuple[np.ndarray, ...]:
+        """
+        List every pair of bodies sharing a cell, with the cell they share.
+
+        Entries that are k places apart within the same cell of the sorted grid are paired for k = 1, 2, ... until
+        no cell holds more than k bodies.
+        :return: First bodies, second bodies, cell columns and cell rows of the pairs.
+        """
+        keys, entry_bodies, cell_x, cell_y = self._get_grid()
+        first, second, pair_x, pair_y = [], [], [], []
+        k = 1
+        while k < keys.size:
+            same = np.flatnonzero(keys[:-k] == keys[k:])
+            if same.size == 0:
+                break
+            first.append(entry_bodies[same])
+            second.append(entry_bodies[same + k])
+            pair_x.append(cell_x[same])
+            pair_y.append(cell_y[same])
+            k += 1
+        if not first:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, empty.astype(np.int32), empty.astype(np.int32)
+        return np.concatenate(first), np.concatenate(second), np.concatenate(pair_x), np.concatenate(pair_y)
+
+    def find_pairs(self) -> np.ndarray:
+        """
+        Find every pair of overlapping bodies whose layers and masks accept each other.
+
+        A pair sharing several cells is only reported from the cell containing the top-left corner of the overlap,
+        so every pair is reported exactly once without a set of seen pairs.
+        :return: Array of shape (pairs, 2) holding body ids, with the lower id first.
+        """
+        if self._candidates is None:
+            self._candidates = self._build_candidates()
+        first, second, cell_x, cell_y = self._candidates
+        if first.size == 0:
+            return np.zeros((0, 2), dtype=np.intp)
+
+        a, b = self._rects[first], self._rects[second]
+        ax, ay, aw, ah = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+        bx, by, bw, bh = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+        hits = (ax < bx + bw) & (bx < ax + aw) & (ay < by + bh) & (by < ay + ah) # Rectangles overlap
+        hits &= (aw > 0) & (ah > 0) & (bw > 0) & (bh > 0) # Empty rectangles never collide, as with Rect
+        hits &= ((self._layers[first] & self._masks[second]) != 0) & ((self._layers[second] & self._masks[first]) != 0)
+        size = self.cell_size
+        hits &= (np.maximum(ax, bx) // size == cell_x) & (np.maximum(ay, by) // size == cell_y) # Reference cell
+
+        first, second = first[hits], second[hits]
+        return np.stack((np.minimum(first, second), np.maximum(first, second)), axis=1)
+
+    def clear(self) -> None:
+        """Remove every body."""
+        capacity = len(self._data)
+        self._alive[:] = False
+        self._data = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self._mark_cells_changed()
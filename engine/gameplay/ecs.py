@@ -0,0 +1,318 @@
+"""
+Array-backed entity-component system for gameplay objects.
+
+Entities are plain integer ids. Each component type has a NumPy dtype, and entities with the same set of components
+(an archetype) store their components together in contiguous arrays, one per component type. Queries return those
+arrays for every archetype that matches, so systems process every matching entity in vectorised batches instead of
+calling Python methods on each object.
+
+Example:
+    world = World()
+    world.register_component("position", [("x", np.float32), ("y", np.float32)])
+    world.register_component("velocity", [("x", np.float32), ("y", np.float32)])
+    world.create_entities(1000, position=(0, 0), velocity=(10, 0))
+
+    def movement(world, dt):
+        for entities, position, velocity in world.query("position", "velocity"):
+            position["x"] += velocity["x"] * dt
+            position["y"] += velocity["y"] * dt
+
+    world.add_system(movement)
+    world.update(dt)  # call once every frame
+"""
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+import pygame
+
+UPDATE = "update" # Systems run from World.update, called as system(world, dt)
+RENDER = "render" # Systems run from World.render, called as system(world, screen, origin)
+
+
+class Archetype:
+    """Storage for every entity that has exactly the same set of components."""
+    __slots__ = ("components", "entities", "columns", "count")
+
+    def __init__(self, components: frozenset, dtypes: dict[str, np.dtype], capacity: int = 64):
+        """
+        Initialise empty storage for a set of components.
+        :param components: Names of the components stored.
+        :param dtypes: Dtype of each component, by name.
+        :param capacity: Initial number of rows. Grows automatically when exceeded.
+        """
+        self.components = components
+        self.entities = np.zeros(capacity, dtype=np.int64) # Entity id stored in each row
+        self.columns: dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=dtypes[name]) for name in components}
+        self.count = 0 # Number of rows in use, stored at the front of every array
+
+    def reserve(self, count: int) -> None:
+        """
+        Make sure a number of additional rows fit, doubling the capacity as needed.
+        :param count: Number of rows about to be added.
+        """
+        required = self.count + count
+        capacity = len(self.entities)
+        if required <= capacity:
+            return None
+        while capacity < required:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+        grown = np.zeros(capacity, dtype=np.int64)
+        grown[:self.count] = self.entities[:self.count]
+        self.entities = grown
+
+    def remove_row(self, row: int) -> Optional[int]:
+        """
+        Remove a row by moving the last row into its place.
+        :param row: Row to remove.
+        :return: Id of the entity moved into the row, or None if the removed row was the last one.
+        """
+        last = self.count - 1
+        self.count = last
+        if row == last:
+            return None
+        self.entities[row] = self.entities[last]
+        for column in self.columns.values():
+            column[row] = column[last]
+        return int(self.entities[row])
+
+
+class World:
+    """Holds entities, their components and the systems that process them."""
+    def __init__(self):
+        """Initialise an empty world."""
+        self._dtypes: dict[str, np.dtype] = {} # Registered component dtypes, by name
+        self._archetypes: dict[frozenset, Archetype] = {} # Storage, by component set
+        self._locations: dict[int, tuple[Archetype, int]] = {} # Archetype and row of each live entity
+        self._next_id = 0 # Id given to the next created entity
+        self._query_cache: dict[tuple, list[Archetype]] = {} # Matching archetypes, by query
+        self._systems: dict[str, list[tuple[int, int, Callable]]] = {UPDATE: [], RENDER: []} # Sorted by priority
+        self._system_order = 0 # Tie breaker keeping systems of equal priority in the order they were added
+        self._pending_destroy: list[int] = [] # Entities to destroy once the current update finishes
+
+    def __len__(self) -> int:
+        """Get the number of live entities."""
+        return len(self._locations)
+
+    def __contains__(self, entity: int) -> bool:
+        """Check if an entity is alive."""
+        return entity in self._locations
+
+    def register_component(self, name: str, dtype: Any) -> None:
+        """
+        Register a component type.
+        :param name: Name used to refer to the component.
+        :param dtype: NumPy dtype of the component, such as np.float32 or [("x", np.float32), ("y", np.float32)].
+        """
+        self._dtypes[name] = np.dtype(dtype)
+
+    def _archetype(self, components: frozenset) -> Archetype:
+        """Get the storage for a set of components, creating it if needed."""
+        archetype = self._archetypes.get(components)
+        if archetype is None:
+            unknown = components - self._dtypes.keys()
+            if unknown:
+                raise KeyError(f"Component(s) not registered: {', '.join(sorted(unknown))}")
+            archetype = Archetype(components, self._dtypes)
+            self._archetypes[components] = archetype
+            self._query_cache.clear() # A new archetype may match existing queries
+        return archetype
+
+    def create_entity(self, **components: Any) -> int:
+        """
+        Create an entity.
+        :param components: Initial value of each component, by name. Structured values are given as tuples.
+        :return: Id of the new entity.
+        """
+        return int(self.create_entities(1, **components)[0])
+
+    def create_entities(self, count: int, **components: Any) -> np.ndarray:
+        """
+        Create many entities with the same components at once.
+        :param count: Number of entities to create.
+        :param components: Value of each component, by name. Either a single value shared by every entity, or an
+            array with one value per entity.
+        :return: Ids of the new entities.
+        """
+        archetype = self._archetype(frozenset(components))
+        archetype.reserve(count)
+        start, end = archetype.count, archetype.count + count
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+
+        archetype.entities[start:end] = ids
+        for name, value in components.items():
+            column = archetype.columns[name]
+            if isinstance(value, tuple) and column.dtype.names: # A single structured value shared by every row
+                value = np.array(value, dtype=column.dtype)
+            column[start:end] = value
+        archetype.count = end
+        for row, entity in enumerate(ids.tolist(), start):
+            self._locations[entity] = (archetype, row)
+        return ids
+
+    def destroy_entity(self, entity: int) -> None:
+        """
+        Destroy an entity immediately.
+
+        Do not use while iterating over query results, as rows move. Use destroy_later from systems instead.
+        :param entity: Id of the entity.
+        """
+        archetype, row = self._locations.pop(entity)
+        moved = archetype.remove_row(row)
+        if moved is not None:
+            self._locations[moved] = (archetype, row)
+
+    def destroy_later(self, entities: Any) -> None:
+        """
+        Queue entities to be destroyed after the systems of the current update have run.
+        :param entities: Entity id, or iterable or array of ids.
+        """
+        if isinstance(entities, (int, np.integer)):
+            self._pending_destroy.append(int(entities))
+        else:
+            self._pending_destroy.extend(np.asarray(entities).tolist())
+
+    def _move(self, entity: int, components: frozenset, values: dict[str, Any]) -> None:
+        """
+        Move an entity to the archetype for a new set of components, keeping the values of shared components.
+        :param entity: Id of the entity.
+        :param components: Entity's new set of components.
+        :param values: Values of components that are new to the entity.
+        """
+        source, row = self._locations[entity]
+        target = self._archetype(components)
+        target.reserve(1)
+        new_row = target.count
+        target.entities[new_row] = entity
+        for name in components & source.components:
+            target.columns[name][new_row] = source.columns[name][row]
+        for name, value in values.items():
+            column = target.columns[name]
+            column[new_row] = np.array(value, dtype=column.dtype) if column.dtype.names else value
+        target.count += 1
+
+        moved = source.remove_row(row)
+        if moved is not None:
+            self._locations[moved] = (source, row)
+        self._locations[entity] = (target, new_row)
+
+    def add_component(self, entity: int, name: str, value: Any = 0) -> None:
+        """
+        Add a component to an entity, or set its value if it already has it.
+        :param entity: Id of the entity.
+        :param name: Name of the component.
+        :param value: Value of the component.
+        """
+        archetype, _ = self._locations[entity]
+        if name in archetype.components:
+            self.set_component(entity, name, value)
+        else:
+            self._move(entity, archetype.components | {name}, {name: value})
+
+    def remove_component(self, entity: int, name: str) -> None:
+        """
+        Remove a component from an entity.
+        :param entity: Id of the entity.
+        :param name: Name of the component.
+        """
+        archetype, _ = self._locations[entity]
+        if name in archetype.components:
+            self._move(entity, archetype.components - {name}, {})
+
+    def has_component(self, entity: int, name: str) -> bool:
+        """Check if an entity has a component."""
+        return name in self._locations[entity][0].components
+
+    def get_component(self, entity: int, name: str) -> Any:
+        """
+        Get the value of one entity's component.
+        :param entity: Id of the entity.
+        :param name: Name of the component.
+        :return: The value, as a NumPy scalar or structured record. Records are views, so writes to them are kept.
+        """
+        archetype, row = self._locations[entity]
+        return archetype.columns[name][row]
+
+    def set_component(self, entity: int, name: str, value: Any) -> None:
+        """
+        Set the value of one entity's component.
+        :param entity: Id of the entity.
+        :param name: Name of the component.
+        :param value: New value. Structured values are given as tuples.
+        """
+        archetype, row = self._locations[entity]
+        column = archetype.columns[name]
+        column[row] = np.array(value, dtype=column.dtype) if column.dtype.names else value
+
+    def query(self, *components: str, exclude: Iterable[str] = ()) -> Iterator[tuple[np.ndarray, ...]]:
+        """
+        Iterate over the storage of every archetype that has a set of components.
+
+        Each batch is a tuple of the entity ids followed by one array per requested component, in the requested
+        order. The arrays are views into the storage, so changes made to them are kept.
+        :param components: Names of the components entities must have.
+        :param exclude: Names of components entities must not have.
+        :return: Iterator over the batches.
+        """
+        key = (frozenset(components), frozenset(exclude))
+        archetypes = self._query_cache.get(key)
+        if archetypes is None:
+            required, excluded = key
+            archetypes = [archetype for archetype in self._archetypes.values()
+                          if required <= archetype.components and not excluded & archetype.components]
+            self._query_cache[key] = archetypes
+
+        for archetype in archetypes:
+            count = archetype.count
+            if count == 0:
+                continue
+            yield (archetype.entities[:count],) + tuple(archetype.columns[name][:count] for name in components)
+
+    def count(self, *components: str, exclude: Iterable[str] = ()) -> int:
+        """Get the number of entities matching a query."""
+        return sum(len(batch[0]) for batch in self.query(*components, exclude=exclude))
+
+    def add_system(self, system: Callable, phase: str = UPDATE, priority: int = 0) -> Callable:
+        """
+        Register a system.
+        :param system: Function called every frame. Update systems are called as system(world, dt), and render
+            systems as system(world, screen, origin).
+        :param phase: UPDATE or RENDER.
+        :param priority: Systems with lower priorities run first.
+        :return: The system.
+        """
+        self._systems[phase].append((priority, self._system_order, system))
+        self._systems[phase].sort(key=lambda entry: entry[:2])
+        self._system_order += 1
+        return system
+
+    def remove_system(self, system: Callable) -> None:
+        """Unregister a system from every phase."""
+        for phase, systems in self._systems.items():
+            self._systems[phase] = [entry for entry in systems if entry[2] is not system]
+
+    def update(self, dt: float) -> None:
+        """
+        Run every update system, then destroy the entities queued with destroy_later.
+        :param dt: Delta time in seconds.
+        """
+        for _, _, system in self._systems[UPDATE]:
+            system(self, dt)
+        if self._pending_destroy:
+            pending, self._pending_destroy = self._pending_destroy, []
+            for entity in pending:
+                if entity in self._locations: # Entities may be queued more than once
+                    self.destroy_entity(entity)
+
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
+        """
+        Run every render system.
+        :param screen: Target surface to render onto.
+        :param origin: Screen position that maps to the top-left corner of the target surface.
+        """
+        for _, _, system in self._systems[RENDER]:
+            system(self, screen, origin)
@@ -0,0 +1,299 @@
+"""
+Chunked tilemap for level rendering.
+
+Tiles are grouped into fixed-size square chunks, and each chunk is baked once into a single surface, so drawing the
+level costs one blit per visible chunk instead of one per tile. A chunk is only baked again when a tile inside it
+changes. Only the chunks intersecting the view are drawn, and baked chunks that move far from the view are released,
+so the cost of rendering and the memory held by baked chunks depend on the view size rather than on the map size.
+
+Maps are stored as a JSON header describing the map and its tileset, next to one NumPy .npy file of tile ids per
+layer. Layers are memory-mapped when loaded, so large maps are read from disk as the view reaches them:
+    {
+        "version": 1,
+        "tile_size": 32,
+        "chunk_size": 16,
+        "tileset": {"image": "tiles.png"},
+        "layers": ["level_ground.npy", "level_detail.npy"]
+    }
+The tileset is either an image cut into a grid of tiles, or {"atlas": "atlas.json", "regions": [names]}. Paths are
+relative to the header file. Tile id 0 is empty, and id n is the nth tile of the tileset.
+"""
+import json
+import os
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pygame
+
+from engine.assets.atlas import load_atlas
+from engine.rendering.draw_list import DrawList
+from engine.rendering.surface_format import PER_PIXEL, create_surface, optimise_surface
+from engine.user_interface.ui_element import UIElement
+
+FORMAT_VERSION = 1
+EMPTY = 0 # Tile id of empty cells
+
+
+class Tileset:
+    """The tile surfaces of a tilemap, by tile id."""
+    __slots__ = ("tile_size", "tiles")
+
+    def __init__(self, tiles: Sequence[pygame.Surface], tile_size: int):
+        """
+        Initialise a tileset.
+        :param tiles: Tile surfaces in id order, starting with tile id 1.
+        :param tile_size: Width and height of each tile.
+        """
+        self.tile_size = tile_size
+        self.tiles: list[Optional[pygame.Surface]] = [None] + list(tiles) # Index 0 is the empty tile
+
+    @classmethod
+    def from_image(cls, image: pygame.Surface, tile_size: int) -> "Tileset":
+        """
+        Cut an image into tiles, read left to right and then top to bottom.
+        :param image: Image holding a grid of tiles.
+        :param tile_size: Width and height of each tile.
+        :return: The tileset.
+        """
+        tiles = [image.subsurface((x, y, tile_size, tile_size))
+                 for y in range(0, image.get_height() - tile_size + 1, tile_size)
+                 for x in range(0, image.get_width() - tile_size + 1, tile_size)]
+        return cls(tiles, tile_size)
+
+    def __len__(self) -> int:
+        """Get the number of tiles, excluding the empty tile."""
+        return len(self.tiles) - 1
+
+
+class TileMap(UIElement):
+    """
+    A layered grid of tiles drawn through baked chunk surfaces.
+
+    The map's position is the world position of its top-left corner.
+    """
+    __slots__ = ("tileset", "layers", "chunk_size", "keep_margin", "_chunks", "_stale")
+
+    def __init__(self, x: int, y: int,
+                 tileset: Tileset,
+                 layers: Sequence[np.ndarray],
+                 chunk_size: int = 16,
+                 keep_margin: int = 1,
+                 layer: int = 0,
+                 element_id: Optional[str] = None):
+        """
+        Initialise a tilemap.
+        :param x: X-axis position of the map's top-left corner.
+        :param y: Y-axis position of the map's top-left corner.
+        :param tileset: Tiles drawn for each tile id.
+        :param layers: Arrays of tile ids with shape (height, width), drawn in order. All must have the same shape.
+        :param chunk_size: Width and height of a chunk, in tiles.
+        :param keep_margin: Number of chunks around the view kept baked, so small movements do not rebake.
+        :param layer: Z-order for rendering.
+        :param element_id: Optional identifier.
+        """
+        super().__init__(x, y, layer, element_id)
+        if not layers:
+            raise ValueError("A tilemap needs at least one layer")
+        self.tileset = tileset
+        self.layers = list(layers)
+        self.chunk_size = chunk_size
+        self.keep_margin = keep_margin
+        self._chunks: dict[tuple[int, int], Optional[pygame.Surface]] = {} # Baked chunks, by chunk coordinates.
+        # Empty chunks are stored as None so they are not checked again
+        self._stale: set[tuple[int, int]] = set() # Baked chunks with changed tiles
+
+    @property
+    def width(self) -> int:
+        """Get the width of the map in tiles."""
+        return self.layers[0].shape[1]
+
+    @property
+    def height(self) -> int:
+        """Get the height of the map in tiles."""
+        return self.layers[0].shape[0]
+
+    @property
+    def tile_size(self) -> int:
+        """Get the width and height of a tile in pixels."""
+        return self.tileset.tile_size
+
+    @property
+    def baked_chunks(self) -> int:
+        """Get the number of chunks currently held in memory."""
+        return len(self._chunks)
+
+    @classmethod
+    def load(cls, path: str, x: int = 0, y: int = 0, **kwargs) -> "TileMap":
+        """
+        Load a map from a header file and its layer files.
+        :param path: Path of the JSON header.
+        :param x: X-axis position of the map's top-left corner.
+        :param y: Y-axis position of the map's top-left corner.
+        :param kwargs: Other arguments passed to the constructor.
+        :return: The tilemap.
+        :raises ValueError: If the header uses an unsupported version.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            header = json.load(file)
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tilemap version: {header.get('version')}")
+
+        directory = os.path.dirname(path)
+        tile_size = header["tile_size"]
+        tileset_info = header["tileset"]
+        if "atlas" in tileset_info:
+            atlas = load_atlas(os.path.join(directory, tileset_info["atlas"]))
+            tileset = Tileset([atlas.get_surface(name) for name in tileset_info["regions"]], tile_size)
+        else:
+            image = pygame.image.load(os.path.join(directory, tileset_info["image"])).convert_alpha()
+            tileset = Tileset.from_image(image, tile_size)
+
+        # Copy-on-write memory maps: tiles are read from disk on demand, and edits are kept in memory only
+        layers = [np.load(os.path.join(directory, name), mmap_mode="c") for name in header["layers"]]
+        kwargs.setdefault("chunk_size", header.get("chunk_size", 16))
+        return cls(x, y, tileset, layers, **kwargs)
+
+    def save(self, path: str, tileset: dict) -> None:
+        """
+        Save the map as a header file and one file per layer.
+        :param path: Path of the JSON header. Layers are saved next to it as "<name>_<index>.npy".
+        :param tileset: Tileset entry of the header, such as {"image": "tiles.png"}. The tileset is not written.
+        """
+        directory, filename = os.path.split(path)
+        name = os.path.splitext(filename)[0]
+        layer_files = []
+        for index, layer in enumerate(self.layers):
+            layer_file = f"{name}_{index}.npy"
+            np.save(os.path.join(directory, layer_file), np.ascontiguousarray(layer))
+            layer_files.append(layer_file)
+        header = {
+            "version": FORMAT_VERSION,
+            "tile_size": self.tile_size,
+            "chunk_size": self.chunk_size,
+            "tileset": tileset,
+            "layers": layer_files,
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(header, file, indent=2)
+
+    def get_tile(self, tile_x: int, tile_y: int, layer: int = 0) -> int:
+        """Get the tile id at a tile position."""
+        return int(self.layers[layer][tile_y, tile_x])
+
+    def set_tile(self, tile_x: int, tile_y: int, tile: int, layer: int = 0) -> None:
+        """
+        Change the tile at a tile position, marking its chunk to be baked again.
+        :param tile_x: Column of the tile.
+        :param tile_y: Row of the tile.
+        :param tile: New tile id.
+        :param layer: Index of the layer to change.
+        """
+        if self.layers[layer][tile_y, tile_x] == tile:
+            return None
+        self.layers[layer][tile_y, tile_x] = tile
+        key = (tile_x // self.chunk_size, tile_y // self.chunk_size)
+        if key in self._chunks:
+            self._stale.add(key)
+        self.invalidate()
+
+    def tile_at(self, world_x: float, world_y: float) -> Optional[tuple[int, int]]:
+        """
+        Get the tile position under a world position.
+        :return: Column and row, or None if the position is outside the map.
+        """
+        map_x, map_y = self.get_world_position()
+        tile_x, tile_y = int((world_x - map_x) // self.tile_size), int((world_y - map_y) // self.tile_size)
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return tile_x, tile_y
+        return None
+
+    def _bake_chunk(self, chunk_x: int, chunk_y: int) -> Optional[pygame.Surface]:
+        """
+        Draw every tile of a chunk into one surface.
+        :return: The chunk surface, or None if every tile of the chunk is empty.
+        """
+        size, tile_size = self.chunk_size, self.tile_size
+        rows = slice(chunk_y * size, min((chunk_y + 1) * size, self.height))
+        columns = slice(chunk_x * size, min((chunk_x + 1) * size, self.width))
+        blocks = [np.asarray(layer[rows, columns]) for layer in self.layers] # Reads mapped tiles from disk
+        if not any(block.any() for block in blocks):
+            return None
+
+        height, width = blocks[0].shape
+        surface = create_surface((width * tile_size, height * tile_size), PER_PIXEL)
+        tiles = self.tileset.tiles
+        for block in blocks:
+            row_indices, column_indices = np.nonzero(block)
+            surface.blits([(tiles[tile], (column * tile_size, row * tile_size)) for tile, row, column
+                           in zip(block[row_indices, column_indices].tolist(), row_indices.tolist(),
+                                  column_indices.tolist())], doreturn=False)
+        return optimise_surface(surface) # Chunks fully covered by opaque tiles become plain opaque surfaces
+
+    def _visible_chunks(self, origin: tuple[int, int], view_size: tuple[int, int], margin: int = 0) -> tuple:
+        """
+        Get the range of chunks intersecting a view, clamped to the map.
+        :param origin: World position of the view's top-left corner.
+        :param view_size: Width and height of the view.
+        :param margin: Number of extra chunks to include on every side.
+        :return: First and last (exclusive) chunk columns, then first and last (exclusive) chunk rows.
+        """
+        map_x, map_y = self.get_world_position()
+        chunk_pixels = self.chunk_size * self.tile_size
+        columns = -(-self.width // self.chunk_size)
+        rows = -(-self.height // self.chunk_size)
+        left = max(0, int((origin[0] - map_x) // chunk_pixels) - margin)
+        top = max(0, int((origin[1] - map_y) // chunk_pixels) - margin)
+        right = min(columns, int((origin[0] + view_size[0] - map_x) // chunk_pixels) + 1 + margin)
+        bottom = min(rows, int((origin[1] + view_size[1] - map_y) // chunk_pixels) + 1 + margin)
+        return left, right, top, bottom
+
+    def _chunk_commands(self, origin: tuple[int, int], view_size: tuple[int, int]) -> list:
+        """
+        Bake the chunks in view where needed, release chunks far from it, and build their blits.
+        :param origin: World position of the view's top-left corner.
+        :param view_size: Width and height of the view.
+        :return: List of (surface, position) pairs, positions relative to the view.
+        """
+        if len(self._chunks) > 0: # Release chunks that moved out of the kept area
+            left, right, top, bottom = self._visible_chunks(origin, view_size, self.keep_margin)
+            for key in [key for key in self._chunks if not (left <= key[0] < right and top <= key[1] < bottom)]:
+                del self._chunks[key]
+                self._stale.discard(key)
+
+        map_x, map_y = self.get_world_position()
+        chunk_pixels = self.chunk_size * self.tile_size
+        left, right, top, bottom = self._visible_chunks(origin, view_size)
+        commands = []
+        for chunk_y in range(top, bottom):
+            for chunk_x in range(left, right):
+                key = (chunk_x, chunk_y)
+                if key in self._stale or key not in self._chunks:
+                    self._stale.discard(key)
+                    self._chunks[key] = self._bake_chunk(chunk_x, chunk_y)
+                surface = self._chunks[key]
+                if surface is not None:
+                    commands.append((surface, (map_x + chunk_x * chunk_pixels - origin[0],
+                                               map_y + chunk_y * chunk_pixels - origin[1])))
+        return commands
+
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
+        """Draw the chunks in view if visible."""
+        if not self.visible:
+            return None
+        screen.blits(self._chunk_commands(origin, screen.get_size()), doreturn=False)
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the blits of the chunks in view onto a draw list if visible."""
+        if not self.visible:
+            return None
+        for surface, position in self._chunk_commands(origin, draw_list.view_size):
+            draw_list.add(surface, position)
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the baked chunk surfaces and the tile surfaces."""
+        yield from (surface for surface in self._chunks.values() if surface is not None)
+        yield from self.tileset.tiles[1:] # Index 0 is the empty tile
+
+    def get_rect(self) -> pygame.Rect:
+        """Get the bounding rectangle of the whole map."""
+        return pygame.Rect(self.get_world_position(), (self.width * self.tile_size, self.height * self.tile_size))
@@ -0,0 +1,125 @@
+"""
+Scene camera mapping world coordinates to the screen.
+
+The camera's position is the world position shown at the top-left corner of the screen, and its zoom scales the
+world up or down around that corner. Scenes use the camera's view rectangle to skip elements that are not visible,
+both when rendering and when testing which element is under the mouse.
+"""
+import math
+from typing import Iterator, Optional
+
+import pygame
+
+
+class Camera:
+    """A movable, zoomable view onto a scene's world."""
+    __slots__ = ("x", "y", "zoom", "width", "height", "_view_surface", "_scaled_surface")
+
+    MIN_ZOOM = 0.05 # Smallest allowed zoom, beyond which views become too large to draw
+
+    def __init__(self, width: int, height: int, x: float = 0.0, y: float = 0.0, zoom: float = 1.0):
+        """
+        Initialise a camera.
+        :param width: Width of the screen area the camera draws to.
+        :param height: Height of the screen area the camera draws to.
+        :param x: World X position shown at the left edge of the screen.
+        :param y: World Y position shown at the top edge of the screen.
+        :param zoom: Scale of the world on the screen, where 2.0 shows everything twice as large.
+        """
+        self.x = x
+        self.y = y
+        self.zoom = max(self.MIN_ZOOM, zoom)
+        self.width = width
+        self.height = height
+        self._view_surface: Optional[pygame.Surface] = None # Reused surface the world is drawn to when zoomed
+        self._scaled_surface: Optional[pygame.Surface] = None # Reused surface the zoomed view is scaled into
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        """Get the whole-pixel world position shown at the top-left corner of the screen."""
+        return round(self.x), round(self.y)
+
+    @property
+    def view_size(self) -> tuple[int, int]:
+        """Get the size of the world area visible on the screen."""
+        return math.ceil(self.width / self.zoom), math.ceil(self.height / self.zoom)
+
+    def get_view_rect(self) -> pygame.Rect:
+        """Get the world area visible on the screen."""
+        return pygame.Rect(self.origin, self.view_size)
+
+    def set_position(self, x: float, y: float) -> None:
+        """Set the world position shown at the top-left corner of the screen."""
+        self.x = x
+        self.y = y
+
+    def move(self, dx: float, dy: float) -> None:
+        """Move the camera by an offset in world units."""
+        self.x += dx
+        self.y += dy
+
+    def centre_on(self, x: float, y: float) -> None:
+        """Move the camera so a world position is in the centre of the screen."""
+        view_width, view_height = self.width / self.zoom, self.height / self.zoom
+        self.x = x - view_width / 2
+        self.y = y - view_height / 2
+
+    def set_zoom(self, zoom: float) -> None:
+        """
+        Change the zoom, keeping the world position at the centre of the screen in place.
+        :param zoom: New scale of the world on the screen.
+        """
+        centre_x = self.x + self.width / self.zoom / 2
+        centre_y = self.y + self.height / self.zoom / 2
+        self.zoom = max(self.MIN_ZOOM, zoom)
+        self.centre_on(centre_x, centre_y)
+
+    def resize(self, width: int, height: int) -> None:
+        """Change the size of the screen area the camera draws to."""
+        self.width = width
+        self.height = height
+
+    def world_to_screen(self, position: tuple[float, float]) -> tuple[int, int]:
+        """Convert a world position to a screen position."""
+        return round((position[0] - self.x) * self.zoom), round((position[1] - self.y) * self.zoom)
+
+    def screen_to_world(self, position: tuple[float, float]) -> tuple[int, int]:
+        """Convert a screen position, such as the mouse position, to a world position."""
+        return round(position[0] / self.zoom + self.x), round(position[1] / self.zoom + self.y)
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the reused surfaces held for zoomed drawing."""
+        for surface in (self._view_surface, self._scaled_surface):
+            if surface is not None:
+                yield surface
+
+    def view_surface(self, screen: pygame.Surface) -> pygame.Surface:
+        """
+        Get the surface world content should be drawn to.
+
+        When zoomed, this is a cleared transparent surface the size of the visible world area, so whatever was drawn
+        on the screen before, such as a background fill, shows through after presenting.
+        :param screen: Surface the camera presents to.
+        :return: The screen itself without zoom, otherwise the view surface.
+        """
+        if self.zoom == 1.0:
+            return screen
+        size = self.view_size
+        if self._view_surface is None or self._view_surface.get_size() != size:
+            self._view_surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+        self._view_surface.fill((0, 0, 0, 0))
+        return self._view_surface
+
+    def present(self, view: pygame.Surface, screen: pygame.Surface) -> None:
+        """
+        Scale the drawn world area onto the screen, if it was drawn to a separate view surface.
+        :param view: Surface returned by view_surface.
+        :param screen: Surface the camera presents to.
+        """
+        if view is screen:
+            return None
+        size = screen.get_size()
+        if self._scaled_surface is None or self._scaled_surface.get_size() != size:
+            self._scaled_surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+        pygame.transform.scale(view, size, self._scaled_surface) # Scale into the reused surface
+        screen.blit(self._scaled_surface, (0, 0))
@@ -0,0 +1,191 @@
+"""
+Per-frame list of blit commands for batched rendering.
+
+Instead of blitting onto the screen one at a time, UI elements can emit their draws as
+(surface, destination, area, flags) commands. The whole list is then submitted to the target surface
+with a single Surface.blits call, removing the Python-level overhead of a blit call per element.
+
+A ScaledDrawList draws the same commands onto a smaller target for dynamic resolution scaling. Positions are scaled
+as commands are submitted, and each source surface is replaced by a scaled copy that is kept for as long as the
+element that emitted it does not change, so a steady frame draws reduced-resolution surfaces without resampling.
+"""
+import math
+from typing import Callable, Optional, Union
+
+import pygame
+
+
+class DrawList:
+    """A reusable list of draw commands submitted to a target surface in one call."""
+    def __init__(self, target: pygame.Surface):
+        """
+        Initialise an empty draw list.
+        :param target: Surface the commands are drawn onto when flushed.
+        """
+        self.target = target
+        self.scale = 1.0 # Size of the target relative to the coordinates commands are given in
+        self._commands: list[tuple] = [] # Pending (surface, dest, area, flags) commands in draw order
+
+    @property
+    def view_size(self) -> tuple[int, int]:
+        """Get the size of the area covered by the target, in the coordinates commands are given in."""
+        return self.target.get_size()
+
+    def add(self, surface: pygame.Surface,
+            dest: Union[tuple[int, int], pygame.Rect],
+            area: Optional[pygame.Rect] = None,
+            flags: int = 0) -> None:
+        """
+        Queue a blit command.
+        :param surface: Source surface to draw.
+        :param dest: Position or rectangle on the target surface.
+        :param area: Optional source rectangle to draw only part of the surface.
+        :param flags: Optional special blend flags.
+        """
+        self._commands.append((surface, dest, area, flags))
+
+    def flush(self) -> None:
+        """Submit all pending commands to the target surface and empty the list."""
+        if self._commands:
+            self.target.blits(self._commands, doreturn=False) # Skip building the list of changed rectangles
+            self._commands.clear()
+
+    def draw_direct(self, render: Callable[[pygame.Surface, tuple[int, int]], None],
+                    origin: tuple[int, int]) -> None:
+        """
+        Draw something that cannot emit commands, in order with the commands queued so far.
+        :param render: Function called as render(target, origin) to draw onto the target.
+        :param origin: Screen position that maps to the top-left corner of the target.
+        """
+        self.flush()
+        render(self.target, origin)
+
+    def clear(self) -> None:
+        """Discard all pending commands without drawing them."""
+        self._commands.clear()
+
+    @property
+    def commands(self) -> list[tuple]:
+        """Get the pending (surface, dest, area, flags) commands in draw order."""
+        return self._commands
+
+    def __len__(self) -> int:
+        """Get the number of pending commands."""
+        return len(self._commands)
+
+
+def scale_surface(surface: pygame.Surface, size: tuple[int, int]) -> pygame.Surface:
+    """
+    Resize a surface, keeping its surface-level alpha and colour key.
+    :param surface: Surface to resize.
+    :param size: New size.
+    :return: The resized surface.
+    """
+    colour_key = surface.get_colorkey()
+    if colour_key is None and surface.get_bitsize() >= 24:
+        scaled = pygame.transform.smoothscale(surface, size)
+    else: # Filtering would blend the colour key into its neighbours, and needs 24 or 32 bit pixels
+        scaled = pygame.transform.scale(surface, size)
+        if colour_key is not None:
+            scaled.set_colorkey(colour_key, pygame.RLEACCEL)
+    alpha = surface.get_alpha()
+    if alpha is not None and alpha < 255:
+        scaled.set_alpha(alpha)
+    return scaled
+
+
+class ScaledDrawList(DrawList):
+    """
+    A draw list that draws commands given at full resolution onto a smaller target.
+
+    Call begin_element before each element emits its commands, so the scaled copies of its surfaces are only rebuilt
+    when its appearance revision changes. Copies that are not drawn during a frame are released by end_frame.
+    """
+    def __init__(self, target: pygame.Surface, scale: float):
+        """
+        Initialise an empty scaled draw list.
+        :param target: Reduced-resolution surface the commands are drawn onto when flushed.
+        :param scale: Size of the target relative to the coordinates commands are given in.
+        """
+        super().__init__(target)
+        self.scale = scale
+        self._owner: tuple = (None, 0) # Id and appearance revision of the element emitting commands
+        self._scaled: dict[tuple, tuple] = {} # Source surface, owner revision and scaled copy, by owner, source
+        # and area
+        self._used: dict[tuple, tuple] = {} # Copies drawn so far this frame
+        self._layer: Optional[pygame.Surface] = None # Full resolution surface for elements drawn directly
+
+    @property
+    def view_size(self) -> tuple[int, int]:
+        """Get the size of the area covered by the target, in the coordinates commands are given in."""
+        width, height = self.target.get_size()
+        return math.ceil(width / self.scale), math.ceil(height / self.scale)
+
+    def set_scale(self, target: pygame.Surface, scale: float) -> None:
+        """
+        Change the target and its scale, releasing every scaled copy if the scale changed.
+        :param target: Reduced-resolution surface to draw onto.
+        :param scale: Size of the target relative to the coordinates commands are given in.
+        """
+        self.target = target
+        if scale != self.scale:
+            self.scale = scale
+            self._scaled.clear()
+
+    def begin_element(self, owner_id: int, revision: int) -> None:
+        """
+        Attribute the commands that follow to an element.
+        :param owner_id: Id of the element.
+        :param revision: Appearance revision of the element, as returned by UIElement.appearance_revision.
+        """
+        self.flush() # Commands already queued belong to the previous element
+        self._owner = (owner_id, revision)
+
+    def _scaled_copy(self, surface: pygame.Surface, area: Optional[pygame.Rect]) -> pygame.Surface:
+        """Get the scaled copy of a surface, or of an area of it, for the current element."""
+        owner_id, revision = self._owner
+        key = (owner_id, id(surface), tuple(area) if area is not None else None)
+        entry = self._used.get(key)
+        if entry is None:
+            entry = self._scaled.get(key)
+            if entry is None or entry[0] is not surface or entry[1] != revision: # New, replaced or changed
+                source = surface.subsurface(pygame.Rect(area).clip(surface.get_rect())) if area is not None else surface
+                width, height = source.get_size()
+                size = (max(1, math.ceil(width * self.scale)), max(1, math.ceil(height * self.scale))) # Rounding
+                # up keeps neighbouring surfaces, such as tilemap chunks, from leaving gaps
+                entry = (surface, revision, scale_surface(source, size))
+            self._used[key] = entry
+        return entry[2]
+
+    def flush(self) -> None:
+        """Scale the pending commands onto the target, submit them, and empty the list."""
+        if not self._commands:
+            return None
+        scale = self.scale
+        commands = []
+        for surface, dest, area, flags in self._commands:
+            copy = self._scaled_copy(surface, area)
+            commands.append((copy, (round(dest[0] * scale), round(dest[1] * scale)), None, flags))
+        self.target.blits(commands, doreturn=False)
+        self._commands.clear()
+
+    def draw_direct(self, render: Callable[[pygame.Surface, tuple[int, int]], None],
+                    origin: tuple[int, int]) -> None:
+        """
+        Draw something that cannot emit commands at full resolution onto a transparent layer, then scale the layer
+        onto the target. This is much slower than drawing commands.
+        :param render: Function called as render(target, origin) to draw onto the target.
+        :param origin: Screen position that maps to the top-left corner of the target.
+        """
+        self.flush()
+        size = self.view_size
+        if self._layer is None or self._layer.get_size() != size:
+            self._layer = pygame.Surface(size, pygame.SRCALPHA, 32)
+        self._layer.fill((0, 0, 0, 0))
+        render(self._layer, origin)
+        self.target.blit(pygame.transform.smoothscale(self._layer, self.target.get_size()), (0, 0))
+
+    def end_frame(self) -> None:
+        """Submit any pending commands, then release the scaled copies that were not drawn this frame."""
+        self.flush()
+        self._scaled, self._used = self._used, {}
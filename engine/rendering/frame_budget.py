@@ -0,0 +1,149 @@
+"""
+Frame-budget tracking and dynamic resolution scaling.
+
+FrameBudget keeps a smoothed average of how long each frame's work takes. DynamicResolution uses it to step the
+render resolution down while frames run over budget and back up once there is headroom again. While the resolution
+is reduced, scenes render onto a smaller internal surface, which is stretched onto the window in a single scale
+blit. Steps are separated by a cooldown so the average can settle at the new resolution before the next decision.
+Rendering at a reduced resolution is not always cheaper, since the stretch onto the window has a cost of its own, so
+once the cooldown after a step down ends the average is compared with the one from before the step. If it did not
+improve, the step is reverted and lower resolutions are not tried again for a while.
+
+Example:
+    resolution = DynamicResolution(budget_ms=1000 / 240)
+    target = resolution.target(screen)
+    scene_manager.render(target)
+    resolution.present(target, screen)
+    resolution.record_frame(frame_ms)
+"""
+from typing import Optional
+
+import pygame
+
+DEFAULT_SCALES = (1.0, 0.85, 0.7, 0.5) # Render scales to step through, from full resolution down
+
+
+class FrameBudget:
+    """A smoothed measure of frame time against a target frame time."""
+    __slots__ = ("budget_ms", "smoothing", "average_ms")
+
+    def __init__(self, budget_ms: float, smoothing: float = 0.1):
+        """
+        Initialise a frame budget.
+        :param budget_ms: Time each frame's work should fit within, in milliseconds.
+        :param smoothing: Weight of the newest frame in the average, from 0 to 1. Higher values react faster.
+        """
+        self.budget_ms = budget_ms
+        self.smoothing = smoothing
+        self.average_ms: Optional[float] = None # Exponential moving average of frame times
+
+    def record(self, frame_ms: float) -> float:
+        """
+        Add a frame time to the average.
+        :param frame_ms: Time the frame's work took, in milliseconds.
+        :return: The new average.
+        """
+        if self.average_ms is None:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        return self.average_ms
+
+    @property
+    def load(self) -> float:
+        """Get the average frame time as a fraction of the budget, or 0 before any frame was recorded."""
+        return 0.0 if self.average_ms is None else self.average_ms / self.budget_ms
+
+    def reset(self) -> None:
+        """Forget the recorded frame times."""
+        self.average_ms = None
+
+
+class DynamicResolution:
+    """Chooses a render resolution from recent frame times, and presents reduced-resolution frames."""
+    def __init__(self, budget_ms: float, scales: tuple[float, ...] = DEFAULT_SCALES, smoothing: float = 0.1,
+                 step_down_load: float = 1.0, step_up_load: float = 0.6, cooldown_frames: int = 30,
+                 hold_frames: int = 600):
+        """
+        Initialise dynamic resolution at full resolution.
+        :param budget_ms: Time each frame's work should fit within, in milliseconds.
+        :param scales: Render scales to step through, from highest to lowest.
+        :param smoothing: Weight of the newest frame in the average frame time.
+        :param step_down_load: Average load, as a fraction of the budget, above which the resolution is lowered.
+        :param step_up_load: Average load below which the resolution is raised again. Kept well below the step down
+            load, so the resolution does not flip between two steps.
+        :param cooldown_frames: Frames to wait after a change before changing again.
+        :param hold_frames: Frames to stay at or above a resolution after stepping below it did not lower the average
+            frame time.
+        """
+        self.budget = FrameBudget(budget_ms, smoothing)
+        self.scales = scales
+        self.step_down_load = step_down_load
+        self.step_up_load = step_up_load
+        self.cooldown_frames = cooldown_frames
+        self.hold_frames = hold_frames
+        self._level = 0 # Index of the current scale
+        self._cooldown = cooldown_frames # Frames left before the next change is allowed
+        self._before_step_ms: Optional[float] = None # Average before the last step down, until it is checked
+        self._hold = 0 # Frames left before stepping below the current level is allowed again
+        self._surface: Optional[pygame.Surface] = None # Reused reduced-resolution render target
+
+    @property
+    def scale(self) -> float:
+        """Get the current render scale, where 1.0 is full resolution."""
+        return self.scales[self._level]
+
+    def record_frame(self, frame_ms: float) -> None:
+        """
+        Record how long a frame's work took, and step the resolution if needed.
+        :param frame_ms: Time spent updating and rendering the frame, in milliseconds, excluding time spent waiting
+            for the frame rate cap.
+        """
+        average_ms = self.budget.record(frame_ms)
+        load = average_ms / self.budget.budget_ms
+        if self._hold > 0:
+            self._hold -= 1
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+
+        if self._before_step_ms is not None: # The average has settled since the last step down
+            improved = average_ms < self._before_step_ms
+            self._before_step_ms = None
+            if not improved: # Presenting the reduced frame cost more than it saved, so go back up and stay there
+                self._level -= 1
+                self._hold = self.hold_frames
+                self._cooldown = self.cooldown_frames
+                return None
+
+        if load > self.step_down_load and self._level < len(self.scales) - 1 and self._hold == 0:
+            self._before_step_ms = average_ms
+            self._level += 1
+        elif load < self.step_up_load and self._level > 0:
+            self._level -= 1
+        else:
+            return None
+        self._cooldown = self.cooldown_frames
+
+    def target(self, screen: pygame.Surface) -> pygame.Surface:
+        """
+        Get the surface to render the frame onto.
+        :param screen: Window surface.
+        :return: The window surface at full resolution, otherwise a reused smaller surface in the same pixel format.
+        """
+        if self.scale >= 1.0:
+            return screen
+        width, height = screen.get_size()
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size, 0, screen) # Matching format, so presenting needs no conversion
+        return self._surface
+
+    def present(self, target: pygame.Surface, screen: pygame.Surface) -> None:
+        """
+        Stretch a reduced-resolution frame onto the window.
+        :param target: Surface returned by target.
+        :param screen: Window surface.
+        """
+        if target is not screen:
+            pygame.transform.scale(target, screen.get_size(), screen) # Scale straight into the window
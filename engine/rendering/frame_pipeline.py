@@ -0,0 +1,190 @@
+"""
+Pipelined frames: simulating the next frame while the current one is drawn.
+
+In pipelined mode the engine captures each frame as an immutable snapshot of draw commands, then starts simulating
+the next frame (event handling and updates) on a worker thread while the frame thread draws the snapshot and flips.
+Blits and flips release the GIL, so they overlap with the Python work of the simulation instead of following it.
+
+Snapshots never reference surfaces the simulation may draw into. When an element's appearance revision changes, the
+surfaces it emits are copied while capturing, and the copies are kept for as long as the element does not change
+again, so a steady frame copies nothing. Atlas pages are drawn without copies since nothing draws into them. Anything
+drawn without draw commands, such as background fills, is drawn while capturing: onto the screen before the first
+command, and onto transparent overlays that become part of the snapshot after it.
+
+The simulation runs on one worker thread at a time, and capturing only happens while it is idle. Scene code must not
+draw onto the screen from update or handle_events, and state read by render is only consistent while capturing.
+
+Example:
+    pipeline = FramePipeline(screen)
+    snapshot = pipeline.capture(scene_manager, screen)
+    pending = pipeline.simulate(simulate_frame, dt, events)
+    FramePipeline.draw(snapshot, screen)
+    pygame.display.flip()
+    pending.result()
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+import pygame
+
+from engine.assets.atlas import loaded_atlases
+from engine.rendering.draw_list import DrawList
+
+
+class SnapshotDrawList(DrawList):
+    """
+    A draw list that records commands against copies of their source surfaces, to be drawn later.
+
+    Call begin_element before each element emits its commands, so copies of its surfaces are only made again when its
+    appearance revision changes. Copies that are not used during a frame are released by end_capture. The target is
+    the surface to draw onto for anything that cannot emit commands: the screen until the first command is recorded,
+    then a transparent overlay recorded in order with the commands.
+    """
+    def __init__(self, screen: pygame.Surface):
+        """
+        Initialise an empty snapshot draw list.
+        :param screen: Surface snapshots are drawn onto.
+        """
+        self._overlays: list[pygame.Surface] = [] # Reused transparent overlays, in the order they are handed out
+        self._overlay_count = 0 # Number of overlays handed out this frame
+        self._owner: tuple = (None, 0) # Id and appearance revision of the element emitting commands
+        self._copies: dict[tuple, tuple] = {} # Source surface, owner revision and copy, by owner and source
+        self._used: dict[tuple, tuple] = {} # Copies recorded so far this frame
+        self._shared: frozenset = frozenset() # Ids of atlas pages, which are never drawn into
+        self.screen = screen
+        super().__init__(screen)
+
+    @property
+    def target(self) -> pygame.Surface:
+        """Get the surface that anything drawn now should go onto, to appear in draw order."""
+        if not self._commands:
+            return self.screen
+        overlay = self._overlays[self._overlay_count - 1] if self._overlay_count else None
+        if overlay is not None and self._commands[-1][0] is overlay: # Nothing recorded since it was handed out
+            return overlay
+
+        if self._overlay_count == len(self._overlays):
+            self._overlays.append(pygame.Surface(self.screen.get_size(), pygame.SRCALPHA, 32))
+        overlay = self._overlays[self._overlay_count]
+        self._overlay_count += 1
+        overlay.fill((0, 0, 0, 0))
+        self._commands.append((overlay, (0, 0), None, 0))
+        return overlay
+
+    @target.setter
+    def target(self, screen: pygame.Surface) -> None:
+        """Set the screen, as DrawList users set the target."""
+        self.screen = screen
+
+    def begin_capture(self, screen: pygame.Surface) -> None:
+        """
+        Start recording a frame.
+        :param screen: Surface the frame will be drawn onto.
+        """
+        self.screen = screen
+        self._commands = [] # The previous list belongs to the previous snapshot
+        self._overlay_count = 0
+        self._owner = (None, 0)
+        self._shared = frozenset(id(page) for atlas in loaded_atlases() for page in atlas.pages)
+
+    def begin_element(self, owner_id: int, revision: int) -> None:
+        """
+        Attribute the commands that follow to an element.
+        :param owner_id: Id of the element.
+        :param revision: Appearance revision of the element, as returned by UIElement.appearance_revision.
+        """
+        self._owner = (owner_id, revision)
+
+    def _copy_of(self, surface: pygame.Surface) -> pygame.Surface:
+        """Get the copy of a surface for the current element, copying it if needed."""
+        if id(surface) in self._shared:
+            return surface
+        owner_id, revision = self._owner
+        key = (owner_id, id(surface))
+        entry = self._used.get(key)
+        if entry is None:
+            entry = self._copies.get(key)
+            if entry is None or entry[0] is not surface or entry[1] != revision: # New, replaced or changed
+                entry = (surface, revision, surface.copy()) # Keeps the surface's alpha and colour key
+            self._used[key] = entry
+        return entry[2]
+
+    def add(self, surface: pygame.Surface,
+            dest: Union[tuple[int, int], pygame.Rect],
+            area: Optional[pygame.Rect] = None,
+            flags: int = 0) -> None:
+        """
+        Record a blit command against a copy of its source surface.
+        :param surface: Source surface to draw.
+        :param dest: Position or rectangle on the target surface.
+        :param area: Optional source rectangle to draw only part of the surface.
+        :param flags: Optional special blend flags.
+        """
+        self._commands.append((self._copy_of(surface), dest, area, flags))
+
+    def flush(self) -> None:
+        """Keep the recorded commands, which are drawn when the snapshot is."""
+        pass
+
+    def end_capture(self) -> tuple[tuple, ...]:
+        """
+        Finish recording a frame, releasing the copies that were not used.
+        :return: The frame's (surface, dest, area, flags) commands in draw order.
+        """
+        self._copies, self._used = self._used, {}
+        return tuple(self._commands)
+
+    @property
+    def copy_count(self) -> int:
+        """Get the number of retained surface copies."""
+        return len(self._copies)
+
+
+class FramePipeline:
+    """Captures frames as snapshots and runs the simulation of the next frame on a worker thread."""
+    def __init__(self, screen: pygame.Surface):
+        """
+        Start the simulation thread.
+        :param screen: Surface snapshots are drawn onto.
+        """
+        self.draw_list = SnapshotDrawList(screen)
+        self.capturing = False # Whether scenes are rendering into the draw list
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simulation")
+
+    def capture(self, scene_manager: "SceneManager", screen: pygame.Surface) -> tuple[tuple, ...]:
+        """
+        Render the scenes into a snapshot. Call on the frame thread while the simulation is idle.
+        :param scene_manager: Scene manager to render.
+        :param screen: Surface the snapshot will be drawn onto.
+        :return: The snapshot's draw commands.
+        """
+        self.draw_list.begin_capture(screen)
+        self.capturing = True
+        try:
+            scene_manager.render(screen)
+        finally:
+            self.capturing = False
+        return self.draw_list.end_capture()
+
+    @staticmethod
+    def draw(snapshot: tuple[tuple, ...], screen: pygame.Surface) -> None:
+        """
+        Draw a snapshot onto the screen.
+        :param snapshot: Draw commands returned by capture.
+        :param screen: Surface to draw onto.
+        """
+        if snapshot:
+            screen.blits(snapshot, doreturn=False)
+
+    def simulate(self, function: Callable[..., Any], *args: Any) -> Future:
+        """
+        Run the simulation of a frame on the worker thread.
+        :param function: Function that handles the frame's events and updates the scenes.
+        :param args: Arguments for the function.
+        :return: Future of the simulation, whose result must be waited for before the next capture.
+        """
+        return self._executor.submit(function, *args)
+
+    def shutdown(self) -> None:
+        """Stop the simulation thread once the running simulation finishes."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,123 @@
+"""
+Adaptive quality levels for expensive UI effects.
+
+A QualityGovernor reads recent frame times and lowers the quality level while frames run over budget, then raises
+it again once there is headroom. UI code asks what it can currently afford through the module functions, which all
+report full quality when no governor is installed:
+    HIGH    everything enabled
+    MEDIUM  nearest-neighbour resizing instead of filtered resizing, no hover tint overlays
+    LOW     as MEDIUM, and text is rendered without antialiasing
+
+Only choices about how things are drawn are governed, never simulation state such as tween durations or positions.
+The level follows wall-clock frame times, so anything it changed in the simulation would make recorded sessions
+replay differently from run to run.
+
+Elements that draw something at reduced quality register with watch_recovery, and are asked to redraw through their
+restore_quality method when the level rises again, so degraded surfaces do not linger after the pressure is gone.
+
+Example:
+    set_governor(QualityGovernor(budget_ms=1000 / 240))
+    ...
+    governor.record_frame(frame_ms)  # call once every frame
+    scaler = pygame.transform.smoothscale if smooth_scaling() else pygame.transform.scale
+"""
+import weakref
+from typing import Any, Optional
+
+from engine.rendering.frame_budget import FrameBudget
+
+LOW = 0
+MEDIUM = 1
+HIGH = 2
+
+
+class QualityGovernor:
+    """Chooses a quality level from recent frame times."""
+    def __init__(self, budget_ms: float, smoothing: float = 0.1, degrade_load: float = 0.9,
+                 recover_load: float = 0.6, cooldown_frames: int = 60):
+        """
+        Initialise a governor at full quality.
+        :param budget_ms: Time each frame's work should fit within, in milliseconds.
+        :param smoothing: Weight of the newest frame in the average frame time.
+        :param degrade_load: Average load, as a fraction of the budget, above which quality is lowered.
+        :param recover_load: Average load below which quality is raised again.
+        :param cooldown_frames: Frames to wait after a change before changing again.
+        """
+        self.budget = FrameBudget(budget_ms, smoothing)
+        self.degrade_load = degrade_load
+        self.recover_load = recover_load
+        self.cooldown_frames = cooldown_frames
+        self.level = HIGH
+        self._cooldown = cooldown_frames # Frames left before the next change is allowed
+        self._degraded = weakref.WeakSet() # Objects drawn at reduced quality, to redraw once quality rises
+
+    def record_frame(self, frame_ms: float) -> None:
+        """
+        Record how long a frame's work took, and change the quality level if needed. Call on the frame thread.
+        :param frame_ms: Time spent updating and rendering the frame, in milliseconds.
+        """
+        load = self.budget.record(frame_ms) / self.budget.budget_ms
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+        if load > self.degrade_load and self.level > LOW:
+            self.set_level(self.level - 1)
+        elif load < self.recover_load and self.level < HIGH:
+            self.set_level(self.level + 1)
+
+    def set_level(self, level: int) -> None:
+        """
+        Change the quality level, asking degraded objects to redraw if it rose.
+        :param level: LOW, MEDIUM or HIGH.
+        """
+        raised = level > self.level
+        self.level = level
+        self._cooldown = self.cooldown_frames
+        if raised and self._degraded:
+            degraded, self._degraded = list(self._degraded), weakref.WeakSet()
+            for item in degraded:
+                item.restore_quality() # May register again if still below the quality it wants
+
+    def watch_recovery(self, item: Any) -> None:
+        """Ask an object to redraw through its restore_quality method the next time the level rises."""
+        self._degraded.add(item)
+
+
+_governor: Optional[QualityGovernor] = None # Governor UI code consults, if any
+
+
+def set_governor(governor: Optional[QualityGovernor]) -> None:
+    """Install the governor UI code consults, or remove it with None to always use full quality."""
+    global _governor
+    _governor = governor
+
+
+def get_governor() -> Optional[QualityGovernor]:
+    """Get the installed governor, if any."""
+    return _governor
+
+
+def level() -> int:
+    """Get the current quality level."""
+    return _governor.level if _governor is not None else HIGH
+
+
+def smooth_scaling() -> bool:
+    """Check if filtered resizing is affordable."""
+    return _governor is None or _governor.level >= HIGH
+
+
+def hover_tint() -> bool:
+    """Check if tint overlays are affordable."""
+    return _governor is None or _governor.level >= HIGH
+
+
+def text_antialiasing() -> bool:
+    """Check if antialiased text rendering is affordable."""
+    return _governor is None or _governor.level >= MEDIUM
+
+
+def watch_recovery(item: Any) -> None:
+    """Ask an object drawn at reduced quality to redraw through restore_quality once the level rises."""
+    if _governor is not None:
+        _governor.watch_recovery(item)
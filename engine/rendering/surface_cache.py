@@ -0,0 +1,65 @@
+"""
+Bounded least-recently-used cache of surfaces.
+
+Used to keep derived surfaces, such as resized or tinted copies of an image, so that switching back to a previous
+variant costs a lookup instead of resampling or recolouring pixels again.
+"""
+from collections import OrderedDict
+from typing import Hashable, Iterator, Optional
+
+import pygame
+
+
+class SurfaceCache:
+    """An LRU cache of surfaces with a fixed maximum number of entries."""
+    __slots__ = ("max_entries", "_entries")
+
+    def __init__(self, max_entries: int = 8):
+        """
+        Initialise an empty cache.
+        :param max_entries: Maximum number of surfaces kept. The least recently used one is evicted beyond this.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """
+        Look up a surface and mark it as recently used.
+        :param key: Key the surface was stored under.
+        :return: The surface, or None if it is not cached.
+        """
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+        return surface
+
+    def put(self, key: Hashable, surface: pygame.Surface) -> None:
+        """
+        Store a surface, evicting the least recently used entry if the cache is full.
+        :param key: Key to store the surface under.
+        :param surface: Surface to store.
+        """
+        self._entries[key] = surface
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[pygame.Surface]:
+        """
+        Remove a surface from the cache.
+        :param key: Key the surface was stored under.
+        :return: The removed surface, or None if it was not cached.
+        """
+        return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every cached surface."""
+        self._entries.clear()
+
+    def surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the cached surfaces."""
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        """Get the number of cached surfaces."""
+        return len(self._entries)
@@ -0,0 +1,144 @@
+"""
+Pixel-format selection for surfaces.
+
+Blitting a surface with per-pixel alpha is several times slower than blitting an opaque surface or a colour keyed
+one. These helpers inspect what a surface actually needs and convert it to the cheapest matching display format:
+an opaque surface, a colour keyed surface with RLE acceleration, or a per-pixel alpha surface.
+"""
+from typing import Optional
+
+import pygame
+
+OPAQUE = "opaque" # Every pixel is fully opaque
+COLOURKEY = "colourkey" # Every pixel is either fully opaque or fully transparent
+PER_PIXEL = "per_pixel" # Some pixels are partially transparent
+
+# Colours tried in order as the transparent key, chosen to be unlikely in real artwork
+_KEY_CANDIDATES = ((255, 0, 255), (0, 255, 255), (1, 2, 3), (254, 1, 253))
+
+
+def has_alpha_channel(surface: pygame.Surface) -> bool:
+    """
+    Check if a surface stores per-pixel alpha.
+
+    The SRCALPHA flag is not used for this, as Pygame also reports it for surfaces with only surface-level alpha.
+    :param surface: Surface to inspect.
+    :return: True if the pixel format has an alpha channel.
+    """
+    return surface.get_masks()[3] != 0
+
+
+def _display_ready() -> bool:
+    """Check if a display mode is set, which surface conversion requires."""
+    return pygame.display.get_surface() is not None
+
+
+def classify_alpha(surface: pygame.Surface) -> str:
+    """
+    Find the cheapest transparency mode that can represent a surface without losing detail.
+    :param surface: Surface to inspect.
+    :return: OPAQUE, COLOURKEY or PER_PIXEL.
+    """
+    if not has_alpha_channel(surface): # No alpha channel to inspect
+        return COLOURKEY if surface.get_colorkey() is not None else OPAQUE
+
+    width, height = surface.get_size()
+    opaque = pygame.mask.from_surface(surface, 254).count() # Pixels with alpha 255
+    if opaque == width * height:
+        return OPAQUE
+    visible = pygame.mask.from_surface(surface, 0).count() # Pixels with any alpha
+    return COLOURKEY if visible == opaque else PER_PIXEL
+
+
+def pick_colour_key(*avoid: Optional[tuple]) -> tuple[int, int, int]:
+    """
+    Choose a colour key that differs from the given colours.
+    :param avoid: Colours already used on the surface.
+    :return: RGB colour to use as the transparent key.
+    """
+    used = {tuple(colour[:3]) for colour in avoid if colour}
+    for candidate in _KEY_CANDIDATES:
+        if candidate not in used:
+            return candidate
+    return _KEY_CANDIDATES[0]
+
+
+def apply_alpha(surface: pygame.Surface, alpha: int) -> None:
+    """
+    Set the surface-level opacity, leaving fully opaque surfaces on the faster non-blended blit path.
+    :param surface: Surface to update.
+    :param alpha: Opacity from 0 to 255.
+    """
+    surface.set_alpha(alpha if alpha < 255 or has_alpha_channel(surface) else None)
+
+
+def create_surface(size: tuple[int, int], kind: str,
+                   colour_key: Optional[tuple] = None,
+                   alpha: int = 255) -> pygame.Surface:
+    """
+    Create an empty surface in the display format for a transparency mode.
+    :param size: Width and height in pixels.
+    :param kind: OPAQUE, COLOURKEY or PER_PIXEL.
+    :param colour_key: Transparent key colour, required for COLOURKEY surfaces. The surface is filled with it.
+    :param alpha: Surface-level opacity applied on top of the pixel format.
+    :return: The new surface.
+    """
+    if kind == PER_PIXEL:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        if _display_ready():
+            surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0)) # Start fully transparent
+    else:
+        surface = pygame.Surface(size)
+        if _display_ready():
+            surface = surface.convert()
+        if kind == COLOURKEY:
+            surface.fill(colour_key)
+            surface.set_colorkey(colour_key, pygame.RLEACCEL) # Run-length encode the transparent spans
+    apply_alpha(surface, alpha)
+    return surface
+
+
+def optimise_surface(surface: pygame.Surface, alpha: int = 255) -> pygame.Surface:
+    """
+    Convert a surface to the cheapest display format that keeps its appearance.
+
+    Fully opaque surfaces become plain display surfaces, surfaces whose pixels are only ever fully opaque or fully
+    transparent become RLE accelerated colour keyed surfaces, and anything else keeps per-pixel alpha.
+    :param surface: Surface to convert. It is not modified.
+    :param alpha: Surface-level opacity to apply.
+    :return: A new surface, or the original if no display mode is set.
+    """
+    if not _display_ready():
+        return surface
+
+    kind = classify_alpha(surface)
+    if kind == OPAQUE:
+        result = surface.convert()
+    elif kind == COLOURKEY:
+        result = _to_colour_key(surface)
+        if result is None: # Every candidate key colour appears in the artwork
+            result = surface.convert_alpha()
+    else:
+        result = surface.convert_alpha()
+    apply_alpha(result, alpha)
+    return result
+
+
+def _to_colour_key(surface: pygame.Surface) -> Optional[pygame.Surface]:
+    """
+    Convert a surface with only fully opaque or fully transparent pixels into a colour keyed surface.
+    :param surface: Per-pixel alpha surface to convert.
+    :return: The colour keyed surface, or None if no key colour is free.
+    """
+    width, height = surface.get_size()
+    transparent = width * height - pygame.mask.from_surface(surface, 0).count()
+    for key in _KEY_CANDIDATES:
+        result = create_surface((width, height), COLOURKEY, key)
+        result.set_colorkey(None) # Compare raw pixels before enabling the key
+        result.blit(surface, (0, 0)) # Opaque pixels overwrite the key, transparent ones leave it
+        keyed = pygame.mask.from_threshold(result, key, (1, 1, 1, 255)).count()
+        if keyed == transparent: # The key colour does not appear in the opaque pixels
+            result.set_colorkey(key, pygame.RLEACCEL)
+            return result
+    return None
@@ -0,0 +1,246 @@
+"""
+Texture render backend on pygame._sdl2 Renderer and Texture.
+
+Instead of blitting every element onto the display surface, the texture backend uploads element surfaces to
+textures once and draws the textures with the window's renderer, which is hardware accelerated where the platform
+has an accelerator and SDL's software renderer otherwise. Textures are retained for as long as the element that drew
+them does not change, tracked through its appearance revision, so a steady frame uploads nothing. Positions are
+scaled and surface-level alpha is applied when a texture is drawn, so camera zoom needs no resampled copies.
+
+Scenes still render onto a software canvas the size of the window, so their background fills and anything drawn
+without draw commands keep working. The canvas is uploaded under the first draw command of the frame, and software
+drawing that happens after it goes onto a transparent overlay uploaded before the next draw command, which keeps the
+draw order. Scenes should draw onto the canvas before rendering their elements, as every scene in the repository
+does, since each upload of the canvas or overlay costs a full-window copy.
+
+Example:
+    renderer = TextureRenderer(pygame.display.set_mode(size, pygame.HIDDEN), "Game")
+    renderer.begin_frame()
+    scene_manager.render(renderer.canvas)
+    renderer.end_frame()
+    renderer.present()
+"""
+import math
+from typing import Callable, Optional
+
+import pygame
+from pygame._sdl2.sdl2 import error as SDLError
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from engine.assets.atlas import loaded_atlases
+from engine.rendering.draw_list import DrawList
+
+BACKEND_SOFTWARE = "software" # Blit onto the display surface
+BACKEND_TEXTURE = "texture" # Draw retained textures with an SDL renderer
+
+_BLEND_NONE = 0 # SDL blend modes
+_BLEND_ALPHA = 1
+_BLEND_ADD = 2
+_BLEND_MOD = 4
+
+_BLEND_MODES = {
+    pygame.BLEND_ADD: _BLEND_ADD, pygame.BLEND_RGBA_ADD: _BLEND_ADD,
+    pygame.BLEND_MULT: _BLEND_MOD, pygame.BLEND_RGBA_MULT: _BLEND_MOD,
+} # Blit flags with a matching SDL blend mode, others draw with the texture's own blend mode
+
+
+class TextureDrawList(DrawList):
+    """
+    A draw list that draws commands as retained textures with an SDL renderer.
+
+    Call begin_element before each element emits its commands, so its textures are only uploaded again when its
+    appearance revision changes. Textures that are not drawn during a frame are released by end_frame. The target is
+    the software surface to draw onto for anything that cannot emit commands: the canvas until the first command is
+    drawn, then a transparent overlay.
+    """
+    def __init__(self, renderer: Renderer, canvas: pygame.Surface):
+        """
+        Initialise an empty texture draw list.
+        :param renderer: Renderer of the window to draw onto.
+        :param canvas: Software surface the size of the window that scenes draw their background onto.
+        """
+        self.renderer = renderer
+        self.canvas = canvas
+        self._canvas_pending = True # Whether the canvas still has to be drawn this frame
+        self._canvas_texture: Optional[Texture] = None # Streaming texture the canvas is uploaded into
+        self._overlay: Optional[pygame.Surface] = None # Transparent surface for software drawing after the canvas
+        self._overlay_texture: Optional[Texture] = None
+        self._overlay_dirty = False # Whether the overlay was handed out since it was last drawn
+        self._layer: Optional[pygame.Surface] = None # Unscaled surface for scaled elements drawn directly
+        self._layer_texture: Optional[Texture] = None
+        self._owner: tuple = (None, 0) # Id and appearance revision of the element emitting commands
+        self._textures: dict[tuple, tuple] = {} # Source surface, owner revision and texture, by owner and source
+        self._used: dict[tuple, tuple] = {} # Textures drawn so far this frame
+        self._shared: frozenset = frozenset() # Ids of atlas pages, which never change and are uploaded once
+        super().__init__(canvas)
+
+    @property
+    def target(self) -> pygame.Surface:
+        """Get the software surface that anything drawn now should go onto, to appear in draw order."""
+        if self._canvas_pending:
+            return self.canvas
+        if not self._overlay_dirty: # Cleared when first handed out after being drawn
+            if self._overlay is None or self._overlay.get_size() != self.canvas.get_size():
+                self._overlay = pygame.Surface(self.canvas.get_size(), pygame.SRCALPHA, 32)
+            self._overlay.fill((0, 0, 0, 0))
+            self._overlay_dirty = True
+        return self._overlay
+
+    @target.setter
+    def target(self, canvas: pygame.Surface) -> None:
+        """Set the canvas, as DrawList users set the target."""
+        self.canvas = canvas
+
+    @property
+    def view_size(self) -> tuple[int, int]:
+        """Get the size of the area covered by the window, in the coordinates commands are given in."""
+        width, height = self.canvas.get_size()
+        return math.ceil(width / self.scale), math.ceil(height / self.scale)
+
+    def set_scale(self, scale: float) -> None:
+        """
+        Change the scale positions and sizes are drawn at.
+        :param scale: Size on the window relative to the coordinates commands are given in, such as the camera zoom.
+        """
+        self.flush() # Commands already queued were given at the previous scale
+        self.scale = scale
+
+    def begin_frame(self) -> None:
+        """Start a frame, with the canvas to be drawn under the first command."""
+        self._commands.clear()
+        self._canvas_pending = True
+        self._overlay_dirty = False
+        self._owner = (None, 0)
+        self.scale = 1.0
+        self._shared = frozenset(id(page) for atlas in loaded_atlases() for page in atlas.pages)
+
+    def begin_element(self, owner_id: int, revision: int) -> None:
+        """
+        Attribute the commands that follow to an element.
+        :param owner_id: Id of the element.
+        :param revision: Appearance revision of the element, as returned by UIElement.appearance_revision.
+        """
+        self.flush() # Commands already queued belong to the previous element
+        self._owner = (owner_id, revision)
+
+    def _stream(self, texture: Optional[Texture], surface: pygame.Surface, blend_mode: int) -> Texture:
+        """Upload a surface into a reused streaming texture, draw it over the whole window, and return the texture."""
+        if texture is None or (texture.width, texture.height) != surface.get_size():
+            texture = Texture(self.renderer, surface.get_size(), streaming=True)
+            texture.blend_mode = blend_mode
+        texture.update(surface)
+        texture.draw(None, (0, 0, *self.canvas.get_size()))
+        return texture
+
+    def _draw_software(self) -> None:
+        """Draw the canvas, or the overlay if it was drawn onto, so software drawing appears in order."""
+        if self._canvas_pending:
+            self._canvas_texture = self._stream(self._canvas_texture, self.canvas, _BLEND_NONE) # Opaque, so
+            # the window needs no clearing
+            self._canvas_pending = False
+        elif self._overlay_dirty:
+            self._overlay_texture = self._stream(self._overlay_texture, self._overlay, _BLEND_ALPHA)
+            self._overlay_dirty = False
+
+    def _texture_for(self, surface: pygame.Surface) -> tuple:
+        """Get the retained texture entry of a surface for the current element, uploading it if needed."""
+        owner_id, revision = (None, 0) if id(surface) in self._shared else self._owner
+        key = (owner_id, id(surface))
+        entry = self._used.get(key)
+        if entry is None:
+            entry = self._textures.get(key)
+            if entry is None or entry[0] is not surface or entry[1] != revision: # New, replaced or changed
+                texture = Texture.from_surface(self.renderer, surface)
+                entry = (surface, revision, texture, texture.blend_mode)
+            self._used[key] = entry
+        return entry
+
+    def flush(self) -> None:
+        """Draw the pending commands as textures and empty the list."""
+        if not self._commands:
+            return None
+        self._draw_software()
+        scale = self.scale
+        for surface, dest, area, flags in self._commands:
+            _, _, texture, blend_mode = self._texture_for(surface)
+            alpha = surface.get_alpha()
+            texture.alpha = 255 if alpha is None else alpha # Surface-level alpha is applied while drawing
+            width, height = (area[2], area[3]) if area is not None else surface.get_size()
+            if scale == 1.0:
+                destination = (dest[0], dest[1], width, height)
+            else: # Rounding the size up keeps neighbouring textures, such as tilemap chunks, from leaving gaps
+                destination = (round(dest[0] * scale), round(dest[1] * scale),
+                               math.ceil(width * scale), math.ceil(height * scale))
+            if flags in _BLEND_MODES:
+                texture.blend_mode = _BLEND_MODES[flags]
+                texture.draw(area, destination)
+                texture.blend_mode = blend_mode
+            else:
+                texture.draw(area, destination)
+        self._commands.clear()
+
+    def draw_direct(self, render: Callable[[pygame.Surface, tuple[int, int]], None],
+                    origin: tuple[int, int]) -> None:
+        """
+        Draw something that cannot emit commands onto the software target, in order with the commands queued so
+        far. When scaled, it is drawn unscaled onto a transparent layer that is then uploaded and stretched over the
+        window, which is much slower than drawing commands.
+        :param render: Function called as render(target, origin) to draw onto the target.
+        :param origin: Screen position that maps to the top-left corner of the target.
+        """
+        self.flush()
+        if self.scale == 1.0:
+            render(self.target, origin)
+            return None
+
+        self._draw_software() # Anything drawn in software so far goes under the layer
+        size = self.view_size
+        if self._layer is None or self._layer.get_size() != size:
+            self._layer = pygame.Surface(size, pygame.SRCALPHA, 32)
+        self._layer.fill((0, 0, 0, 0))
+        render(self._layer, origin)
+        self._layer_texture = self._stream(self._layer_texture, self._layer, _BLEND_ALPHA)
+
+    def end_frame(self) -> None:
+        """Draw any pending commands and software drawing, then release the textures that were not drawn."""
+        self.flush()
+        self._draw_software()
+        self._textures, self._used = self._used, {}
+
+    @property
+    def texture_count(self) -> int:
+        """Get the number of retained textures."""
+        return len(self._textures)
+
+
+class TextureRenderer:
+    """A window drawn with an SDL renderer, with a software canvas scenes render onto."""
+    def __init__(self, canvas: pygame.Surface, title: str, vsync: bool = False):
+        """
+        Open the window and create its renderer, hardware accelerated if possible.
+        :param canvas: Software surface scenes render onto, which also sets the window size. Usually a hidden display
+            surface, so surfaces are still converted to a display pixel format.
+        :param title: Title of the window.
+        :param vsync: Whether present waits for the display's refresh.
+        """
+        self.canvas = canvas
+        self.window = Window(title, canvas.get_size())
+        try:
+            self.renderer = Renderer(self.window, accelerated=1, vsync=vsync)
+            self.accelerated = True
+        except SDLError: # No accelerated driver, so use SDL's software renderer
+            self.renderer = Renderer(self.window, accelerated=0, vsync=vsync)
+            self.accelerated = False
+        self.draw_list = TextureDrawList(self.renderer, canvas)
+
+    def begin_frame(self) -> None:
+        """Start drawing a frame."""
+        self.draw_list.begin_frame()
+
+    def end_frame(self) -> None:
+        """Finish drawing a frame."""
+        self.draw_list.end_frame()
+
+    def present(self) -> None:
+        """Show the drawn frame on the window."""
+        self.renderer.present()
@@ -0,0 +1,119 @@
+"""
+Background thread pool for expensive pixel transforms.
+
+pygame.transform.smoothscale, scale and rotozoom release the GIL while they process pixels, so running them on
+worker threads lets a large resample finish while the frame thread keeps drawing. Jobs return futures, and an
+optional callback receives the finished surface on the frame thread, the next time poll_transforms is called
+(SceneManager.update calls it once per frame). Elements can then keep drawing their previous surface until the new
+one is ready, instead of blocking the frame.
+
+Source surfaces must not be drawn into while a job reading them is running. Font rendering is not thread-safe in
+SDL_ttf, so text is never rendered on the pool.
+
+Example:
+    def on_scaled(surface):
+        self.surface = surface
+
+    get_transform_service().smoothscale(big_surface, (640, 360), on_scaled)
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import pygame
+
+
+class TransformService:
+    """Runs surface transforms on worker threads and hands the results back on the frame thread."""
+    def __init__(self, workers: int = 2):
+        """
+        Start the worker threads.
+        :param workers: Number of worker threads.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transform")
+        self._finished: deque = deque() # Futures with callbacks that have finished, appended by the workers
+        self._pending = 0 # Number of jobs with callbacks not yet handed back
+
+    @property
+    def pending(self) -> int:
+        """Get the number of jobs with callbacks that have not been handed back by poll yet."""
+        return self._pending
+
+    def submit(self, function: Callable[..., Any], *args: Any,
+               callback: Optional[Callable[[Any], None]] = None) -> Future:
+        """
+        Run a function on a worker thread.
+        :param function: Function to run. It must only read its arguments, and should spend most of its time in
+            code that releases the GIL, such as pygame.transform functions.
+        :param args: Arguments for the function.
+        :param callback: Optional function called on the frame thread with the result, from poll.
+        :return: Future of the result.
+        """
+        future = self._executor.submit(function, *args)
+        if callback is not None:
+            self._pending += 1
+            future.add_done_callback(lambda done: self._finished.append((done, callback))) # Deque appends are
+            # thread-safe, and the callback itself runs later on the frame thread
+        return future
+
+    def scale(self, surface: pygame.Surface, size: tuple[int, int],
+              callback: Optional[Callable[[pygame.Surface], None]] = None) -> Future:
+        """Resize a surface without filtering on a worker thread."""
+        return self.submit(pygame.transform.scale, surface, size, callback=callback)
+
+    def smoothscale(self, surface: pygame.Surface, size: tuple[int, int],
+                    callback: Optional[Callable[[pygame.Surface], None]] = None) -> Future:
+        """Resize a surface with filtering on a worker thread."""
+        return self.submit(pygame.transform.smoothscale, surface, size, callback=callback)
+
+    def rotozoom(self, surface: pygame.Surface, angle: float, scale: float,
+                 callback: Optional[Callable[[pygame.Surface], None]] = None) -> Future:
+        """Rotate and resize a surface with filtering on a worker thread."""
+        return self.submit(pygame.transform.rotozoom, surface, angle, scale, callback=callback)
+
+    def poll(self) -> int:
+        """
+        Hand the results of finished jobs to their callbacks. Call on the frame thread.
+        :return: Number of callbacks called.
+        :raises Exception: Any exception raised by a job, once its result is handed back.
+        """
+        handled = 0
+        while self._finished:
+            future, callback = self._finished.popleft()
+            self._pending -= 1
+            handled += 1
+            callback(future.result())
+        return handled
+
+    def wait(self) -> None:
+        """Block until every job with a callback has finished, then hand back the results."""
+        while self._pending:
+            if not self._finished:
+                pygame.time.wait(1)
+            self.poll()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads.
+        :param wait: Whether to wait for running jobs to finish.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_service: Optional[TransformService] = None # Shared service, created on first use
+
+
+def get_transform_service() -> TransformService:
+    """Get the shared transform service, starting it on first use."""
+    global _service
+    if _service is None:
+        _service = TransformService()
+    return _service
+
+
+def poll_transforms() -> int:
+    """
+    Hand back the finished jobs of the shared service, if it has been started.
+    :return: Number of callbacks called.
+    """
+    return _service.poll() if _service is not None else 0
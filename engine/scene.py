@@ -3,14 +3,33 @@ Abstract base class for all game scenes.
 
 Scenes manage their own UI elements, event handling, updates, and rendering.
 This class enforces a consistent interface across all scenes.
+Each scene has a camera. Elements are placed in world coordinates and drawn through the camera, unless they are
+marked as screen space, and elements outside the camera's view are skipped when rendering and when hit-testing mouse
+presses. Elements still hovered or pressed when they leave the view keep receiving pointer motion and releases until
+the interaction ends. Element bounds are cached until an element moves or changes, so culling costs one rectangle test
+per element.
+With the texture render backend, elements are drawn as retained textures, and camera zoom is applied while drawing.
+In pipelined mode, scenes render into a snapshot of draw commands that is drawn while the next frame is simulated.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Iterator, Union
 import pygame.event
 
+import pygame
+
+from engine.gameplay.ecs import World
+from engine.rendering.camera import Camera
+from engine.rendering.draw_list import DrawList, ScaledDrawList
+from engine.rendering.frame_pipeline import SnapshotDrawList
+from engine.rendering.texture_renderer import TextureDrawList
+from engine.user_interface import ui_element
+from engine.user_interface.animation_manager import AnimationManager
 from engine.user_interface.ui_element import UIElement
 
+_UNBOUNDED = pygame.Rect(-10 ** 9, -10 ** 9, 2 * 10 ** 9, 2 * 10 ** 9) # Stands in for empty bounds, which are never
+# culled since the element's real extent is unknown
+
 
 class Scene(ABC):
     """Abstract base class for all scenes in the game."""
@@ -21,6 +40,30 @@ class Scene(ABC):
         """
         self.engine = engine
         self.ui_elements: list[UIElement] = [] # List of all required UI elements to be rendered on this screen
+        self.batch_rendering = False # Whether elements are drawn through a single batched blits call
+        self._draw_list: Optional[DrawList] = None # Reused command list for batched rendering
+        self._scaled_draw_list: Optional[ScaledDrawList] = None # Command list for reduced-resolution rendering
+        self.animations = AnimationManager() # Advances all tweens created with this scene's manager together
+        self._world: Optional[World] = None # Gameplay entities and systems, created when first used
+        self.camera = Camera(*engine.screen.get_size()) # View onto the scene's world
+        self._elements_version = 0 # Advanced whenever elements are added or removed
+        self._bounds_key: Optional[int] = None # Element revision the cached bounds were last checked at
+        self._order_key: Optional[tuple] = None # Element and order state the sorted element lists were built from
+        self._world_elements: list[UIElement] = [] # Camera-space elements in ascending layer order
+        self._world_bounds: list[pygame.Rect] = [] # Bounds of each camera-space element, in world coordinates
+        self._world_stamps: list[int] = [] # Bounds revision of each camera-space element when its bounds were read
+        self._screen_elements: list[UIElement] = [] # Screen-space elements in ascending layer order
+        self._screen_bounds: list[pygame.Rect] = [] # Bounds of each screen-space element, in screen coordinates
+        self._screen_stamps: list[int] = [] # Bounds revision of each screen-space element when its bounds were read
+        self._pointer_elements: list[UIElement] = [] # Elements in view at the last pointer event, topmost first
+        self._held_elements: list[UIElement] = [] # Elements out of view still in the middle of a pointer interaction
+
+    @property
+    def world(self) -> World:
+        """Get the scene's entity-component world, creating it on first use."""
+        if self._world is None:
+            self._world = World()
+        return self._world
 
     def add_ui_element(self, element: UIElement):
         """
@@ -29,6 +72,7 @@ class Scene(ABC):
         :return: The added element.
         """
         self.ui_elements.append(element)
+        self._elements_version += 1
         return element
 
     def remove_ui_element(self, element: UIElement):
@@ -38,10 +82,16 @@ class Scene(ABC):
         """
         if element in self.ui_elements:
             self.ui_elements.remove(element)
+            self._elements_version += 1
+            self._pointer_elements = [] # Removed elements receive no further events
+            self._held_elements = [held for held in self._held_elements if held is not element]
 
     def clear_ui_elements(self):
         """Remove all UI elements from the scene."""
         self.ui_elements.clear()
+        self._elements_version += 1
+        self._pointer_elements = []
+        self._held_elements = []
 
     def find_ui_element(self, predicate: Callable[[UIElement], bool]) -> Optional[UIElement]:
         """
@@ -61,17 +111,130 @@ class Scene(ABC):
 
         Processes events in descending layer order.
         Stops propagation once an event is handled.
+        Mouse presses are only given to elements in view, and motion and releases also reach elements that left the
+        view while hovered or pressed. Positions are converted to world coordinates for elements that follow the
+        camera. The scene manager's event observer, if set, is called with each event after the elements handled it.
         :param events: List of Pygame events to process.
         """
-        sorted_elements = sorted(self.ui_elements, key=lambda elem: elem.layer, reverse=True) # Sort elements in
-        # descending order to handle the events of the top layers first
-
+        sorted_elements = None
+        pointer_elements = None
+        observer = self.engine.scene_manager.event_observer
         for event in events:
-            for element in sorted_elements:
+            pointer = "pos" in event.dict # Pointer events only reach elements in view
+            if pointer:
+                if pointer_elements is None:
+                    visible_world, visible_screen = self._visible_elements()
+                    pointer_elements = visible_screen[::-1] + visible_world[::-1] # Screen space is drawn on top
+                    held_elements = self._update_held_elements(pointer_elements)
+                if held_elements and event.type != pygame.MOUSEBUTTONDOWN: # New presses only hit elements in view
+                    candidates = held_elements + pointer_elements
+                else:
+                    candidates = pointer_elements
+            else:
+                if sorted_elements is None:
+                    sorted_elements = sorted(self.ui_elements, key=lambda elem: elem.layer, reverse=True) # Sort
+                    # elements in descending order to handle the events of the top layers first
+                candidates = sorted_elements
+
+            world_event = None
+            for element in candidates:
                 if not element.enabled: # Skip over this element
                     continue
-                if element.handle_event(event): # Check if the UI element has successfully handled an input event
+                element_event = event
+                if pointer and not element.screen_space: # Camera-space elements expect world coordinates
+                    if world_event is None:
+                        world_event = self._to_world_event(event)
+                    element_event = world_event
+                if element.handle_event(element_event): # Check if the UI element has successfully handled an
+                    # input event
                     break # If handled an event type, stop the propagation
+            if observer is not None:
+                observer(event)
+
+    def _update_held_elements(self, pointer_elements: list[UIElement]) -> list[UIElement]:
+        """
+        Track the elements that left the view while in the middle of a pointer interaction.
+        :param pointer_elements: Elements in view now, topmost first.
+        :return: Elements out of view that still need pointer motion and releases.
+        """
+        in_view = {id(element) for element in pointer_elements}
+        held = [element for element in self._held_elements if id(element) not in in_view and element.holds_pointer()]
+        held.extend(element for element in self._pointer_elements # Only elements that just left the view
+                    if id(element) not in in_view and element.holds_pointer())
+        self._pointer_elements = pointer_elements
+        self._held_elements = held
+        return held
+
+    def _to_world_event(self, event: pygame.event.Event) -> pygame.event.Event:
+        """
+        Convert the position of a pointer event from screen to world coordinates.
+        :param event: Event with a "pos" attribute.
+        :return: A copy of the event with world coordinates.
+        """
+        attributes = dict(event.dict)
+        attributes["pos"] = self.camera.screen_to_world(event.pos)
+        if "rel" in attributes: # Relative motion is scaled by zoom but not offset
+            attributes["rel"] = (event.rel[0] / self.camera.zoom, event.rel[1] / self.camera.zoom)
+        return pygame.event.Event(event.type, attributes)
+
+    def _refresh_bounds(self) -> None:
+        """
+        Bring the sorted element lists and their cached bounds up to date.
+
+        The lists are only sorted again when elements are added, removed, or change layer or screen space. Otherwise
+        only the bounds of elements whose bounds revision changed since they were read are read again.
+        """
+        key = ui_element.revision()
+        if key == self._bounds_key:
+            return None
+        self._bounds_key = key
+
+        order_key = (ui_element.order_revision(), self._elements_version, len(self.ui_elements))
+        if order_key != self._order_key:
+            self._order_key = order_key
+            sorted_elements = sorted(self.ui_elements, key=lambda elem: elem.layer) # Sort elements in ascending
+            # order to render the top layers last
+            self._world_elements = [element for element in sorted_elements if not element.screen_space]
+            self._screen_elements = [element for element in sorted_elements if element.screen_space]
+            self._world_stamps = [element.bounds_revision() for element in self._world_elements]
+            self._screen_stamps = [element.bounds_revision() for element in self._screen_elements]
+            self._world_bounds = [self._bounds_of(element) for element in self._world_elements]
+            self._screen_bounds = [self._bounds_of(element) for element in self._screen_elements]
+            return None
+
+        self._refresh_changed(self._world_elements, self._world_bounds, self._world_stamps)
+        self._refresh_changed(self._screen_elements, self._screen_bounds, self._screen_stamps)
+
+    def _refresh_changed(self, elements: list[UIElement], bounds: list[pygame.Rect], stamps: list[int]) -> None:
+        """
+        Read the bounds of the elements that changed since their bounds were last read.
+        :param elements: Elements in ascending layer order.
+        :param bounds: Cached bounds of each element, updated in place.
+        :param stamps: Bounds revision of each element when its bounds were read, updated in place.
+        """
+        for index, element in enumerate(elements):
+            stamp = element.bounds_revision()
+            if stamp != stamps[index]:
+                stamps[index] = stamp
+                bounds[index] = self._bounds_of(element)
+
+    @staticmethod
+    def _bounds_of(element: UIElement) -> pygame.Rect:
+        """Get the bounds an element is culled by."""
+        rect = element.get_rect()
+        return rect if rect.width > 0 and rect.height > 0 else _UNBOUNDED
+
+    def _visible_elements(self) -> tuple[list[UIElement], list[UIElement]]:
+        """
+        Get the elements that intersect the view, in ascending layer order.
+        :return: Visible camera-space elements, and visible screen-space elements.
+        """
+        self._refresh_bounds()
+        view = self.camera.get_view_rect()
+        screen = pygame.Rect(0, 0, self.camera.width, self.camera.height)
+        world_elements, screen_elements = self._world_elements, self._screen_elements
+        return ([world_elements[index] for index in view.collidelistall(self._world_bounds)],
+                [screen_elements[index] for index in screen.collidelistall(self._screen_bounds)])
 
     @abstractmethod
     def update(self, dt: float) -> None:
@@ -79,21 +242,143 @@ class Scene(ABC):
         Update the scene's logic and UI elements.
         :param dt: Delta time in seconds since last frame.
         """
+        if self._world is not None: # Gameplay systems run before the UI that may display their results
+            self._world.update(dt)
+        self.animations.step(dt) # Advance every managed tween before elements read their values
         for element in self.ui_elements:
             element.update(dt)
 
     @abstractmethod
-    def render(self) -> None:
+    def render(self, screen: pygame.Surface) -> None:
         """
         Render the scene and its UI elements.
 
-        Renders elements in ascending layer order.
+        Gameplay render systems draw first, then elements are rendered on top in ascending layer order, skipping those
+        outside the camera's view. Camera-space elements are drawn through the camera, then screen-space elements are
+        drawn over them. When batch rendering is enabled, elements emit draw commands which are submitted with a
+        single blits call.
+        :param screen: Surface to render onto. When it is smaller than the camera's screen area, as during dynamic
+            resolution scaling, everything is drawn scaled down to fit it. When it is the canvas of the engine's
+            texture renderer, everything is drawn through the renderer. While the engine's frame pipeline is
+            capturing, elements are recorded into its snapshot instead of drawn.
         """
-        sorted_elements = sorted(self.ui_elements, key=lambda elem: elem.layer) # Sort elements in ascending order to
-        # render the top layers last
+        visible_world, visible_screen = self._visible_elements()
+        renderer = self.engine.renderer
+        if renderer is not None and screen is renderer.canvas:
+            self._render_textures(renderer.draw_list, visible_world, visible_screen)
+            return None
+        pipeline = self.engine.pipeline
+        if pipeline is not None and pipeline.capturing:
+            self._capture(pipeline.draw_list, visible_world, visible_screen)
+            return None
 
-        for element in sorted_elements:
-            element.render(self.engine.screen)
+        scale = screen.get_width() / self.camera.width
+        if scale == 1.0:
+            self._scaled_draw_list = None # Release the scaled copies once back at full resolution
+        elif self._scaled_draw_list is None:
+            self._scaled_draw_list = ScaledDrawList(screen, scale)
+        view = self.camera.view_surface(screen)
+        view_scale = scale if view is screen else 1.0 # Zoomed views are drawn at full resolution, then scaled
+        origin = self.camera.origin
+
+        if self._world is not None:
+            if view_scale != 1.0:
+                self._scaled_draw_list.set_scale(view, view_scale)
+                self._scaled_draw_list.draw_direct(self._world.render, origin)
+            else:
+                self._world.render(view, origin)
+        self._draw_elements(visible_world, view, origin, view_scale)
+        self.camera.present(view, screen)
+        self._draw_elements(visible_screen, screen, (0, 0), scale)
+        if self._scaled_draw_list is not None:
+            self._scaled_draw_list.end_frame()
+
+    def _draw_elements(self, elements: list[UIElement], target: pygame.Surface, origin: tuple[int, int],
+                       scale: float = 1.0) -> None:
+        """
+        Draw elements onto a target surface.
+        :param elements: Elements in draw order.
+        :param target: Surface to draw onto.
+        :param origin: World position that maps to the top-left corner of the target.
+        :param scale: Size of the target relative to the coordinates elements are positioned in.
+        """
+        if not elements:
+            return None
+        if scale != 1.0: # Reduced resolution always goes through draw commands, which are scaled on submission
+            self._scaled_draw_list.set_scale(target, scale)
+            self._emit_tracked(elements, self._scaled_draw_list, origin)
+            return None
+        if not self.batch_rendering:
+            for element in elements:
+                element.render(target, origin)
+            return None
+
+        if self._draw_list is None:
+            self._draw_list = DrawList(target)
+        self._draw_list.target = target # Keep the target in sync with the surface being drawn to
+
+        for element in elements:
+            element.emit_draw_commands(self._draw_list, origin)
+        self._draw_list.flush()
+
+    def _render_textures(self, draw_list: TextureDrawList, visible_world: list[UIElement],
+                         visible_screen: list[UIElement]) -> None:
+        """
+        Draw the scene through a texture renderer, scaling camera-space content by the camera zoom while drawing.
+        :param draw_list: Draw list of the texture renderer.
+        :param visible_world: Visible camera-space elements in draw order.
+        :param visible_screen: Visible screen-space elements in draw order.
+        """
+        origin = self.camera.origin
+        draw_list.set_scale(self.camera.zoom)
+        if self._world is not None:
+            draw_list.draw_direct(self._world.render, origin)
+        self._emit_tracked(visible_world, draw_list, origin)
+        draw_list.set_scale(1.0)
+        self._emit_tracked(visible_screen, draw_list, (0, 0))
+
+    def _capture(self, draw_list: SnapshotDrawList, visible_world: list[UIElement],
+                 visible_screen: list[UIElement]) -> None:
+        """
+        Record the scene into a frame snapshot. A zoomed world is drawn and scaled while capturing.
+        :param draw_list: Draw list of the frame pipeline.
+        :param visible_world: Visible camera-space elements in draw order.
+        :param visible_screen: Visible screen-space elements in draw order.
+        """
+        origin = self.camera.origin
+        if self.camera.zoom == 1.0:
+            if self._world is not None:
+                draw_list.draw_direct(self._world.render, origin)
+            self._emit_tracked(visible_world, draw_list, origin)
+        else:
+            target = draw_list.target
+            view = self.camera.view_surface(target)
+            if self._world is not None:
+                self._world.render(view, origin)
+            self._draw_elements(visible_world, view, origin)
+            self.camera.present(view, target)
+        self._emit_tracked(visible_screen, draw_list, (0, 0))
+
+    @staticmethod
+    def _emit_tracked(elements: list[UIElement], draw_list: Union[ScaledDrawList, TextureDrawList, SnapshotDrawList],
+                      origin: tuple[int, int]) -> None:
+        """
+        Draw elements through a draw list that keeps derived surfaces or textures per element.
+        :param elements: Elements in draw order.
+        :param draw_list: Draw list to emit the elements' commands onto.
+        :param origin: World position that maps to the top-left corner of the target.
+        """
+        for element in elements:
+            draw_list.begin_element(id(element), element.appearance_revision())
+            element.emit_draw_commands(draw_list, origin)
+        draw_list.flush()
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """
+        Iterate over the surfaces held by the scene itself, not including those of its UI elements.
+        :return: Iterator over the surfaces.
+        """
+        yield from self.camera.iter_surfaces()
 
     def on_enter(self, previous_scene: Optional["Scene"], data: Optional[Dict[str, Any]] = None) -> None:
         """
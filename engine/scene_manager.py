@@ -5,9 +5,10 @@ The SceneManager handles pushing, popping, and replacing scenes,
 delegating events, updates, and rendering to the active scenes.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import pygame.event
 
+from engine.rendering.transform_service import poll_transforms
 from engine.scene import Scene
 from engine.scene_registry import get_scene_class
 
@@ -21,6 +22,27 @@ class SceneManager:
         """
         self.engine = engine
         self._stack: list[Scene] = []
+        self._drop_listeners: list[Callable[[Scene], None]] = [] # Called with every scene removed from the stack
+        self.event_observer: Optional[Callable[[pygame.event.Event], None]] = None # Called with each event once the
+        # elements of the current scene have handled it
+
+    def add_drop_listener(self, listener: Callable[[Scene], None]) -> None:
+        """
+        Register a function to call whenever a scene is removed from the stack.
+        :param listener: Function called with the removed scene.
+        """
+        self._drop_listeners.append(listener)
+
+    def remove_drop_listener(self, listener: Callable[[Scene], None]) -> None:
+        """Unregister a function registered with add_drop_listener."""
+        if listener in self._drop_listeners:
+            self._drop_listeners.remove(listener)
+
+    def _notify_dropped(self, scenes: list[Scene]) -> None:
+        """Call every drop listener for each removed scene."""
+        for scene in scenes:
+            for listener in self._drop_listeners:
+                listener(scene)
 
     @property
     def current_scene(self) -> Optional[Scene]:
@@ -39,9 +61,11 @@ class SceneManager:
         :param data: Optional data to pass to the new scene.
         """
         # Exit all current scenes
+        dropped = list(self._stack)
         self._stack.clear()
 
         self.push_scene(scene_name, data)
+        self._notify_dropped(dropped)
 
     def push_scene(self, scene_name: str, data: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -69,6 +93,13 @@ class SceneManager:
         next_top = self.current_scene
         if next_top:
             next_top.on_resume(popped)
+        self._notify_dropped([popped])
+
+    def clear(self) -> None:
+        """Remove every scene from the stack, such as when the engine shuts down."""
+        dropped = list(self._stack)
+        self._stack.clear()
+        self._notify_dropped(dropped)
 
     def handle_events(self, events: list[pygame.event.Event]) -> None:
         """
@@ -83,10 +114,15 @@ class SceneManager:
         Delegate update to the current scene.
         :param dt: Delta time in seconds since the last frame.
         """
+        poll_transforms() # Hand finished background transforms back to their elements, in every scene
         if self.current_scene:
             self.current_scene.update(dt)
 
-    def render(self) -> None:
-        """Delegate rendering to the current scene in stack order."""
+    def render(self, target: Optional[pygame.Surface] = None) -> None:
+        """
+        Delegate rendering to the current scene in stack order.
+        :param target: Surface to render onto. Defaults to the engine's screen.
+        """
+        target = self.engine.screen if target is None else target
         for scene in self._stack:
-            scene.render()
+            scene.render(target)
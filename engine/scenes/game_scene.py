@@ -1,7 +1,10 @@
 from typing import Optional, Dict, Any
 
+import numpy as np
 import pygame.event
 
+from engine.effects.particles import ParticleEmitter
+from engine.gameplay.tilemap import TileMap, Tileset
 from engine.scene import Scene
 from engine.scene_registry import register_scene
 from engine.user_interface.button import Button
@@ -15,7 +18,9 @@ class GameScene(Scene):
     def __init__(self, engine: "GameEngine"):
         super().__init__(engine)
 
+        self._setup_level()
         self._setup_images()
+        self._setup_effects()
 
     def handle_events(self, events: list[pygame.event.Event]) -> None:
         super().handle_events(events)
@@ -23,17 +28,35 @@ class GameScene(Scene):
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 # ESC to pause
                 self.engine.scene_manager.push_scene("pause_menu")
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.sparks.burst(400, *self.camera.screen_to_world(event.pos)) # Shower of sparks wherever the
+                # player clicks
 
     def update(self, dt: float) -> None:
         super().update(dt)
 
-    def render(self) -> None:
-        self.engine.screen.fill((165, 185, 198))
-        super().render()
+    def render(self, screen: pygame.Surface) -> None:
+        screen.fill((165, 185, 198))
+        super().render(screen)
 
     def on_enter(self, previous_scene: Optional["Scene"], data: Optional[Dict[str, Any]] = None) -> None:
         print(f"Entering Main Menu from {previous_scene.__class__.__name__ if previous_scene else 'startup'}")
 
+    def _setup_level(self):
+        tile_size = 32
+        colours = [(96, 152, 72), (84, 138, 64), (128, 128, 120), (64, 112, 176)] # Grass, dark grass, stone, water
+        tiles = []
+        for colour in colours:
+            tile = pygame.Surface((tile_size, tile_size)).convert()
+            tile.fill(colour)
+            pygame.draw.rect(tile, [channel * 0.85 for channel in colour], tile.get_rect(), 1) # Subtle grid lines
+            tiles.append(tile)
+
+        rng = np.random.default_rng(7) # Fixed seed so the placeholder level is the same every run
+        ground = rng.choice(np.arange(1, len(colours) + 1, dtype=np.uint16), size=(256, 256), p=[0.6, 0.3, 0.07, 0.03])
+        self.level = TileMap(x=0, y=0, tileset=Tileset(tiles, tile_size), layers=[ground], layer=-1)
+        self.add_ui_element(self.level)
+
     def _setup_images(self):
         image = Image(
             x=self.engine.screen.get_width() // 2,
@@ -43,3 +66,19 @@ class GameScene(Scene):
         )
         self.add_ui_element(image)
 
+    def _setup_effects(self):
+        self.sparks = ParticleEmitter(
+            x=0,
+            y=0,
+            life=(0.4, 1.2),
+            speed=(80.0, 320.0),
+            gravity=(0.0, 600.0),
+            drag=0.8,
+            start_colour=(255, 220, 120),
+            end_colour=(200, 40, 0),
+            colour_variance=30,
+            size=2,
+            layer=1,
+            seed=11 # Fixed seed so recorded sessions replay identically
+        )
+        self.add_ui_element(self.sparks)
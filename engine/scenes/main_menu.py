@@ -14,6 +14,7 @@ class MainMenuScene(Scene):
     """Main Menu scene."""
     def __init__(self, engine: "GameEngine"):
         super().__init__(engine)
+        self.batch_rendering = True
 
         self._setup_title()
         self._setup_images()
@@ -29,9 +30,9 @@ class MainMenuScene(Scene):
     def update(self, dt: float) -> None:
         super().update(dt)
 
-    def render(self) -> None:
-        self.engine.screen.fill((50, 50, 50))
-        super().render()
+    def render(self, screen: pygame.Surface) -> None:
+        screen.fill((50, 50, 50))
+        super().render(screen)
 
     def on_enter(self, previous_scene: Optional["Scene"], data: Optional[Dict[str, Any]] = None) -> None:
         print(f"Entering Main Menu from {previous_scene.__class__.__name__ if previous_scene else 'startup'}")
@@ -90,6 +91,7 @@ class MainMenuScene(Scene):
                 expanded_width=expanded,
                 expansion_duration=0.18,
                 expansion_ease="ease_out",
+                animation_manager=self.animations,
             )
             self.add_ui_element(button)
             return button
@@ -14,6 +14,7 @@ class PauseMenuScene(Scene):
     """Pause Menu overlay with left-anchored expanding buttons."""
     def __init__(self, engine: "GameEngine"):
         super().__init__(engine)
+        self.batch_rendering = True
 
         self._setup_overlay()
         self._setup_title()
@@ -29,9 +30,9 @@ class PauseMenuScene(Scene):
     def update(self, dt: float) -> None:
         super().update(dt)
 
-    def render(self) -> None:
+    def render(self, screen: pygame.Surface) -> None:
         # Don't clear with fill(). Render on top of game
-        super().render()
+        super().render(screen)
 
     def on_enter(self, previous_scene: Optional["Scene"], data: Optional[Dict[str, Any]] = None) -> None:
         print("Pause menu opened")
@@ -93,6 +94,7 @@ class PauseMenuScene(Scene):
                 expanded_width=expanded,
                 expansion_duration=0.18,
                 expansion_ease="ease_out",
+                animation_manager=self.animations,
             )
             self.add_ui_element(button)
             return button
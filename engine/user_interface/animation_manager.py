@@ -0,0 +1,156 @@
+"""
+Vectorised animation manager for advancing many tweens at once.
+
+The AnimationManager stores the state of every active tween in NumPy arrays and advances all of them in a single
+vectorised step per frame, instead of ticking each Tween object through Python method calls. Completion callbacks
+are the only per-tween Python work, and only run on the frame a tween finishes.
+"""
+from typing import Optional, Callable, Union
+
+import numpy as np
+
+from engine.user_interface import easing
+
+
+class AnimationManager:
+    """
+    Holds tween state in arrays and advances all running tweens together.
+
+    Example:
+        manager = AnimationManager()
+        t = Tween(0.0, manager=manager)
+        t.to(1.0, duration=0.5, ease="ease_out")
+        manager.step(dt)  # call once every frame
+    """
+    def __init__(self, capacity: int = 64):
+        """
+        Initialise the manager with room for a number of tweens.
+        :param capacity: Initial number of tween slots. Grows automatically when exceeded.
+        """
+        capacity = max(1, int(capacity))
+        self._start = np.zeros(capacity, dtype=np.float64) # Value at the beginning of each animation
+        self._target = np.zeros(capacity, dtype=np.float64) # Value at the end of each animation
+        self._current = np.zeros(capacity, dtype=np.float64) # Latest interpolated value
+        self._elapsed = np.zeros(capacity, dtype=np.float64) # Seconds since each animation started
+        self._duration = np.ones(capacity, dtype=np.float64) # Total seconds of each animation
+        self._ease = np.zeros(capacity, dtype=np.int32) # Easing function id of each animation
+        self._running = np.zeros(capacity, dtype=bool) # Whether each slot is currently animating
+        self._callbacks: list[Optional[Callable[[], None]]] = [None] * capacity # Completion callbacks by slot
+        self._free: list[int] = list(range(capacity - 1, -1, -1)) # Unused slots, lowest index popped first
+        self._tables: Optional[np.ndarray] = None # Easing lookup tables stacked into one array, by easing id
+        self._tables_revision = -1 # Easing revision the stacked tables were built from
+
+    def __len__(self) -> int:
+        """Get the number of allocated tween slots."""
+        return len(self._callbacks) - len(self._free)
+
+    def _grow(self) -> None:
+        """Double the capacity of every state array."""
+        old = len(self._callbacks)
+        new = old * 2
+        for name in ("_start", "_target", "_current", "_elapsed", "_duration", "_ease", "_running"):
+            array = getattr(self, name)
+            grown = np.ones(new, dtype=array.dtype) if name == "_duration" else np.zeros(new, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._callbacks.extend([None] * old)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def allocate(self, initial: float = 0.0) -> int:
+        """
+        Reserve a slot for a tween.
+        :param initial: Starting value of the slot.
+        :return: Slot index used to address the tween.
+        """
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._start[slot] = self._target[slot] = self._current[slot] = float(initial)
+        self._elapsed[slot] = 0.0
+        self._running[slot] = False
+        return slot
+
+    def release(self, slot: int) -> None:
+        """
+        Return a slot to the manager so it can be reused.
+        :param slot: Slot index returned by allocate.
+        """
+        self._running[slot] = False
+        self._callbacks[slot] = None
+        self._free.append(slot)
+
+    def start(self, slot: int, target: float, duration: float, ease: Union[str, int] = "linear",
+              on_complete: Optional[Callable[[], None]] = None) -> None:
+        """
+        Start animating a slot from its current value.
+
+        :param slot: Slot index to animate.
+        :param target: Target value to reach.
+        :param duration: Time in seconds to complete the animation.
+        :param ease: Easing function name or id.
+        :param on_complete: Optional function called once the target is reached.
+        """
+        self._start[slot] = self._current[slot]
+        self._target[slot] = float(target)
+        self._duration[slot] = max(0.0001, float(duration))
+        self._elapsed[slot] = 0.0
+        self._ease[slot] = easing.get_ease_id(ease) # Unknown easings fall back to linear
+        self._running[slot] = True
+        self._callbacks[slot] = on_complete
+
+    def stop(self, slot: int) -> None:
+        """Stop animating a slot, keeping its current value."""
+        self._running[slot] = False
+        self._callbacks[slot] = None
+
+    def value(self, slot: int) -> float:
+        """Get the current value of a slot."""
+        return float(self._current[slot])
+
+    def is_running(self, slot: int) -> bool:
+        """Check if a slot is currently animating."""
+        return bool(self._running[slot])
+
+    def step(self, dt: float) -> None:
+        """
+        Advance every running animation by delta time.
+        :param dt: Time since last update in seconds.
+        """
+        active = np.flatnonzero(self._running)
+        if active.size == 0:
+            return None
+
+        elapsed = self._elapsed[active] + max(0.0, dt)
+        self._elapsed[active] = elapsed
+        t = np.minimum(1.0, elapsed / self._duration[active])
+        eased = self._apply_ease(t, self._ease[active])
+        start = self._start[active]
+        self._current[active] = start + (self._target[active] - start) * eased
+
+        finished = active[t >= 1.0]
+        if finished.size == 0:
+            return None
+        self._running[finished] = False
+        for slot in finished.tolist(): # Only completed animations cost a Python call
+            callback = self._callbacks[slot]
+            self._callbacks[slot] = None
+            if callback is not None:
+                callback()
+
+    def _apply_ease(self, t: np.ndarray, ease: np.ndarray) -> np.ndarray:
+        """
+        Apply easing functions to an array of normalised time values through their lookup tables.
+
+        :param t: Normalised times (0.0 to 1.0).
+        :param ease: Easing function id for each time value.
+        :return: Eased time values.
+        """
+        if self._tables_revision != easing.revision(): # Restack when easings are registered or replaced
+            self._tables = np.array(easing.lookup_tables(), dtype=np.float64)
+            self._tables_revision = easing.revision()
+
+        position = t * easing.LUT_SIZE
+        index = np.minimum(position.astype(np.intp), easing.LUT_SIZE - 1)
+        low = self._tables[ease, index]
+        high = self._tables[ease, index + 1]
+        return low + (high - low) * (position - index)
@@ -1,10 +1,17 @@
 """
 Simple tweening system for animating float values with easing functions.
 
-The Tween class interpolates a value over time using common easing curves, making it useful for UI animations
-like button expansion, fade effects.
+The Tween class interpolates a value over time using the easing curves in engine.user_interface.easing, making it
+useful for UI animations like button expansion, fade effects. Tweens can optionally be backed by an AnimationManager,
+which advances all of its tweens together in one vectorised step per frame.
 """
-import math
+import weakref
+from typing import Optional, Callable, Union, TYPE_CHECKING
+
+from engine.user_interface import easing
+
+if TYPE_CHECKING:
+    from engine.user_interface.animation_manager import AnimationManager
 
 
 class Tween:
@@ -16,75 +23,83 @@ class Tween:
         t.to(1.0, duration=0.5, ease="ease_out")
         value = t.update(dt)  # call every frame
     """
-    def __init__(self, initial: float = 0.0):
+    __slots__ = ("_current", "_start", "_target", "_elapsed", "_duration", "_ease_id", "_running", "_on_complete",
+                 "_manager", "_slot", "__weakref__")
+
+    def __init__(self, initial: float = 0.0, manager: Optional["AnimationManager"] = None):
         """
         Initialise the tween with a starting value.
         :param initial: Starting value.
+        :param manager: Optional animation manager that advances this tween instead of update().
         """
         self._current = float(initial)
         self._start = float(initial)
         self._target = float(initial)
         self._elapsed = 0.0
         self._duration = 0.0
-        self._ease = "linear"
+        self._ease_id = easing.get_ease_id("linear")
         self._running = False
+        self._on_complete: Optional[Callable[[], None]] = None
+        self._manager = manager
+        self._slot: Optional[int] = None # Slot in the manager's arrays holding this tween's state
+        if manager is not None:
+            self._slot = manager.allocate(initial)
+            weakref.finalize(self, manager.release, self._slot) # Free the slot once the tween is discarded
 
     @property
     def current(self) -> float:
         """Get the current interpolated value."""
+        if self._manager is not None:
+            return self._manager.value(self._slot)
         return self._current
 
-    def to(self, target: float, duration: float, ease: str = "linear") -> None:
+    def to(self, target: float, duration: float, ease: Union[str, int] = "linear",
+           on_complete: Optional[Callable[[], None]] = None) -> None:
         """
         Start a new tween animation.
 
         :param target: Target value to reach.
         :param duration: Time in seconds to complete the tween.
-        :param ease: Easing function name.
+        :param ease: Easing function name or id.
+        :param on_complete: Optional function called once the target is reached.
         """
+        if self._manager is not None:
+            self._manager.start(self._slot, target, duration, ease, on_complete)
+            return None
         self._start = self._current
         self._target = float(target)
         self._duration = max(0.0001, float(duration))
         self._elapsed = 0.0
-        self._ease = ease
+        self._ease_id = easing.get_ease_id(ease) # Resolve the name once rather than on every update
         self._running = True
+        self._on_complete = on_complete
 
     def update(self, dt: float) -> float:
         """
         Advance the tween by delta time and return the current value.
 
+        Tweens backed by an animation manager are advanced by the manager, so this only returns the current value.
         :param dt: Time since last update in seconds.
         :return: Current interpolated value.
         """
+        if self._manager is not None:
+            return self._manager.value(self._slot)
         if not self._running:
             return self._current
         self._elapsed += max(0.0, dt)
         t = min(1.0, self._elapsed / self._duration)
-        eased = self._apply_ease(t, self._ease)
+        eased = easing.evaluate(self._ease_id, t)
         self._current = self._start + (self._target - self._start) * eased
         if t >= 1.0:
             self._running = False
+            on_complete, self._on_complete = self._on_complete, None
+            if on_complete is not None:
+                on_complete()
         return self._current
 
     def is_running(self) -> bool:
         """Check if the tween is currently active."""
+        if self._manager is not None:
+            return self._manager.is_running(self._slot)
         return self._running
 
-    @staticmethod
-    def _apply_ease(t: float, ease: str) -> float:
-        """
-        Apply an easing function to a normalised time value.
-
-        :param t: Normalised time (0.0 to 1.0).
-        :param ease: Name of easing function.
-        :return: Eased time value.
-        """
-        if ease == "linear":
-            return t
-        if ease == "ease_in":
-            return t * t
-        if ease == "ease_out":
-            return 1 - (1 - t) * (1 - t)
-        if ease == "ease_in_out":
-            return 0.5 * (1 - math.cos(math.pi * t))
-        return t
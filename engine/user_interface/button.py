@@ -3,11 +3,23 @@ Interactive button UI element with visual states, optional image support, and ho
 
 The Button class combines a background (colour or image), optional border, and centered or padded text.
 It supports three interaction states: normal, hover, and pressed.
+State images are resized to the button's current width, and recent sizes are cached. With deferred scaling, resizes
+run on the transform service's worker threads, and an unfiltered resize of the same image is drawn until the filtered
+one is ready.
+Under frame-time pressure the quality governor makes buttons resize without filtering and skip the hover tint, and
+they redraw at full quality once it recovers.
 """
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator
 
 import pygame
 
+from engine.assets.atlas import TextureAtlas
+from engine.assets.bundle import find_image
+from engine.rendering import quality
+from engine.rendering.draw_list import DrawList
+from engine.rendering.surface_cache import SurfaceCache
+from engine.rendering.transform_service import get_transform_service
+from engine.user_interface.animation_manager import AnimationManager
 from engine.user_interface.animator import Tween
 from engine.user_interface.image import Image
 from engine.user_interface.panel import Panel
@@ -17,6 +29,13 @@ from engine.user_interface.ui_element import UIElement
 
 class Button(UIElement):
     """An interactive and animated button UI element."""
+    __slots__ = ("base_width", "height", "centre_surface", "on_click", "normal_colour", "hover_colour",
+                 "pressed_colour", "current_colour", "normal_image", "hover_image", "pressed_image", "border_colour",
+                 "border_width", "border_radius", "hover_tint", "padding", "is_hovered", "is_pressed", "_disabled",
+                 "expand_on_hover", "expanded_width", "_current_width", "_expand_tween", "_expand_progress",
+                 "_expansion_duration", "_expansion_ease", "panel", "text_element", "deferred_scaling",
+                 "_scaled_images", "_pending_scale")
+
     def __init__(self, x: int, y: int,
                  width: int,
                  height: int,
@@ -43,6 +62,12 @@ class Button(UIElement):
                  expansion_duration: float = 0.2,
                  expansion_ease: str = "ease_out",
                  element_id: Optional[str] = None,
+                 animation_manager: Optional[AnimationManager] = None,
+                 atlas: Optional[TextureAtlas] = None,
+                 normal_image_region: Optional[str] = None,
+                 hover_image_region: Optional[str] = None,
+                 pressed_image_region: Optional[str] = None,
+                 deferred_scaling: bool = False,
                  ):
         """
         Initialise a fully interactive button.
@@ -74,6 +99,13 @@ class Button(UIElement):
         :param expansion_duration: Seconds for expand/retract animation.
         :param expansion_ease: Easing name for expansion tween.
         :param element_id: Optional identifier.
+        :param animation_manager: Optional animation manager that advances the expansion tween.
+        :param atlas: Optional texture atlas holding the state images.
+        :param normal_image_region: Optional atlas region name for normal state background.
+        :param hover_image_region: Optional atlas region name for hover state background.
+        :param pressed_image_region: Optional atlas region name for pressed state background.
+        :param deferred_scaling: Whether to resize state images on worker threads, showing an unfiltered resize until
+            the filtered one is ready.
         """
         super().__init__(x, y, layer, element_id)
         self.base_width = int(width)
@@ -86,9 +118,12 @@ class Button(UIElement):
         self.pressed_colour = pressed_colour  # Colour for the button surface when button is pressed
         self.current_colour = normal_colour  # Set default colour of the surface to the normal colour
 
-        self.normal_image = pygame.image.load(normal_image_path).convert_alpha() if normal_image_path else None
-        self.hover_image = pygame.image.load(hover_image_path).convert_alpha() if hover_image_path else None
-        self.pressed_image = pygame.image.load(pressed_image_path).convert_alpha() if pressed_image_path else None
+        self.normal_image = self._load_state_image(normal_image_path, atlas, normal_image_region)
+        self.hover_image = self._load_state_image(hover_image_path, atlas, hover_image_region)
+        self.pressed_image = self._load_state_image(pressed_image_path, atlas, pressed_image_region)
+        self.deferred_scaling = deferred_scaling
+        self._scaled_images = SurfaceCache(4) # Resized state images, by image and size
+        self._pending_scale: Optional[tuple] = None # Image and size being resized on a worker thread
 
         self.border_colour = border_colour
         self.border_width = border_width
@@ -103,16 +138,17 @@ class Button(UIElement):
         self.expand_on_hover = expand_on_hover
         self.expanded_width = int(expanded_width) if expanded_width else self.base_width
         self._current_width = float(self.base_width)
-        self._expand_tween = Tween(0.0)  # 0.0 = collapsed, 1.0 = expanded
+        self._expand_tween = Tween(0.0, animation_manager)  # 0.0 = collapsed, 1.0 = expanded
+        self._expand_progress = 0.0 # Tween value the current width was last calculated from
         self._expansion_duration = float(expansion_duration)
         self._expansion_ease = expansion_ease
 
-        if self.centre_surface: # Calculate the actual top-left position for the panel to pass
-            panel_x = x - self.base_width // 2
-            panel_y = y - self.height // 2
+        if self.centre_surface: # Calculate the top-left position of the panel relative to the button's position
+            panel_x = -(self.base_width // 2)
+            panel_y = -(self.height // 2)
         else:
-            panel_x = x
-            panel_y = y
+            panel_x = 0
+            panel_y = 0
 
         self.panel = Panel(
             x=panel_x,
@@ -123,8 +159,10 @@ class Button(UIElement):
             layer=layer,
             border_colour=self.border_colour,
             border_width=self.border_width,
-            border_radius=self.border_radius
+            border_radius=self.border_radius,
+            per_pixel_alpha=self._needs_per_pixel_alpha() # Images and tints are blended onto the panel surface
         )
+        self.add_child(self.panel) # The panel follows the button whenever it moves
 
         # Create and add text
         self.text_element = Text(
@@ -143,12 +181,24 @@ class Button(UIElement):
                                self.base_width // 2 if centre_text else self.padding,
                                self.height // 2 if centre_text else self.padding)
 
-        # Fixed hitbox defines interaction regardless of visual expansion
-        # Always equal to the base size at panel's position
-        self.set_hitbox_rect(pygame.Rect(self.panel.x, self.panel.y, self.base_width, self.height))
-
         self._redraw_background()
 
+    @staticmethod
+    def _load_state_image(path: Optional[str], atlas: Optional[TextureAtlas],
+                          region: Optional[str]) -> Optional[pygame.Surface]:
+        """
+        Load a state background image from an atlas region or a file.
+        :param path: Optional file path of the image.
+        :param atlas: Optional atlas holding the image.
+        :param region: Optional name of the image's atlas region, preferred over the file path.
+        :return: The image surface, or None if neither source is given.
+        """
+        if atlas is not None and region is not None:
+            return atlas.get_surface(region) # Shares the atlas page pixels
+        if path:
+            return find_image(path) or pygame.image.load(path).convert_alpha() # Prefer pre-decoded bundle pixels
+        return None
+
     def set_text(self, text: str):
         """Update the button's label."""
         self.text_element.set_text(text)
@@ -185,6 +235,9 @@ class Button(UIElement):
         self.normal_image = normal
         self.hover_image = hover
         self.pressed_image = pressed
+        self._scaled_images.clear()
+        self._pending_scale = None # Results for the previous images are discarded
+        self.panel.set_per_pixel_alpha(self._needs_per_pixel_alpha())
         self._redraw_background()
 
     def set_expand_behaviour(self, enabled: bool, expanded_width: Optional[int] = None,
@@ -198,6 +251,11 @@ class Button(UIElement):
         if ease is not None:
             self._expansion_ease = ease
 
+    def _needs_per_pixel_alpha(self) -> bool:
+        """Check if translucent content is drawn onto the panel surface."""
+        return (self.hover_tint is not None or self.normal_image is not None
+                or self.hover_image is not None or self.pressed_image is not None)
+
     def _state_image(self) -> Optional[pygame.Surface]:
         """Get the appropriate background image for the current state."""
         if self.is_pressed and self.pressed_image is not None:
@@ -214,23 +272,68 @@ class Button(UIElement):
             return self.hover_colour
         return self.normal_colour
 
+    def _scaled_state_image(self, image: pygame.Surface, size: tuple[int, int]) -> pygame.Surface:
+        """
+        Get a state image resized to the button's current size.
+        :param image: State image.
+        :param size: Size to resize to.
+        :return: The resized image, or with deferred scaling an unfiltered resize of it while the filtered resize runs.
+        """
+        if image.get_size() == size:
+            return image
+        smooth = quality.smooth_scaling()
+        if not smooth:
+            quality.watch_recovery(self)
+        key = (id(image), size, smooth)
+        scaled = self._scaled_images.get(key)
+        if scaled is not None:
+            return scaled
+        scaler = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        if not self.deferred_scaling or not smooth: # Unfiltered resizes are cheap enough to run now
+            scaled = scaler(image, size)
+            self._scaled_images.put(key, scaled)
+            return scaled
+
+        if self._pending_scale is None: # One resize at a time, the latest size is requested once it finishes
+            self._pending_scale = key
+            get_transform_service().submit(scaler, image, size,
+                                           callback=lambda result: self._scale_finished(key, result))
+        return pygame.transform.scale(image, size) # Placeholder of the same state at the new size, so the panel
+        # is always filled and never shows another state's image
+
+    def _scale_finished(self, key: tuple, scaled: pygame.Surface) -> None:
+        """Store a state image resized on a worker thread and redraw with it."""
+        if self._pending_scale != key: # The images were replaced while resizing
+            return None
+        self._pending_scale = None
+        self._scaled_images.put(key, scaled)
+        self._redraw_background()
+
     def _redraw_background(self):
         """Redraw the button panel based on current state and size."""
         self.panel.set_size(int(self._current_width), self.height) # Set panel size to current width
 
         image = self._state_image() # Base fill
         if image is not None:
-            scaled_image = pygame.transform.smoothscale(image, (int(self._current_width), self.height))
+            scaled_image = self._scaled_state_image(image, (int(self._current_width), self.height))
             self.panel.surface.blit(scaled_image, (0, 0))
         else:
             self.panel.set_bg_colour(self._state_colour())
 
-        if self.is_hovered and self.hover_tint is not None: # Optional hover tint on top
+        if self.is_hovered and self.hover_tint is not None and not quality.hover_tint():
+            quality.watch_recovery(self) # Skipped under frame-time pressure, drawn again once quality recovers
+        elif self.is_hovered and self.hover_tint is not None: # Optional hover tint on top
             tint_surface = pygame.Surface((int(self._current_width), self.height), pygame.SRCALPHA)
             r, g, b = self.hover_tint
             tint_surface.fill((r, g, b, 60))
             self.panel.surface.blit(tint_surface, (0, 0))
 
+        self.panel.invalidate() # The panel surface was drawn into directly
+
+    def restore_quality(self) -> None:
+        """Redraw at the current quality level, after the quality governor raised it."""
+        self._redraw_background()
+
     def _layout_text(self):
         """Reposition text based on current visual width and alignment."""
         width = int(self._current_width)
@@ -251,12 +354,22 @@ class Button(UIElement):
             self.text_element.y = text_y
 
     def _button_hitbox_rect(self) -> pygame.Rect:
-        """Return the fixed interaction area (base size)."""
-        return pygame.Rect(self.panel.x, self.panel.y, self.base_width, self.height)
+        """Return the fixed interaction area (base size) in screen coordinates."""
+        return pygame.Rect(*self.panel.get_world_position(), self.base_width, self.height)
 
     def _visual_rect(self) -> pygame.Rect:
-        """Return the current visual bounds (can be expanded)."""
-        return pygame.Rect(self.panel.x, self.panel.y, int(self._current_width), self.height)
+        """Return the current visual bounds (can be expanded) in screen coordinates."""
+        return pygame.Rect(*self.panel.get_world_position(), int(self._current_width), self.height)
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """
+        Iterate over the state images and their resized versions. The panel and text are children, so they are
+        accounted for separately.
+        """
+        for image in (self.normal_image, self.hover_image, self.pressed_image):
+            if image is not None:
+                yield image
+        yield from self._scaled_images.surfaces()
 
     def get_rect(self) -> pygame.Rect:
         """Get visual rectangle."""
@@ -264,15 +377,15 @@ class Button(UIElement):
 
     def get_hitbox_rect(self) -> pygame.Rect:
         """Get interaction rectangle (fixed)."""
-        # Always use a static base hitbox so interactions are consistent
-        return self._button_hitbox_rect()
+        # Always use a static base hitbox so interactions are consistent, unless explicitly overridden
+        return self._hitbox_rect_override or self._button_hitbox_rect()
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Process mouse events for hover and click detection."""
         if not self.visible or not self.enabled:
             return False
 
-        button_hitbox = self._button_hitbox_rect()
+        button_hitbox = self.get_hitbox_rect()
 
         if event.type == pygame.MOUSEMOTION: # General mouse movement
             mouse_x, mouse_y = event.pos # Gather its current coordinates
@@ -311,27 +424,36 @@ class Button(UIElement):
 
         return False # Did not consume event
 
+    def holds_pointer(self) -> bool:
+        """Check if the button is hovered or pressed, and so waiting for the pointer to leave or be released."""
+        return self.is_hovered or self.is_pressed
+
     def update(self, dt: float) -> None:
         """Update expansion animation if enabled."""
         # Update expansion tween and size
         if self.expand_on_hover:
-            prev_progress = self._expand_tween.current
             progress = self._expand_tween.update(dt)
-            if progress != prev_progress:
+            if progress != self._expand_progress: # Managed tweens may have advanced before this update
+                self._expand_progress = progress
                 self._current_width = self.base_width + (self.expanded_width - self.base_width) * progress
                 # Keep visual expansion to the right (left and top stay the same) to keep no positional change
                 self._redraw_background()
 
-    def render(self, screen: pygame.Surface) -> None:
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
         """Render the button and its contents."""
         if not self.visible: # Do not render if the element is invisible
             return None
 
-        # Keep the hit-rect aligned with the panel
-        self.set_hitbox_rect((self.panel.x, self.panel.y, self.base_width, self.height))
-
         # Relayout text according to visual width
         self._layout_text()
 
         # Draw the panel
-        self.panel.render(screen)
+        self.panel.render(screen, origin)
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the button and its contents onto a draw list."""
+        if not self.visible:
+            return None
+
+        self._layout_text()
+        self.panel.emit_draw_commands(draw_list, origin)
@@ -0,0 +1,311 @@
+"""
+Easing library compiled into precomputed lookup tables.
+
+Every easing curve is sampled once into a lookup table when it is registered, and is then evaluated through linear
+interpolation between samples. Easings are addressed by integer id, so evaluating one never involves string
+comparisons or calls into the curve function itself.
+"""
+import math
+from typing import Callable, Union
+
+LUT_SIZE = 256 # Number of intervals each easing curve is sampled into
+_LAST = LUT_SIZE # Index of the final sample, where t = 1.0
+
+_tables: list[list[float]] = [] # Sampled curve of each easing, indexed by easing id
+_ids: dict[str, int] = {} # Easing ids by name
+_revision = 0 # Incremented whenever a lookup table is added or replaced
+
+
+def linear(t: float) -> float:
+    """No easing."""
+    return t
+
+
+def ease_in_quad(t: float) -> float:
+    """Quadratic acceleration from zero velocity."""
+    return t * t
+
+
+def ease_out_quad(t: float) -> float:
+    """Quadratic deceleration to zero velocity."""
+    return 1 - (1 - t) * (1 - t)
+
+
+def ease_in_out_sine(t: float) -> float:
+    """Sinusoidal acceleration until halfway, then deceleration."""
+    return 0.5 * (1 - math.cos(math.pi * t))
+
+
+def ease_in_cubic(t: float) -> float:
+    """Cubic acceleration from zero velocity."""
+    return t * t * t
+
+
+def ease_out_cubic(t: float) -> float:
+    """Cubic deceleration to zero velocity."""
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_cubic(t: float) -> float:
+    """Cubic acceleration until halfway, then deceleration."""
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+def ease_in_quart(t: float) -> float:
+    """Quartic acceleration from zero velocity."""
+    return t ** 4
+
+
+def ease_out_quart(t: float) -> float:
+    """Quartic deceleration to zero velocity."""
+    return 1 - (1 - t) ** 4
+
+
+def ease_in_out_quart(t: float) -> float:
+    """Quartic acceleration until halfway, then deceleration."""
+    return 8 * t ** 4 if t < 0.5 else 1 - (-2 * t + 2) ** 4 / 2
+
+
+def ease_in_expo(t: float) -> float:
+    """Exponential acceleration from zero velocity."""
+    return 0.0 if t <= 0 else 2 ** (10 * t - 10)
+
+
+def ease_out_expo(t: float) -> float:
+    """Exponential deceleration to zero velocity."""
+    return 1.0 if t >= 1 else 1 - 2 ** (-10 * t)
+
+
+def ease_in_out_expo(t: float) -> float:
+    """Exponential acceleration until halfway, then deceleration."""
+    if t <= 0 or t >= 1:
+        return float(t >= 1)
+    return 2 ** (20 * t - 10) / 2 if t < 0.5 else (2 - 2 ** (-20 * t + 10)) / 2
+
+
+_BACK_C1 = 1.70158 # Overshoot amount of the back easings
+_BACK_C2 = _BACK_C1 * 1.525
+_BACK_C3 = _BACK_C1 + 1
+
+
+def ease_in_back(t: float) -> float:
+    """Pull back slightly before accelerating."""
+    return _BACK_C3 * t ** 3 - _BACK_C1 * t * t
+
+
+def ease_out_back(t: float) -> float:
+    """Overshoot the target slightly before settling."""
+    return 1 + _BACK_C3 * (t - 1) ** 3 + _BACK_C1 * (t - 1) ** 2
+
+
+def ease_in_out_back(t: float) -> float:
+    """Pull back at the start and overshoot at the end."""
+    if t < 0.5:
+        return ((2 * t) ** 2 * ((_BACK_C2 + 1) * 2 * t - _BACK_C2)) / 2
+    return ((2 * t - 2) ** 2 * ((_BACK_C2 + 1) * (t * 2 - 2) + _BACK_C2) + 2) / 2
+
+
+_ELASTIC_C4 = (2 * math.pi) / 3 # Oscillation frequency of the elastic easings
+_ELASTIC_C5 = (2 * math.pi) / 4.5
+
+
+def ease_in_elastic(t: float) -> float:
+    """Oscillate with growing amplitude before snapping to the target."""
+    if t <= 0 or t >= 1:
+        return float(t >= 1)
+    return -(2 ** (10 * t - 10)) * math.sin((t * 10 - 10.75) * _ELASTIC_C4)
+
+
+def ease_out_elastic(t: float) -> float:
+    """Snap past the target and oscillate to rest."""
+    if t <= 0 or t >= 1:
+        return float(t >= 1)
+    return 2 ** (-10 * t) * math.sin((t * 10 - 0.75) * _ELASTIC_C4) + 1
+
+
+def ease_in_out_elastic(t: float) -> float:
+    """Oscillate at both the start and the end."""
+    if t <= 0 or t >= 1:
+        return float(t >= 1)
+    if t < 0.5:
+        return -(2 ** (20 * t - 10) * math.sin((20 * t - 11.125) * _ELASTIC_C5)) / 2
+    return (2 ** (-20 * t + 10) * math.sin((20 * t - 11.125) * _ELASTIC_C5)) / 2 + 1
+
+
+def ease_out_bounce(t: float) -> float:
+    """Bounce to rest at the target."""
+    n1 = 7.5625
+    d1 = 2.75
+    if t < 1 / d1:
+        return n1 * t * t
+    if t < 2 / d1:
+        t -= 1.5 / d1
+        return n1 * t * t + 0.75
+    if t < 2.5 / d1:
+        t -= 2.25 / d1
+        return n1 * t * t + 0.9375
+    t -= 2.625 / d1
+    return n1 * t * t + 0.984375
+
+
+def ease_in_bounce(t: float) -> float:
+    """Bounce away from the start."""
+    return 1 - ease_out_bounce(1 - t)
+
+
+def ease_in_out_bounce(t: float) -> float:
+    """Bounce away from the start and to rest at the target."""
+    if t < 0.5:
+        return (1 - ease_out_bounce(1 - 2 * t)) / 2
+    return (1 + ease_out_bounce(2 * t - 1)) / 2
+
+
+def cubic_bezier(x1: float, y1: float, x2: float, y2: float) -> Callable[[float], float]:
+    """
+    Create an easing function from a cubic bezier curve, like CSS cubic-bezier().
+
+    The curve runs from (0, 0) to (1, 1) with the two given control points.
+    :param x1: X coordinate of the first control point, between 0 and 1.
+    :param y1: Y coordinate of the first control point.
+    :param x2: X coordinate of the second control point, between 0 and 1.
+    :param y2: Y coordinate of the second control point.
+    :return: Easing function mapping normalised time to eased progress.
+    :raises ValueError: If a control point's X coordinate is outside 0 to 1.
+    """
+    if not (0.0 <= x1 <= 1.0 and 0.0 <= x2 <= 1.0):
+        raise ValueError("Cubic bezier control point X coordinates must be between 0 and 1.")
+
+    # Polynomial coefficients of each axis
+    cx = 3 * x1
+    bx = 3 * (x2 - x1) - cx
+    ax = 1 - cx - bx
+    cy = 3 * y1
+    by = 3 * (y2 - y1) - cy
+    ay = 1 - cy - by
+
+    def sample_x(s: float) -> float:
+        return ((ax * s + bx) * s + cx) * s
+
+    def solve_s(x: float) -> float:
+        """Find the curve parameter whose X coordinate is x."""
+        s = x
+        for _ in range(8): # Newton-Raphson converges quickly for most curves
+            error = sample_x(s) - x
+            if abs(error) < 1e-7:
+                return s
+            slope = (3 * ax * s + 2 * bx) * s + cx
+            if abs(slope) < 1e-6:
+                break
+            s -= error / slope
+        low, high = 0.0, 1.0 # Fall back to bisection for flat sections
+        s = x
+        while high - low > 1e-7:
+            if sample_x(s) < x:
+                low = s
+            else:
+                high = s
+            s = (low + high) / 2
+        return s
+
+    def ease(t: float) -> float:
+        s = solve_s(t)
+        return ((ay * s + by) * s + cy) * s
+
+    return ease
+
+
+def register_ease(name: str, func: Callable[[float], float]) -> int:
+    """
+    Compile an easing function into a lookup table and register it under a name.
+
+    Registering an existing name replaces its curve but keeps its id.
+    :param name: Name used to look up the easing.
+    :param func: Function mapping normalised time (0.0 to 1.0) to eased progress.
+    :return: The easing id.
+    """
+    global _revision
+    table = [float(func(i / LUT_SIZE)) for i in range(LUT_SIZE + 1)]
+    _revision += 1
+    if name in _ids:
+        _tables[_ids[name]] = table
+    else:
+        _ids[name] = len(_tables)
+        _tables.append(table)
+    return _ids[name]
+
+
+def register_cubic_bezier(name: str, x1: float, y1: float, x2: float, y2: float) -> int:
+    """
+    Register a cubic bezier easing with custom control points.
+    :param name: Name used to look up the easing.
+    :return: The easing id.
+    """
+    return register_ease(name, cubic_bezier(x1, y1, x2, y2))
+
+
+def get_ease_id(ease: Union[str, int]) -> int:
+    """
+    Resolve an easing name to its id.
+    :param ease: Easing name, or an existing easing id.
+    :return: The easing id. Unknown names resolve to linear.
+    """
+    if isinstance(ease, int):
+        return ease if 0 <= ease < len(_tables) else 0
+    return _ids.get(ease, 0)
+
+
+def evaluate(ease_id: int, t: float) -> float:
+    """
+    Evaluate an easing at a normalised time using its lookup table.
+    :param ease_id: Id of the easing.
+    :param t: Normalised time (0.0 to 1.0).
+    :return: Eased time value.
+    """
+    table = _tables[ease_id]
+    if t <= 0.0:
+        return table[0]
+    position = t * LUT_SIZE
+    index = int(position)
+    if index >= _LAST:
+        return table[_LAST]
+    low = table[index]
+    return low + (table[index + 1] - low) * (position - index)
+
+
+def lookup_tables() -> list[list[float]]:
+    """Get the lookup table of every registered easing, indexed by easing id."""
+    return _tables
+
+
+def revision() -> int:
+    """Get a counter that changes whenever the registered lookup tables change."""
+    return _revision
+
+
+# Built-in easings. The first four keep the names and curves of the original easing set
+register_ease("linear", linear)
+register_ease("ease_in", ease_in_quad)
+register_ease("ease_out", ease_out_quad)
+register_ease("ease_in_out", ease_in_out_sine)
+register_ease("ease_in_cubic", ease_in_cubic)
+register_ease("ease_out_cubic", ease_out_cubic)
+register_ease("ease_in_out_cubic", ease_in_out_cubic)
+register_ease("ease_in_quart", ease_in_quart)
+register_ease("ease_out_quart", ease_out_quart)
+register_ease("ease_in_out_quart", ease_in_out_quart)
+register_ease("ease_in_expo", ease_in_expo)
+register_ease("ease_out_expo", ease_out_expo)
+register_ease("ease_in_out_expo", ease_in_out_expo)
+register_ease("ease_in_back", ease_in_back)
+register_ease("ease_out_back", ease_out_back)
+register_ease("ease_in_out_back", ease_in_out_back)
+register_ease("ease_in_elastic", ease_in_elastic)
+register_ease("ease_out_elastic", ease_out_elastic)
+register_ease("ease_in_out_elastic", ease_in_out_elastic)
+register_ease("ease_in_bounce", ease_in_bounce)
+register_ease("ease_out_bounce", ease_out_bounce)
+register_ease("ease_in_out_bounce", ease_in_out_bounce)
+register_cubic_bezier("ease", 0.25, 0.1, 0.25, 1.0) # CSS named curves
+register_cubic_bezier("ease_in_css", 0.42, 0.0, 1.0, 1.0)
+register_cubic_bezier("ease_out_css", 0.0, 0.0, 0.58, 1.0)
+register_cubic_bezier("ease_in_out_css", 0.42, 0.0, 0.58, 1.0)
@@ -2,27 +2,57 @@
 Renderable image UI element with tinting, scaling, and centering support.
 
 The Image class loads and displays images from file or surface, with options for transparency, tinting,
-and smooth scaling.
+and smooth scaling. The surface that gets drawn is converted to the cheapest pixel format its content allows.
+Images can also show a named region of a texture atlas, drawn straight from the shared atlas page, and image files
+found in a mounted asset bundle are drawn straight from the memory-mapped bundle without decoding or copying.
+Resizing supports three quality tiers (nearest, smooth and mipmapped), and finished variants of recent sizes and
+tints are cached so returning to them does not resample or recolour the image again. Opacity is applied as
+surface-level alpha, so effects that alternate between a few tints or fade an image only swap surfaces.
+With deferred scaling, resizes that are not cached run on the transform service's worker threads, and the image
+keeps showing its previous surface until the resized one is ready. Under frame-time pressure the quality governor
+makes resizes use the nearest tier, and images resize again at their own tier once it recovers.
 """
-from typing import Optional
+from typing import Iterator, Optional
 import pygame
 
+from engine.assets.atlas import TextureAtlas
+from engine.assets.bundle import find_image
+from engine.rendering import quality
+from engine.rendering.draw_list import DrawList
+from engine.rendering.surface_cache import SurfaceCache
+from engine.rendering.surface_format import apply_alpha, optimise_surface
+from engine.rendering.transform_service import get_transform_service
 from engine.user_interface.ui_element import UIElement
 
 
+SCALE_NEAREST = "nearest" # Fastest resizing, without filtering
+SCALE_SMOOTH = "smooth" # Filtered resizing from the full resolution image
+SCALE_MIPMAP = "mipmap" # Filtered resizing from the nearest level of a chain of halved images
+
+
 class Image(UIElement):
     """A renderable image UI element."""
+    __slots__ = ("centre_image", "alpha", "scale_quality", "deferred_scaling", "_tint_colour", "_base_surface",
+                 "_shared_source", "_render_surface", "_render_area", "_size", "_mip_chain", "_scale_cache",
+                 "_variants", "_pending_scale")
+
     def __init__(self, x: int, y: int,
                  image_path: str = None,
                  surface: pygame.Surface = None,
                  centre_image: bool = False,
                  layer: int = 0,
                  element_id: Optional[str] = None,
-                 alpha: int = 255):
+                 alpha: int = 255,
+                 atlas: Optional[TextureAtlas] = None,
+                 region: Optional[str] = None,
+                 scale_quality: str = SCALE_SMOOTH,
+                 scale_cache_size: int = 4,
+                 variant_cache_size: int = 8,
+                 deferred_scaling: bool = False):
         """
         Initialise an image element.
 
-        Either `image_path` or `surface` must be provided.
+        Either `image_path`, `surface`, or `atlas` and `region` must be provided.
 
         :param x: X-axis position of the image.
         :param y: Y-axis position of the image.
@@ -32,14 +62,36 @@ class Image(UIElement):
         :param layer: Z-order for rendering.
         :param element_id: Optional identifier.
         :param alpha: Opacity.
+        :param atlas: Texture atlas holding the image.
+        :param region: Name of the image's region in the atlas.
+        :param scale_quality: Resizing quality tier: "nearest", "smooth" or "mipmap".
+        :param scale_cache_size: Number of resized versions of the image kept for reuse.
+        :param variant_cache_size: Number of finished size and tint combinations kept for reuse.
+        :param deferred_scaling: Whether to resize on worker threads, showing the previous surface until done.
         """
         super().__init__(x, y, layer, element_id)
         self.centre_image = centre_image
         self.alpha = alpha
+        self.scale_quality = scale_quality
+        self.deferred_scaling = deferred_scaling
+        self._pending_scale: Optional[tuple] = None # Size and quality being resized on a worker thread
         self._tint_colour: Optional[tuple] = None
+        self._size: Optional[tuple[int, int]] = None # Requested display size, or None for the natural size
+        self._mip_chain: list[pygame.Surface] = [] # Successively halved copies of the base, built on demand
+        self._scale_cache = SurfaceCache(scale_cache_size) # Resized versions of the base, by size and quality
+        self._variants = SurfaceCache(variant_cache_size) # Display-ready surfaces, by size and tint
+        self._shared_source: Optional[tuple[pygame.Surface, Optional[pygame.Rect]]] = None # Surface and source
+        # rectangle to draw from directly while the image is shown untransformed, when its pixels are shared
 
         # Load or create base surface
-        if image_path: # Prioritise image files for the surface
+        if atlas is not None and region is not None: # Draw directly from the shared atlas page
+            page, area = atlas.get_region(region)
+            base = page.subsurface(area) # Shares the page pixels for transforms
+            self._shared_source = (page, area)
+        elif image_path and find_image(image_path) is not None: # Use the pre-decoded bundle pixels directly
+            base = find_image(image_path)
+            self._shared_source = (base, None)
+        elif image_path: # Prioritise image files for the surface
             base = pygame.image.load(image_path).convert_alpha()
         elif surface: # If there is no image path provided, attempt at using the given surface
             base = surface.convert_alpha()
@@ -48,27 +100,177 @@ class Image(UIElement):
             base = pygame.Surface((100, 100), pygame.SRCALPHA)
             base.fill((100, 100, 100, 255))
 
-        self._base_surface: pygame.Surface = base
-        self._render_surface: pygame.Surface = base.copy() # Ensure Pygame does not change the base in place
-        self._render_surface.set_alpha(self.alpha)
+        self._base_surface: pygame.Surface = base # Kept with per-pixel alpha so scaling and tinting stay exact
+        self._render_surface: Optional[pygame.Surface] = None
+        self._render_area: Optional[pygame.Rect] = None # Source rectangle when drawing part of a shared surface
+        self._rebuild_render_surface()
 
-    def _rebuild_render_surface(self):
-        """Reapply tint and alpha to the render surface."""
-        self._render_surface = self._base_surface.copy()
+    def _build_variant(self) -> pygame.Surface:
+        """
+        Resize and tint the base surface for the current settings, and convert it to its cheapest pixel format.
+        An untinted variant is the resize itself in its cheapest format, so that resize leaves the resize cache
+        instead of being held twice. Resizes that tinted variants are built from stay cached for other tints.
+        :return: The new variant surface, owned by this image, so its surface-level alpha can be changed.
+        """
+        scaled = self._scaled_base()
+        surface = scaled
         if self._tint_colour is not None:
-            self._render_surface.fill(self._tint_colour, special_flags=pygame.BLEND_RGBA_MULT) # Flag multiplies
+            surface = surface.copy() # Ensure Pygame does not change the base or a cached resize in place
+            surface.fill(self._tint_colour, special_flags=pygame.BLEND_RGBA_MULT) # Flag multiplies
             # the RGBA values of the source surface with the target surface to merge the two surfaces
-        self._render_surface.set_alpha(self.alpha)
+        variant = optimise_surface(surface)
+        if variant is scaled: # Without a display mode the input comes back unconverted
+            variant = variant.copy()
+        if self._size is not None and self._tint_colour is None:
+            self._scale_cache.pop((self._size, self._effective_quality()))
+        return variant
+
+    def _rebuild_render_surface(self):
+        """Reapply size, tint and alpha to the render surface."""
+        untransformed = self._size is None and self._tint_colour is None and self.alpha >= 255
+        if untransformed and self._shared_source is not None: # Nothing to change, so draw the shared pixels
+            self._render_surface, self._render_area = self._shared_source
+            self.invalidate()
+            return None
+
+        size_key = (self._size, self._effective_quality()) if self._size is not None else None
+        key = (size_key, self._tint_colour)
+        variant = self._variants.get(key)
+        if variant is None:
+            if self._defer_scale():
+                return None # Keep showing the previous surface until the resize is ready
+            variant = self._build_variant()
+            self._variants.put(key, variant)
+        apply_alpha(variant, self.alpha) # Surface-level alpha, so changing opacity never copies pixels
+        self._render_surface = variant
+        self._render_area = None
+        self.invalidate()
+
+    def _defer_scale(self) -> bool:
+        """
+        Start resizing the base on a worker thread if deferred scaling is on and the resize is not cached.
+        :return: Whether the resize is running on a worker thread.
+        """
+        if not self.deferred_scaling or self._size is None or self._size == self._base_surface.get_size():
+            return False
+        key = (self._size, self._effective_quality())
+        if self._scale_cache.get(key) is not None:
+            return False
+        if self._render_surface is None: # Nothing to show yet, so resize now
+            return False
+        if self._pending_scale == key:
+            return True
+
+        base = self._base_surface
+        mip_chain = list(self._mip_chain) # Extended on the worker, never shared with the frame thread
+
+        def finished(scaled: pygame.Surface) -> None:
+            if self._pending_scale == key:
+                self._pending_scale = None
+            if base is not self._base_surface: # The image was replaced while resizing
+                return None
+            self._scale_cache.put(key, scaled)
+            if len(mip_chain) > len(self._mip_chain):
+                self._mip_chain[:] = mip_chain
+            if (self._size, self._effective_quality()) == key:
+                self._rebuild_render_surface()
+
+        self._pending_scale = key
+        get_transform_service().submit(self._resample, base, self._size, key[1], mip_chain, callback=finished)
+        return True
+
+    def _effective_quality(self) -> str:
+        """Get the resizing tier to use now, which drops to nearest while the quality governor is under pressure."""
+        if self.scale_quality == SCALE_NEAREST or quality.smooth_scaling():
+            return self.scale_quality
+        quality.watch_recovery(self)
+        return SCALE_NEAREST
+
+    def restore_quality(self) -> None:
+        """Resize again at the image's own tier, after the quality governor raised the quality level."""
+        if self._size is not None:
+            self._rebuild_render_surface()
+
+    def _reset_base(self, base: pygame.Surface, shared_source=None) -> None:
+        """Replace the base surface and drop everything derived from the previous one."""
+        self._base_surface = base
+        self._shared_source = shared_source
+        self._pending_scale = None # Results for the previous base are discarded
+        self._mip_chain.clear()
+        self._scale_cache.clear()
+        self._variants.clear()
+        self._rebuild_render_surface()
+
+    @staticmethod
+    def _mip_level(base: pygame.Surface, mip_chain: list[pygame.Surface], level: int) -> pygame.Surface:
+        """
+        Get a level of a mipmap chain, building any missing levels up to it.
+        :param base: Full resolution surface the chain starts from.
+        :param mip_chain: Levels built so far, extended in place.
+        :param level: Level to get, where 0 is the base and each level halves the previous one.
+        :return: The mipmap surface.
+        """
+        if not mip_chain:
+            mip_chain.append(base)
+        while len(mip_chain) <= level:
+            previous = mip_chain[-1]
+            size = (max(1, previous.get_width() // 2), max(1, previous.get_height() // 2))
+            mip_chain.append(pygame.transform.smoothscale(previous, size))
+        return mip_chain[level]
+
+    @classmethod
+    def _resample(cls, base: pygame.Surface, size: tuple[int, int], quality: str,
+                  mip_chain: list[pygame.Surface]) -> pygame.Surface:
+        """
+        Resize a surface with a quality tier. Only reads its arguments, apart from extending the mipmap chain, so it
+        can run on a worker thread.
+        :param base: Full resolution surface.
+        :param size: Target size.
+        :param quality: "nearest", "smooth" or "mipmap".
+        :param mip_chain: Mipmap levels of the base built so far, extended in place.
+        :return: The resized surface.
+        """
+        width, height = size
+        if quality == SCALE_NEAREST:
+            return pygame.transform.scale(base, size)
+        if quality == SCALE_MIPMAP:
+            # Start from the smallest level that is still at least as large as the target, so each resample only
+            # covers less than a halving step
+            level = 0
+            base_width, base_height = base.get_size()
+            while base_width >> (level + 1) >= width and base_height >> (level + 1) >= height:
+                level += 1
+            return pygame.transform.smoothscale(cls._mip_level(base, mip_chain, level), size)
+        return pygame.transform.smoothscale(base, size) # Slower scaling but should look visually nicer
+
+    def _scaled_base(self) -> pygame.Surface:
+        """
+        Get the base surface resized to the requested size, reusing a cached copy if available.
+        :return: The resized surface. It must not be modified, as it may be cached.
+        """
+        if self._size is None or self._size == self._base_surface.get_size():
+            return self._base_surface
+
+        key = (self._size, self._effective_quality())
+        scaled = self._scale_cache.get(key)
+        if scaled is not None:
+            return scaled
+
+        scaled = self._resample(self._base_surface, self._size, key[1], self._mip_chain)
+        self._scale_cache.put(key, scaled)
+        return scaled
 
     def set_image_path(self, image_path: str) -> None:
         """Load a new image from file and update display."""
-        self._base_surface = pygame.image.load(image_path).convert_alpha()
-        self._rebuild_render_surface()
+        mapped = find_image(image_path)
+        if mapped is not None:
+            self._reset_base(mapped, (mapped, None))
+        else:
+            self._reset_base(pygame.image.load(image_path).convert_alpha())
 
     def set_surface(self, surface: pygame.Surface) -> None:
         """Replace image with a new surface."""
-        self._base_surface = surface.convert_alpha()
-        self._rebuild_render_surface()
+        self._reset_base(surface.convert_alpha())
 
     def set_tint(self, colour: Optional[tuple]) -> None:
         """Apply a colour tint (multiply blend). Set None to clear."""
@@ -81,29 +283,63 @@ class Image(UIElement):
         self._rebuild_render_surface()
 
     def set_size(self, width: int, height: int) -> None:
-        """Resize image with smooth scaling and preserve tint/alpha."""
-        # Slower scaling but should look visually nicer
-        self._render_surface = pygame.transform.smoothscale(self._base_surface, (int(width), int(height)))
-        if self._tint_colour is not None:
-            self._render_surface.fill(self._tint_colour, special_flags=pygame.BLEND_RGBA_MULT)
-        self._render_surface.set_alpha(self.alpha)
+        """Resize image using the scale quality tier and preserve tint/alpha."""
+        size = (max(1, int(width)), max(1, int(height)))
+        if size == self._size:
+            return None # No need to update the size
+        self._size = size
+        self._rebuild_render_surface()
+
+    def clear_size(self) -> None:
+        """Return the image to its natural size."""
+        if self._size is not None:
+            self._size = None
+            self._rebuild_render_surface()
+
+    def set_scale_quality(self, quality: str) -> None:
+        """
+        Change the resizing quality tier.
+        :param quality: "nearest", "smooth" or "mipmap".
+        """
+        if quality != self.scale_quality:
+            self.scale_quality = quality
+            if quality != SCALE_MIPMAP:
+                self._mip_chain.clear() # Release the chain once it is no longer used
+            self._rebuild_render_surface()
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the base and render surfaces, the mipmap chain, and the cached resized and tinted versions."""
+        yield self._base_surface
+        yield self._render_surface
+        yield from self._mip_chain[1:] # The first level is the base surface
+        yield from self._scale_cache.surfaces()
+        yield from self._variants.surfaces()
 
     def get_rect(self) -> pygame.Rect:
         """Get bounding rectangle based on centering setting."""
+        if self._render_area is not None:
+            rect = pygame.Rect((0, 0), self._render_area.size)
+        else:
+            rect = self._render_surface.get_rect()
         if self.centre_image:
-            rect = self._render_surface.get_rect(center=(self.x, self.y))
+            rect.center = self.get_world_position()
         else:
-            rect = self._render_surface.get_rect(topleft=(self.x, self.y))
+            rect.topleft = self.get_world_position()
         return rect
 
-    def render(self, screen: pygame.Surface) -> None:
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
         """Draw the image if visible."""
         if not self.visible: # Do not render if the element is invisible
             return None
 
-        if self.centre_image:
-            rect = self._render_surface.get_rect(center=(self.x, self.y))
-            screen.blit(self._render_surface, rect) # Blit/Copy the font surface onto the given screen at the centred position
-        else:
-            screen.blit(self._render_surface, (self.x, self.y)) # Blit/Copy the font surface onto the given screen
-            # at the original position
+        rect = self.get_rect().move(-origin[0], -origin[1]) # Convert screen coordinates into coordinates on the
+        # target surface
+        screen.blit(self._render_surface, rect, self._render_area) # Blit/Copy the image surface onto the given
+        # screen, using only the atlas region when drawing from an atlas page
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the image blit onto a draw list if visible."""
+        if not self.visible:
+            return None
+
+        draw_list.add(self._render_surface, self.get_rect().move(-origin[0], -origin[1]), self._render_area)
@@ -2,15 +2,24 @@
 Container UI element for grouping and rendering child elements.
 
 Panels provide a background surface with optional borders and manage relative positioning of child UI elements.
+A panel can optionally be cached, compositing itself and all of its children into a single surface which is only
+redrawn when something inside it changes. The panel surface uses the cheapest pixel format its settings allow: opaque
+for solid rectangular backgrounds, an RLE colour key when it has transparent areas, and per-pixel alpha only when
+translucent colours are used or requested.
 """
-from typing import Optional
+from typing import Iterator, Optional
 import pygame
 
+from engine.rendering.draw_list import DrawList
+from engine.rendering.surface_format import (OPAQUE, COLOURKEY, PER_PIXEL, apply_alpha, create_surface,
+                                             has_alpha_channel, pick_colour_key)
 from engine.user_interface.ui_element import UIElement
 
 
 class Panel(UIElement):
     """A container for grouping and rendering multiple UI elements."""
+    __slots__ = ("width", "height", "bg_colour", "alpha", "border_colour", "border_width", "border_radius", "cached",
+                 "per_pixel_alpha", "_cache_surface", "surface", "_surface_kind", "_colour_key")
 
     def __init__(self, x: int, y: int,
                  width: int, height: int,
@@ -19,7 +28,9 @@ class Panel(UIElement):
                  layer: int = 0,
                  border_colour: tuple = None,
                  border_width: int = 0,
-                 border_radius: int = 0
+                 border_radius: int = 0,
+                 cached: bool = False,
+                 per_pixel_alpha: bool = False
                  ):
         """
         Initialise a panel.
@@ -34,6 +45,10 @@ class Panel(UIElement):
         :param border_colour: Optional border colour.
         :param border_width: Optional border width in pixels.
         :param border_radius: Optional border radius.
+        :param cached: Whether to composite the panel and its children into one surface that is only redrawn when
+            a child changes. Children are clipped to the panel bounds while cached.
+        :param per_pixel_alpha: Whether to always use a per-pixel alpha surface, for when translucent content is drawn
+            onto the panel surface directly.
         """
         super().__init__(x, y, layer)
         self.width = width
@@ -43,17 +58,46 @@ class Panel(UIElement):
         self.border_colour = border_colour
         self.border_width = border_width
         self.border_radius = border_radius
-        self.elements: list[UIElement] = [] # List of all elements to be grouped
+        self.cached = cached
+        self.per_pixel_alpha = per_pixel_alpha
+        self._cache_surface: Optional[pygame.Surface] = None # Composited panel and children when cached
 
-        # Create transparent surface
-        self.surface = pygame.Surface((width, height), pygame.SRCALPHA) # SRCALPHA supports per-pixel
-        # alpha transparency
-        self.surface.set_alpha(alpha)
+        self._surface_kind: Optional[str] = None # Pixel format of the panel surface
+        self._colour_key: Optional[tuple] = None # Transparent key colour when the surface is colour keyed
+        self.surface: Optional[pygame.Surface] = None
         self._rebuild_background()
 
+    def _choose_surface_kind(self) -> str:
+        """Pick the cheapest pixel format that can show the panel's background and border."""
+        if self.per_pixel_alpha:
+            return PER_PIXEL
+        for colour in (self.bg_colour, self.border_colour if self.border_width > 0 else None):
+            if colour and len(colour) > 3 and colour[3] < 255: # Translucent colours need per-pixel alpha
+                return PER_PIXEL
+        if self.bg_colour and self.border_radius == 0: # Background covers every pixel
+            return OPAQUE
+        return COLOURKEY # Transparent areas are either fully transparent or fully opaque
+
+    def _create_surface(self, kind: str) -> None:
+        """Create the panel surface in the given pixel format."""
+        self._surface_kind = kind
+        self._colour_key = pick_colour_key(self.bg_colour, self.border_colour) if kind == COLOURKEY else None
+        self.surface = create_surface((self.width, self.height), kind, self._colour_key, self.alpha)
+
     def _rebuild_background(self):
         """Redraw the panel background and border."""
-        self.surface.fill((0, 0, 0, 0)) # Clear with full transparency
+        kind = self._choose_surface_kind()
+        key_in_use = self._colour_key is not None and self._colour_key in (
+            tuple(self.bg_colour[:3]) if self.bg_colour else None,
+            tuple(self.border_colour[:3]) if self.border_colour else None
+        )
+        if self.surface is None or kind != self._surface_kind or key_in_use: # Settings need a different format
+            self._create_surface(kind)
+        elif kind == PER_PIXEL:
+            self.surface.fill((0, 0, 0, 0)) # Clear with full transparency
+        elif kind == COLOURKEY:
+            self.surface.fill(self._colour_key) # Clear to the transparent key colour
+
         if self.bg_colour:
             pygame.draw.rect(
                 self.surface,
@@ -69,6 +113,7 @@ class Panel(UIElement):
                 width=self.border_width,
                 border_radius=self.border_radius
             )
+        self.invalidate()
 
     def set_size(self, width: int, height: int):
         """Resize the panel surface and rebuild its surface."""
@@ -78,8 +123,7 @@ class Panel(UIElement):
             return None # No need to update the size
         self.width = width
         self.height = height
-        self.surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.surface.set_alpha(self.alpha)
+        self.surface = None # Recreated at the new size
         self._rebuild_background()
 
     def get_size(self) -> tuple[int, int]:
@@ -98,7 +142,41 @@ class Panel(UIElement):
     def set_alpha(self, alpha: int) -> None:
         """Update opacity."""
         self.alpha = alpha
-        self.surface.set_alpha(alpha)
+        apply_alpha(self.surface, alpha)
+        self.invalidate()
+
+    def set_per_pixel_alpha(self, enabled: bool) -> None:
+        """Force or stop forcing a per-pixel alpha surface, then redraw."""
+        self.per_pixel_alpha = bool(enabled)
+        self._rebuild_background()
+
+    def set_cached(self, cached: bool) -> None:
+        """Enable or disable compositing the panel and its children into a single cached surface."""
+        self.cached = bool(cached)
+        if not self.cached:
+            self._cache_surface = None # Release the composited surface
+        self.invalidate()
+
+    def _composite(self) -> None:
+        """Redraw the panel background and all child elements into the cache surface."""
+        # A solid, fully opaque background hides everything behind it, so the cache needs no alpha channel
+        kind = OPAQUE if self._surface_kind == OPAQUE and self.alpha >= 255 else PER_PIXEL
+        if (self._cache_surface is None or self._cache_surface.get_size() != (self.width, self.height)
+                or has_alpha_channel(self._cache_surface) != (kind == PER_PIXEL)):
+            self._cache_surface = create_surface((self.width, self.height), kind)
+        elif kind == PER_PIXEL:
+            self._cache_surface.fill((0, 0, 0, 0)) # Clear with full transparency
+
+        self._cache_surface.blit(self.surface, (0, 0))
+        origin = self.get_world_position() # Children are drawn relative to the panel's top-left corner
+        for element in self.elements:
+            element.render(self._cache_surface, origin)
+        self._clear_dirty()
+
+    @property
+    def elements(self) -> list[UIElement]:
+        """Get the child elements of the panel."""
+        return self.children
 
     def add_element(self, element: UIElement, relative_x: int = 0, relative_y: int = 0):
         """
@@ -110,12 +188,12 @@ class Panel(UIElement):
         """
         element.x = relative_x
         element.y = relative_y
-        self.elements.append(element)
-        return element
+        return self.add_child(element)
 
     def clear_elements(self) -> None:
         """Remove all child elements."""
-        self.elements.clear()
+        for element in list(self.children):
+            self.remove_child(element)
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Handle events for all child elements."""
@@ -128,27 +206,55 @@ class Panel(UIElement):
                 return True
         return False
 
-    def render(self, screen: pygame.Surface) -> None:
+    def holds_pointer(self) -> bool:
+        """Check if any child element is in the middle of a pointer interaction."""
+        return any(element.holds_pointer() for element in self.elements)
+
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
         """Render panel background and all child elements."""
         if not self.visible:
             return None
 
+        x, y = self.get_world_position()
+        position = (x - origin[0], y - origin[1]) # Position on the target surface
+
+        if self.cached:
+            if self._dirty or self._cache_surface is None: # Only recomposite when something inside changed
+                self._composite()
+            screen.blit(self._cache_surface, position)
+            return None
+
         # Draw a panel background
-        screen.blit(self.surface, (self.x, self.y))
+        screen.blit(self.surface, position)
 
-        # Render children with absolute positioning
+        # Children resolve their own absolute positions through the transform hierarchy
         for element in self.elements:
-            original_x = element.x # Store current relative coordinates
-            original_y = element.y
+            element.render(screen, origin)
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the panel background and all child elements onto a draw list."""
+        if not self.visible:
+            return None
 
-            element.x = self.x + original_x # Convert relative coordinates to absolute
-            element.y = self.y + original_y
+        x, y = self.get_world_position()
+        position = (x - origin[0], y - origin[1])
 
-            element.render(screen) # Pass absolute screen coordinates to render on the screen
+        if self.cached:
+            if self._dirty or self._cache_surface is None:
+                self._composite()
+            draw_list.add(self._cache_surface, position)
+            return None
+
+        draw_list.add(self.surface, position)
+        for element in self.elements:
+            element.emit_draw_commands(draw_list, origin)
 
-            element.x = original_x # Convert absolute coordinates to relative to keep track of the relative position
-            element.y = original_y
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the background surface and the composited cache surface."""
+        for surface in (self.surface, self._cache_surface):
+            if surface is not None:
+                yield surface
 
     def get_rect(self) -> pygame.Rect:
         """Get bounding rectangle of the panel."""
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        return pygame.Rect(*self.get_world_position(), self.width, self.height)
@@ -2,17 +2,38 @@
 Renderable text UI element with support for wrapping, alignment, and styling.
 
 The Text class handles dynamic rendering of strings with customisable fonts, colours, alignment,
-and optional word wrapping within a maximum width.
+and optional word wrapping within a maximum width. Font objects are shared between text elements that use the same
+font file and size, until pygame quits. Under heavy frame-time pressure the quality governor turns antialiasing off,
+and text is rendered again with antialiasing once it recovers.
 """
-
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 import pygame
 
+from engine.rendering import quality
+from engine.rendering.draw_list import DrawList
 from engine.user_interface.ui_element import UIElement
 
 
+@lru_cache(maxsize=64)
+def get_font(font_path: Optional[str], font_size: int) -> pygame.font.Font:
+    """
+    Get a shared font object, loading it on first use.
+    :param font_path: Optional path to a font file. None uses the default font.
+    :param font_size: Size of the font.
+    :return: The font object.
+    """
+    return pygame.font.Font(font_path or None, font_size)
+
+
+pygame.register_quit(get_font.cache_clear) # Fonts are closed when pygame quits, so a later init must load new ones
+
+
 class Text(UIElement):
     """Renderable text element."""
+    __slots__ = ("text", "font_size", "colour", "centre_text", "max_width", "align", "alpha", "font_path", "font",
+                 "font_surface")
+
     def __init__(self, x: int, y: int,
                  text: str,
                  font_size: int = 36,
@@ -51,16 +72,17 @@ class Text(UIElement):
         self.font_path = font_path
 
         # Create a font object that can be rendered
-        self.font = pygame.font.Font(font_path, font_size) if font_path else pygame.font.Font(None, font_size)
+        self.font = get_font(font_path, font_size)
         self.font_surface: Optional[pygame.Surface] = None # Variable for storing the instance's surface of the font object
 
         self._update_surface() # Render the text element upon initialisation
 
-    def _wrap_text(self, text: str, max_width: int) -> list[pygame.Surface]:
+    def _wrap_text(self, text: str, max_width: int, antialias: bool = True) -> list[pygame.Surface]:
         """
         Split text into lines that fit within a given width.
         :param text: Input string to wrap.
         :param max_width: Maximum allowed line width in pixels.
+        :param antialias: Whether to render the lines with antialiasing.
         :return: List of rendered line surfaces.
         """
         words = text.split()
@@ -78,17 +100,21 @@ class Text(UIElement):
             lines.append(current)
 
         # Render each line and apply alpha
-        rendered = [self.font.render(line, True, self.colour) for line in lines]
+        rendered = [self.font.render(line, antialias, self.colour) for line in lines]
         for surface in rendered:
             surface.set_alpha(self.alpha)
         return rendered
 
     def _update_surface(self):
         """Re-render the text surface based on current properties."""
+        antialias = quality.text_antialiasing()
+        if not antialias:
+            quality.watch_recovery(self)
         if self.max_width:
-            lines = self._wrap_text(self.text, self.max_width)
+            lines = self._wrap_text(self.text, self.max_width, antialias)
             if not lines:
                 self.font_surface = None
+                self.invalidate()
                 return None
 
             width = max(surface.get_width() for surface in lines)
@@ -102,9 +128,14 @@ class Text(UIElement):
             surf.set_alpha(self.alpha)
             self.font_surface = surf
         else:
-            surf = self.font.render(self.text, True, self.colour)
+            surf = self.font.render(self.text, antialias, self.colour)
             surf.set_alpha(self.alpha)
             self.font_surface = surf
+        self.invalidate()
+
+    def restore_quality(self) -> None:
+        """Render again with antialiasing, after the quality governor raised the quality level."""
+        self._update_surface()
 
     def set_text(self, text: str):
         """Update the displayed text and re-render if changed."""
@@ -121,12 +152,12 @@ class Text(UIElement):
     def set_font_size(self, size: int):
         """Change font size and re-render."""
         self.font_size = int(size)
-        self.font = pygame.font.Font(self.font_path if self.font_path else None, self.font_size)
+        self.font = get_font(self.font_path, self.font_size)
         self._update_surface()
 
     def set_font(self, font_path: Optional[str]):
         """Switch to a new font file and re-render."""
-        self.font = pygame.font.Font(font_path, self.font_size)
+        self.font = get_font(font_path, self.font_size)
         self.font_path = font_path
         self._update_surface()
 
@@ -141,12 +172,18 @@ class Text(UIElement):
             self.align = align
         if centre_flag is not None:
             self.centre_text = bool(centre_flag)
+        self.invalidate()
 
     def set_alpha(self, alpha: int):
         """Set opacity and re-render."""
         self.alpha = alpha
         self._update_surface()
 
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """Iterate over the rendered text surface."""
+        if self.font_surface is not None:
+            yield self.font_surface
+
     def get_rect(self) -> pygame.Rect:
         """
         Get the bounding rectangle of the rendered text.
@@ -154,23 +191,31 @@ class Text(UIElement):
         Uses alignment settings to determine anchor point.
         :return: Bounding rectangle in screen coordinates.
         """
+        position = self.get_world_position()
         if not self.font_surface:
-            return pygame.Rect(self.x, self.y, 0, 0)
+            return pygame.Rect(*position, 0, 0)
         if (self.align == "centre") or (self.align is None and self.centre_text):
-            rect = self.font_surface.get_rect(center=(self.x, self.y))
+            rect = self.font_surface.get_rect(center=position)
         elif self.align == "right":
-            rect = self.font_surface.get_rect(midright=(self.x, self.y))
+            rect = self.font_surface.get_rect(midright=position)
         elif self.align == "left":
-            rect = self.font_surface.get_rect(midleft=(self.x, self.y))
+            rect = self.font_surface.get_rect(midleft=position)
         else:
-            rect = self.font_surface.get_rect(topleft=(self.x, self.y))
+            rect = self.font_surface.get_rect(topleft=position)
         return rect
 
-    def render(self, screen: pygame.Surface) -> None:
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
         """Draw the text onto the screen if visible."""
         if not self.visible or not self.font_surface:
             return None # Do not render if no surface exists or if the element is invisible
 
-        rect = self.get_rect()
+        rect = self.get_rect().move(-origin[0], -origin[1])
         screen.blit(self.font_surface, rect) # Blit/Copy the font surface onto the given screen
         # at the given position
+
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """Queue the text blit onto a draw list if visible."""
+        if not self.visible or not self.font_surface:
+            return None
+
+        draw_list.add(self.font_surface, self.get_rect().move(-origin[0], -origin[1]))
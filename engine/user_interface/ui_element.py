@@ -2,43 +2,296 @@
 Base class for all user interface elements.
 
 Provides common properties like position, visibility, layering, and hitbox management.
-All UI elements must inherit from this class.
+Elements form a parent/child transform hierarchy: each element stores its position relative to its parent, and
+caches its absolute (world) position until it or one of its ancestors moves.
+Elements also carry a dirty flag which is raised whenever their appearance changes, so that cached containers know
+when they need to be redrawn, and a module-wide revision counter advances whenever any element moves or changes, so
+that scenes know when cached element bounds are stale.
+All UI elements must inherit from this class. The element classes use __slots__ instead of per-instance dictionaries
+to keep large generated interfaces small in memory.
 """
-from abc import ABC, abstractmethod
-from typing import Optional, Union
+from abc import ABCMeta, abstractmethod
+from typing import Iterator, Optional, Union
 
 import pygame
 
+from engine.rendering.draw_list import DrawList
 
-class UIElement(ABC):
+_revision = 0 # Advanced whenever any element moves, changes appearance or changes layer
+_order_revision = 0 # Advanced whenever any element changes layer or screen space
+
+
+def revision() -> int:
+    """
+    Get the element revision counter.
+
+    The value changes whenever any element moves, changes its appearance or changes its layer, so anything derived
+    from element positions and bounds can be kept until it changes.
+    :return: The current revision.
+    """
+    return _revision
+
+
+def order_revision() -> int:
+    """
+    Get the element order revision counter.
+
+    The value changes whenever any element changes its layer or whether it is fixed to the screen, so anything derived
+    from the draw order of elements can be kept until it changes.
+    :return: The current order revision.
+    """
+    return _order_revision
+
+
+class UIElementMeta(ABCMeta):
+    """
+    Metaclass giving UI element subclasses compact slotted instances.
+
+    Subclasses can declare their own __slots__ as usual. Subclasses that instead declare their attributes as class
+    level annotations have __slots__ generated from those annotations. Subclasses that do neither keep a regular
+    per-instance __dict__, so arbitrary attributes still work.
+
+    Example:
+        class HealthBar(UIElement):
+            value: float
+            max_value: float
+    """
+    def __new__(mcls, name: str, bases: tuple, namespace: dict, **kwargs):
+        if "__slots__" not in namespace:
+            fields = mcls._declared_fields(namespace)
+            if fields:
+                namespace["__slots__"] = fields
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+    @staticmethod
+    def _declared_fields(namespace: dict) -> tuple[str, ...]:
+        """
+        Get the attribute names annotated in a class body, excluding those given a class-level value.
+        :param namespace: Class body namespace.
+        :return: Names to use as slots.
+        """
+        annotations = namespace.get("__annotations__")
+        if annotations is None: # Python 3.14+ evaluates class annotations lazily
+            try:
+                import annotationlib
+            except ImportError:
+                return ()
+            annotate = annotationlib.get_annotate_from_class_namespace(namespace)
+            if annotate is None:
+                return ()
+            annotations = annotationlib.call_annotate_function(annotate, annotationlib.Format.FORWARDREF)
+        return tuple(field for field in annotations if field not in namespace)
+
+
+class UIElement(metaclass=UIElementMeta):
     """Base class for all UI elements."""
+    __slots__ = ("_x", "_y", "_world_x", "_world_y", "_transform_dirty", "parent", "_children", "_dirty",
+                 "layer", "visible", "enabled", "id", "_hitbox_rect_override", "screen_space", "_revision",
+                 "_moved_revision", "__weakref__")
+
     def __init__(self, x: int, y: int,
                  layer: int = 0,
                  element_id: Optional[str] = None):
         """
         Initialise a UI element.
-        :param x: X-axis position of the element.
-        :param y: Y-axis position of the element.
+        :param x: X-axis position of the element, relative to its parent if it has one.
+        :param y: Y-axis position of the element, relative to its parent if it has one.
         :param layer: Z-order for rendering.
         :param element_id: Unique identifier for sorting and lookups.
         """
-        self.x = x # X coordinate position
-        self.y = y # Y coordinate position
+        self._x = x # Local X coordinate position
+        self._y = y # Local Y coordinate position
+        self._world_x = x # Cached absolute X coordinate position
+        self._world_y = y # Cached absolute Y coordinate position
+        self._transform_dirty = True # Whether the cached world position needs recalculating
+        self.parent: Optional["UIElement"] = None # Element this one is positioned relative to
+        self._children: list["UIElement"] = [] # Elements positioned relative to this one
+        self._dirty = True # Whether the appearance changed since the element was last drawn into a cache
+        self._revision = _revision # Revision at which this element or a descendant last changed appearance
+        self._moved_revision = _revision # Revision at which the world position of this element last changed
         self.layer = layer # Z coordinate position
         self.visible = True # Whether this element should be rendered or not
         self.enabled = True  # Whether this element can interact/handle events
         self.id = element_id  # Optional identifier for lookup
         self._hitbox_rect_override: Optional[pygame.Rect] = None # Optional overrider to define a hitbox
         # separate to the visuals
+        self.screen_space = False # Whether the element is fixed to the screen instead of following the scene camera
+
+    @property
+    def x(self) -> int:
+        """Get the local X position, relative to the parent element if there is one."""
+        return self._x
+
+    @x.setter
+    def x(self, value: int) -> None:
+        """Set the local X position and mark the cached world position as stale."""
+        if value != self._x: # Only invalidate the hierarchy when actually moving
+            self._x = value
+            self._invalidate_transform()
+            if self.parent is not None: # Moving within the parent changes the parent's appearance
+                self.parent.invalidate()
+
+    @property
+    def y(self) -> int:
+        """Get the local Y position, relative to the parent element if there is one."""
+        return self._y
+
+    @y.setter
+    def y(self, value: int) -> None:
+        """Set the local Y position and mark the cached world position as stale."""
+        if value != self._y:
+            self._y = value
+            self._invalidate_transform()
+            if self.parent is not None:
+                self.parent.invalidate()
+
+    @property
+    def world_x(self) -> int:
+        """Get the absolute X position on the screen."""
+        return self.get_world_position()[0]
+
+    @property
+    def world_y(self) -> int:
+        """Get the absolute Y position on the screen."""
+        return self.get_world_position()[1]
+
+    @property
+    def children(self) -> list["UIElement"]:
+        """Get the elements positioned relative to this one."""
+        return self._children
+
+    def get_world_position(self) -> tuple[int, int]:
+        """
+        Get the absolute position of the element.
+
+        The position is only recalculated after this element or one of its ancestors has moved.
+        :return: Absolute (x, y) position in screen coordinates.
+        """
+        if self._transform_dirty:
+            if self.parent is None: # Root elements are positioned directly on the screen
+                self._world_x = self._x
+                self._world_y = self._y
+            else:
+                parent_x, parent_y = self.parent.get_world_position()
+                self._world_x = parent_x + self._x
+                self._world_y = parent_y + self._y
+            self._transform_dirty = False
+        return self._world_x, self._world_y
+
+    def _invalidate_transform(self) -> None:
+        """Mark the cached world position of this element and all its descendants as stale."""
+        global _revision
+        _revision += 1
+        self._moved_revision = _revision
+        self._mark_transform_dirty()
+
+    def _mark_transform_dirty(self) -> None:
+        """Raise the stale world position flag of this element and all its descendants."""
+        if self._transform_dirty: # Descendants of a stale element are always stale already, and have not been read
+            # since they were last stamped
+            return None
+        self._transform_dirty = True
+        self._moved_revision = _revision
+        for child in self._children:
+            child._mark_transform_dirty()
+
+    def add_child(self, element: "UIElement") -> "UIElement":
+        """
+        Attach an element so that its position is relative to this element.
+        :param element: The element to attach.
+        :return: The attached element.
+        """
+        if element.parent is not None: # An element can only have one parent
+            element.parent.remove_child(element)
+        element.parent = self
+        self._children.append(element)
+        element._invalidate_transform()
+        self.invalidate()
+        return element
+
+    def remove_child(self, element: "UIElement") -> None:
+        """
+        Detach a child element, making its position absolute again.
+        :param element: The element to detach.
+        """
+        if element.parent is not self:
+            return None
+        self._children.remove(element)
+        element.parent = None
+        element._invalidate_transform()
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Mark the element as visually changed.
+
+        The flag is raised on every ancestor as well, so that any cached container holding this element is redrawn.
+        """
+        global _revision
+        _revision += 1
+        element = self
+        while element is not None:
+            element._dirty = True
+            element._revision = _revision
+            element = element.parent
+
+    def is_dirty(self) -> bool:
+        """Check if the element's appearance changed since it was last drawn into a cache."""
+        return self._dirty
+
+    def appearance_revision(self) -> int:
+        """
+        Get the revision at which the appearance of this element or one of its descendants last changed.
+
+        Unlike the dirty flag, this is never reset, so any number of caches can each compare it with the value they
+        were built from.
+        :return: The revision.
+        """
+        return self._revision
+
+    def bounds_revision(self) -> int:
+        """
+        Get the revision at which the bounds of this element may last have changed, through a move of it or one of
+        its ancestors, or a change of its appearance.
+        :return: The revision.
+        """
+        return max(self._revision, self._moved_revision)
+
+    def _clear_dirty(self) -> None:
+        """Lower the dirty flag of this element and all its descendants after they have been redrawn."""
+        self._dirty = False
+        for child in self._children:
+            child._clear_dirty()
 
     @abstractmethod
-    def render(self, screen: pygame.Surface) -> None:
+    def render(self, screen: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> None:
         """
         Draw the element on the screen.
         :param screen: Target surface to render onto.
+        :param origin: Screen position that maps to the top-left corner of the target surface.
         """
         pass
 
+    def emit_draw_commands(self, draw_list: DrawList, origin: tuple[int, int] = (0, 0)) -> None:
+        """
+        Queue the element's blits onto a draw list instead of drawing immediately.
+
+        Override to support batched rendering. By default, pending commands are flushed and the element is rendered
+        directly, so elements without a batched path still draw in the correct order.
+        :param draw_list: Draw list to add commands to.
+        :param origin: Screen position that maps to the top-left corner of the draw list's target surface.
+        """
+        draw_list.draw_direct(self.render, origin)
+
+    def iter_surfaces(self) -> Iterator[pygame.Surface]:
+        """
+        Iterate over the surfaces held directly by this element, not including those of its children.
+
+        Override in elements that hold surfaces, so their pixel memory can be accounted for.
+        :return: Iterator over the surfaces.
+        """
+        return iter(())
+
     def handle_event(self, event: pygame.event.Event) -> bool:
         """
         Process a Pygame event.
@@ -49,6 +302,16 @@ class UIElement(ABC):
         """
         return False
 
+    def holds_pointer(self) -> bool:
+        """
+        Check if the element is in the middle of a pointer interaction, such as being hovered or pressed.
+
+        Scenes keep sending pointer motion and release events to such elements after they leave the camera's view,
+        so the interaction can finish. Override in interactive elements.
+        :return: True if the element is waiting for further pointer events.
+        """
+        return False
+
     def update(self, dt: float) -> None:
         """
         Update element state.
@@ -64,7 +327,7 @@ class UIElement(ABC):
         Subclasses should override to return accurate bounds.
         :return: Bounding rectangle in screen coordinates.
         """
-        return pygame.Rect(self.x, self.y, 0, 0)
+        return pygame.Rect(*self.get_world_position(), 0, 0)
 
     def get_hitbox_rect(self) -> pygame.Rect:
         """
@@ -86,17 +349,19 @@ class UIElement(ABC):
             self._hitbox_rect_override = pygame.Rect(rect) # Replace the hitbox override
 
     def set_position(self, x: int, y: int) -> None:
-        """Set the element's position."""
+        """Set the element's position relative to its parent."""
         self.x = x
         self.y = y
 
     def get_position(self) -> tuple[int, int]:
-        """Get the element's position."""
+        """Get the element's position relative to its parent."""
         return self.x, self.y
 
     def set_visible(self, visible: bool) -> None:
         """Set visibility."""
-        self.visible = bool(visible)
+        if self.visible != bool(visible):
+            self.visible = bool(visible)
+            self.invalidate()
 
     def is_visible(self) -> bool:
         """Check if visible."""
@@ -110,9 +375,25 @@ class UIElement(ABC):
         """Check if enabled."""
         return self.enabled
 
+    def set_screen_space(self, screen_space: bool) -> None:
+        """Set whether the element is fixed to the screen instead of following the scene camera."""
+        global _revision, _order_revision
+        if self.screen_space != bool(screen_space):
+            self.screen_space = bool(screen_space)
+            _revision += 1
+            _order_revision += 1
+
+    def is_screen_space(self) -> bool:
+        """Check if the element is fixed to the screen."""
+        return self.screen_space
+
     def set_layer(self, layer: int) -> None:
         """Set rendering layer."""
-        self.layer = int(layer)
+        global _revision, _order_revision
+        if self.layer != int(layer):
+            self.layer = int(layer)
+            _revision += 1
+            _order_revision += 1
 
     def get_layer(self) -> int:
         """Get rendering layer."""
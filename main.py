@@ -5,7 +5,11 @@ This module initialises the game engine, registers the starting scene,
 and begins the main game loop.
 """
 
+import argparse
+import os
+
 from engine.game_engine import GameEngine
+from engine.rendering.texture_renderer import BACKEND_SOFTWARE, BACKEND_TEXTURE
 from engine.scenes.main_menu import MainMenuScene
 from engine.scenes.pause_menu import PauseMenuScene
 from engine.scenes.game_scene import GameScene
@@ -17,17 +21,38 @@ def main():
 
     Sets the initial scene to the main menu and starts the game loop.
     """
+    parser = argparse.ArgumentParser(description="Run the game.")
+    parser.add_argument("--record", metavar="PATH", help="Record the input of every frame to a file.")
+    parser.add_argument("--replay", metavar="PATH", help="Play back a recording instead of reading live input.")
+    parser.add_argument("--headless", action="store_true", help="Run without a window.")
+    parser.add_argument("--latency", action="store_true", help="Print input-to-photon latencies on exit.")
+    parser.add_argument("--renderer", choices=(BACKEND_SOFTWARE, BACKEND_TEXTURE), default=BACKEND_SOFTWARE,
+                        help="Blit in software, or draw textures with an SDL renderer.")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Simulate the next frame on a worker thread while the current one is drawn.")
+    args = parser.parse_args()
+
     engine = GameEngine(
         width=800,
         height=600,
         title="Tachyon",
-        fps=240
+        fps=240,
+        asset_bundle="assets.bundle" if os.path.exists("assets.bundle") else None, # Built with engine.assets.bundle
+        record_path=args.record,
+        replay_path=args.replay,
+        headless=args.headless,
+        measure_latency=args.latency,
+        render_backend=args.renderer,
+        pipelined=args.pipelined
     ) # Create an instance of the game engine with a configuration
 
     engine.scene_manager.change_scene("main_menu") # Make the initial scene the main menu scene
 
     engine.run() # Run the game engine loop
 
+    if engine.latency is not None:
+        print(engine.latency.format_report())
+
 if __name__ == "__main__":
     # Ensures the game only runs when this file is executed directly, not when imported as a module.
     main()